@@ -0,0 +1,203 @@
+"""
+adversarial_corpus.py — Pathological inputs and a linear-growth check for every stage.
+
+Repository content is untrusted, so no check may take super-linear time in
+the size of a file. Each CASES entry builds a hostile page from n repeats of
+a unit (unclosed tags, icon buttons that never close, giant attribute lists,
+minified one-line bundles, ...). growth() times the tokenizer and each
+check's scan_file() at n and GROWTH_FACTOR * n repeats: linear code scales
+by about GROWTH_FACTOR, quadratic code by its square.
+
+tests/test_adversarial.py runs this for every case and stage, so a new
+backtracking pattern or rescan loop fails CI. For a report:
+
+    python -m benchmarks.adversarial_corpus [--bytes 100000] [--write DIR]
+"""
+
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from scan.checks import CHECKS
+from scan.document import SourceDocument
+
+# name -> unit repeated n times (with an optional fixed prefix/suffix)
+CASES: Dict[str, Callable[[int], str]] = {
+    "unclosed_anchors": lambda n: '<a href="/x">link text ' * n,
+    "unclosed_anchors_no_href": lambda n: "<a onclick='go()'>" * n,
+    "unclosed_labels": lambda n: "<label>Name <span>" * n + "<input>",
+    "labels_without_controls": lambda n: '<label for="x">' * n,
+    "icon_buttons_unclosed": lambda n: "<button><svg>" * n,
+    "icon_wrappers_unclosed": lambda n: "<div onClick={go}><img alt=''>" * n,
+    "nav_unclosed": lambda n: "<nav>" + '<a href="#">x' * n,
+    "navs_unclosed": lambda n: "<nav><ul><li>" * n,
+    "deep_nesting": lambda n: "<div>" * n + "text" + "</div>" * n,
+    "giant_attribute_list": lambda n: "<input " + " ".join(f'data-a{i}="v{i}"' for i in range(n)) + ">",
+    "unbalanced_quotes": lambda n: '<meta name="description content="' * n,
+    "unterminated_tags": lambda n: "<div class=x <span id=y <a href=z " * n,
+    "lt_runs": lambda n: "<<a<b<<" * n,
+    "minified_bundle": lambda n: 'var a=b<c&&d>e?"<div onClick={f}>":g;x=y<z;' * n,
+    "unclosed_title_script": lambda n: "<title><script>" * n,
+    "empty_shell_noise": lambda n: '<body><div id="root"></div><script src=a.js>' * n,
+    "headings_and_lists": lambda n: "<h3><ul><li>" * n,
+    # .jsx pages (the JSX lexer runs before tokenizing)
+    "jsx_unterminated_strings": lambda n: "const a = 'x<b;\n" * n,
+    "jsx_unclosed_expressions": lambda n: "<div onClick={() => {" * n,
+    "jsx_generics_and_comparisons": lambda n: "f(a<b, c>d); useState<Item>(x); // <a>\n" * n,
+    "jsx_deep_elements": lambda n: "<>" + "<div>{<span>" * n,
+}
+
+# Cases scanned as .jsx rather than .html
+JSX_CASE_PREFIX = "jsx_"
+
+GROWTH_FACTOR = 8
+# Linear code grows ~8x, plus up to ~2x from the small input fitting in CPU
+# caches; quadratic code grows 64x.
+MAX_GROWTH_RATIO = 32.0
+# Each timing repeats a stage until this much timed work accumulates, so a
+# ~40 microsecond small-size run is averaged over many calls...
+MIN_TIMED_SECONDS = 0.002
+# ...up to this many calls. A stage that stays under MIN_TIMED_SECONDS
+# (under 40 microseconds per call) is too fast for a meaningful ratio.
+MAX_CALLS = 50
+DEFAULT_BYTES = 50_000
+
+STAGES = ("tokenize", *CHECKS)
+
+
+def build(case: str, target_bytes: int = DEFAULT_BYTES) -> str:
+    """The case's page scaled to about target_bytes."""
+    unit = len(CASES[case](1)) or 1
+    return CASES[case](max(1, target_bytes // unit))
+
+
+def _path(case: str) -> Path:
+    return Path(f"{case}.jsx" if case.startswith(JSX_CASE_PREFIX) else f"{case}.html")
+
+
+def _document(case: str, text: str) -> SourceDocument:
+    path = _path(case)
+    return SourceDocument(path=path, relative_path=path.name, text=text, size=len(text), sha256="")
+
+
+def _fresh(doc: SourceDocument) -> SourceDocument:
+    """Copy of doc with nothing cached (preprocessing, tokens, parsed attributes)."""
+    return SourceDocument(path=doc.path, relative_path=doc.relative_path, text=doc.text, size=doc.size, sha256="")
+
+
+def time_stage(stage: str, doc: SourceDocument, repeats: int = 3) -> float:
+    """Best-of-repeats CPU seconds per call of one stage on doc.
+
+    The tokenize stage (preprocessing + tokenizing) gets a fresh document
+    per call. Checks run on a pre-tokenized document whose parsed tag
+    attributes are dropped before every call, so attribute parsing is
+    timed each time. Each repeat calls the stage until MIN_TIMED_SECONDS
+    of timed work (or MAX_CALLS calls) accumulate.
+
+    Time is this thread's CPU time (time.thread_time), not wall-clock
+    time, so other processes competing for the CPU do not inflate a
+    ratio. The garbage collector is paused while timing: its full
+    collections scale with every live object in the process, not with
+    the code under test.
+    """
+    tokenized = None
+    if stage != "tokenize":
+        tokenized = _fresh(doc)
+        tokenized.tokens
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            elapsed = 0.0
+            calls = 0
+            while elapsed < MIN_TIMED_SECONDS and calls < MAX_CALLS:
+                if tokenized is None:
+                    fresh = _fresh(doc)
+                    start = time.thread_time()
+                    fresh.tokens
+                else:
+                    for tag in tokenized.tokens.tags:
+                        tag._attributes = None
+                    start = time.thread_time()
+                    CHECKS[stage].scan_file(tokenized)
+                elapsed += time.thread_time() - start
+                calls += 1
+            best = min(best, elapsed / calls)
+    finally:
+        gc.enable()
+    return best
+
+
+def _measurable(seconds_per_call: float) -> bool:
+    """Whether a time_stage() result accumulated MIN_TIMED_SECONDS of work."""
+    return seconds_per_call * MAX_CALLS >= MIN_TIMED_SECONDS
+
+
+def growth(case: str, stages=STAGES, base_bytes: int = DEFAULT_BYTES, repeats: int = 3) -> List[Dict]:
+    """Per stage: seconds per call at base size and GROWTH_FACTOR x base, and their ratio.
+
+    ratio is None unless both sizes are measurable (see MAX_CALLS).
+    """
+    unit = len(CASES[case](1)) or 1
+    n = max(1, base_bytes // unit)
+    small = _document(case, CASES[case](n))
+    large = _document(case, CASES[case](n * GROWTH_FACTOR))
+    rows = []
+    for stage in stages:
+        t_small = time_stage(stage, small, repeats)
+        t_large = time_stage(stage, large, repeats)
+        ratio = t_large / t_small if _measurable(t_small) and _measurable(t_large) else None
+        rows.append({
+            "case": case,
+            "stage": stage,
+            "bytes": large.size,
+            "small_s": round(t_small, 6),
+            "large_s": round(t_large, 6),
+            "ratio": round(ratio, 2) if ratio is not None else None,
+        })
+    return rows
+
+
+def write_corpus(directory: Path, target_bytes: int = DEFAULT_BYTES) -> List[Path]:
+    """Write every case as <case>.html or .jsx (e.g. to scan or profile by hand)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for case in CASES:
+        path = directory / _path(case)
+        path.write_text(build(case, target_bytes), encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.adversarial_corpus",
+        description="Growth ratios of every check on pathological inputs.",
+    )
+    parser.add_argument("--bytes", type=int, default=DEFAULT_BYTES, help="Base input size per case.")
+    parser.add_argument("--write", default=None, metavar="DIR", help="Also write the corpus files to DIR.")
+    args = parser.parse_args(argv)
+
+    if args.write:
+        write_corpus(Path(args.write), args.bytes)
+
+    failed = 0
+    print(f"{'case':<26} {'stage':<20} {'bytes':>9} {'small s':>9} {'large s':>9} {'ratio':>6}")
+    for case in CASES:
+        for row in growth(case, base_bytes=args.bytes):
+            bad = row["ratio"] is not None and row["ratio"] > MAX_GROWTH_RATIO
+            failed += bad
+            print(
+                f"{row['case']:<26} {row['stage']:<20} {row['bytes']:>9} {row['small_s']:>9.4f} "
+                f"{row['large_s']:>9.4f} {row['ratio'] if row['ratio'] is not None else '-':>6}"
+                + ("  SUPER-LINEAR" if bad else "")
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
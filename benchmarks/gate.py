@@ -0,0 +1,184 @@
+"""
+gate.py — Performance regression gate against a stored benchmark baseline.
+
+Runs the run_benchmarks suite (offline: synthetic repos, stdlib only),
+keeps the best of --repeat runs per scenario, and compares each scenario
+(size x benchmark) with the baseline file:
+- files_per_sec  must not drop by more than its tolerance
+- p95_file_ms    must not rise by more than its tolerance
+- peak_rss_mb    must not rise by more than its tolerance
+
+Prints a table of every compared metric and exits 1 if anything regressed.
+A missing baseline (or --update) stores this run as the new baseline;
+with --require-baseline a missing one is an error instead (CI, where a
+silently recorded baseline would hide a slowdown).
+
+    python -m benchmarks.gate --baseline bench-baseline.json [--update | --require-baseline]
+        [--sizes 100 1000] [--tolerance files_per_sec=0.3]
+
+Baselines are only comparable on the same machine class: record one on the
+runner that enforces it.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.run_benchmarks import BENCHMARKS, environment, run_suite
+
+BASELINE_VERSION = 1
+DEFAULT_SIZES = (100, 1_000)
+
+# metric -> (higher_is_better, default tolerance as a fraction of the baseline)
+METRICS: Dict[str, Tuple[bool, float]] = {
+    "files_per_sec": (True, 0.30),
+    "p95_file_ms": (False, 0.50),
+    "peak_rss_mb": (False, 0.20),
+}
+
+# Values this small are dominated by timer noise and are not gated.
+MIN_GATED_P95_MS = 0.05
+
+
+def _key(row: Dict) -> str:
+    return f"{row['size']}:{row['benchmark']}"
+
+
+def best_of(runs: List[List[Dict]]) -> Dict[str, Dict]:
+    """Per scenario, the best value of each metric over several runs."""
+    best: Dict[str, Dict] = {}
+    for results in runs:
+        for row in results:
+            current = best.setdefault(_key(row), dict(row))
+            for metric, (higher_is_better, _) in METRICS.items():
+                values = [v for v in (current.get(metric), row.get(metric)) if v is not None]
+                if values:
+                    current[metric] = max(values) if higher_is_better else min(values)
+    return best
+
+
+def compare(
+    baseline: Dict[str, Dict],
+    current: Dict[str, Dict],
+    tolerances: Dict[str, float],
+) -> List[Dict]:
+    """One entry per (scenario, metric) present in both, with a regressed flag."""
+    entries = []
+    for key in sorted(baseline.keys() & current.keys(), key=lambda k: (int(k.split(":")[0]), k)):
+        for metric, (higher_is_better, _) in METRICS.items():
+            old, new = baseline[key].get(metric), current[key].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            gated = not (metric == "p95_file_ms" and max(old, new) < MIN_GATED_P95_MS)
+            entries.append({
+                "scenario": key,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regressed": gated and worse > tolerances[metric],
+            })
+    return entries
+
+
+def format_report(entries: List[Dict], missing: List[str], tolerances: Dict[str, float]) -> str:
+    lines = [f"{'scenario':<34} {'metric':<14} {'baseline':>11} {'current':>11} {'change':>8}"]
+    for e in entries:
+        lines.append(
+            f"{e['scenario']:<34} {e['metric']:<14} {e['baseline']:>11.3f} {e['current']:>11.3f} "
+            f"{e['change']:>+8.1%}" + ("  REGRESSED" if e["regressed"] else "")
+        )
+    for key in missing:
+        lines.append(f"{key:<34} (not in this run)")
+    regressed = [e for e in entries if e["regressed"]]
+    limits = ", ".join(f"{m} {t:.0%}" for m, t in tolerances.items())
+    lines.append("")
+    lines.append(
+        f"{len(regressed)} regression(s) beyond tolerance ({limits})" if regressed
+        else f"No regressions beyond tolerance ({limits})"
+    )
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    """The stored baseline, or None if there is none yet. Raises ValueError if unreadable."""
+    if not path.exists():
+        return None
+    try:
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read benchmark baseline {path}: {e}")
+    if baseline.get("baseline_version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported benchmark baseline: {path}")
+    return baseline
+
+
+def _parse_tolerances(values: List[str]) -> Dict[str, float]:
+    tolerances = {metric: default for metric, (_, default) in METRICS.items()}
+    for value in values:
+        metric, _, fraction = value.partition("=")
+        if metric not in METRICS:
+            raise argparse.ArgumentTypeError(f"unknown metric {metric!r} (expected one of {', '.join(METRICS)})")
+        tolerances[metric] = float(fraction)
+    return tolerances
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.gate",
+        description="Fail when benchmarks regress against a stored baseline.",
+    )
+    parser.add_argument("--baseline", required=True, metavar="FILE", help="Baseline results file.")
+    parser.add_argument("--update", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Fail (exit 2) when there is no baseline instead of storing this run as one.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), metavar="N")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3, metavar="N", help="Runs per scenario; best is kept.")
+    parser.add_argument("--tolerance", action="append", default=[], metavar="METRIC=FRACTION",
+                        help="e.g. files_per_sec=0.3 (defaults: "
+                             + ", ".join(f"{m}={d}" for m, (_, d) in METRICS.items()) + ").")
+    parser.add_argument("--workdir", default=None, metavar="DIR", help="Reuse generated repos from DIR.")
+    args = parser.parse_args(argv)
+
+    try:
+        tolerances = _parse_tolerances(args.tolerance)
+        baseline_path = Path(args.baseline)
+        baseline = None if args.update else load_baseline(baseline_path)
+        if baseline is None and not args.update and args.require_baseline:
+            raise ValueError(f"No benchmark baseline at {baseline_path}; record one with --update")
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="hermes-bench-"))
+    try:
+        runs = [run_suite(args.sizes, workdir, args.benchmarks) for _ in range(max(1, args.repeat))]
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    current = best_of(runs)
+
+    if baseline is None:
+        baseline_path.write_text(json.dumps({
+            "baseline_version": BASELINE_VERSION,
+            **environment(),
+            "scenarios": current,
+        }, indent=2), encoding="utf-8")
+        print(f"Stored benchmark baseline with {len(current)} scenarios in {baseline_path}")
+        return 0
+
+    entries = compare(baseline["scenarios"], current, tolerances)
+    missing = sorted(baseline["scenarios"].keys() - current.keys())
+    print(format_report(entries, missing, tolerances))
+    return 1 if any(e["regressed"] for e in entries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+run_benchmarks.py — Throughput and memory benchmarks on synthetic repos.
+
+For each repo size (pages; see synthetic_repo.py) it measures:
+- discovery: find_source_files() over the whole tree
+- checks: reading, tokenizing and each of the 6 checks' scan_file() over
+  every scannable page (uncapped), one row per stage, with the p95 per-file
+  latency of that stage
+- run_scan: the full scan as the CLI runs it, including the MAX_FILES cap,
+  so for large repos this is discovery-bound by design
+
+Each benchmark runs in a fresh process so peak RSS belongs to it alone.
+Results go to stdout as JSON (keep them to compare releases); a summary
+table goes to stderr.
+
+Usage: python -m benchmarks.run_benchmarks [--sizes 100 1000] [--jobs N]
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic_repo import generate
+from scan.checks import CHECKS
+from scan.document import load_document
+from scan.file_finder import find_source_files, iter_source_files
+from scan.scanner import run_scan
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SIZES = (100, 1_000, 10_000, 100_000)
+BENCHMARKS = ("discovery", "checks", "run_scan")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children, in MB."""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def p95(samples: List[float]) -> Optional[float]:
+    """95th percentile (nearest rank), or None for no samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def _row(
+    benchmark: str,
+    files: int,
+    size_bytes: Optional[int],
+    seconds: float,
+    per_file: Optional[List[float]] = None,
+) -> Dict:
+    latency = p95(per_file or [])
+    return {
+        "benchmark": benchmark,
+        "files": files,
+        "bytes": size_bytes,
+        "seconds": round(seconds, 4),
+        "files_per_sec": round(files / seconds, 1) if seconds else None,
+        "mb_per_sec": round(size_bytes / seconds / (1024 * 1024), 2) if size_bytes and seconds else None,
+        "p95_file_ms": round(latency * 1000, 4) if latency is not None else None,
+    }
+
+
+def bench_discovery(root: str, jobs: int = 1) -> List[Dict]:
+    start = time.perf_counter()
+    find_source_files(root)
+    elapsed = time.perf_counter() - start
+    # Throughput counts every file discovery classified, not just the capped list.
+    examined = sum(1 for _ in iter_source_files(root))
+    return [_row("discovery", examined, None, elapsed)]
+
+
+def bench_checks(root: str, jobs: int = 1) -> List[Dict]:
+    paths = [item.path for item in iter_source_files(root) if item.skip_reason is None]
+    # Stage -> seconds per file, in file order.
+    stages: Dict[str, List[float]] = {"read": [], "tokenize": [], **{name: [] for name in CHECKS}}
+    total_bytes = 0
+    clock = time.perf_counter
+    for path in paths:
+        start = clock()
+        doc = load_document(path, Path(root))
+        stages["read"].append(clock() - start)
+        total_bytes += doc.size
+
+        start = clock()
+        doc.tokens
+        stages["tokenize"].append(clock() - start)
+
+        for name, module in CHECKS.items():
+            start = clock()
+            module.scan_file(doc)
+            stages[name].append(clock() - start)
+
+    rows = [
+        _row(f"checks:{stage}", len(paths), total_bytes, sum(times), times)
+        for stage, times in stages.items()
+    ]
+    per_file = [sum(times) for times in zip(*stages.values())]
+    rows.append(_row("checks:all", len(paths), total_bytes, sum(per_file), per_file))
+    return rows
+
+
+def bench_run_scan(root: str, jobs: int = 1) -> List[Dict]:
+    start = time.perf_counter()
+    result = run_scan(root, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    files, _ = find_source_files(root)  # same capped list the scan checked
+    return [_row("run_scan", result["file_count"], sum(p.stat().st_size for p in files), elapsed)]
+
+
+_RUNNERS = {"discovery": bench_discovery, "checks": bench_checks, "run_scan": bench_run_scan}
+
+
+def run_benchmark(name: str, root: str, jobs: int = 1) -> List[Dict]:
+    """Run one benchmark in this process; rows carry this process's peak RSS."""
+    rows = _RUNNERS[name](root, jobs)
+    rss = peak_rss_mb()
+    for row in rows:
+        row["peak_rss_mb"] = rss
+    return rows
+
+
+def measure(name: str, root: str, jobs: int = 1) -> List[Dict]:
+    """run_benchmark in a fresh process, so peak RSS is not shared between benchmarks."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_benchmark, name, root, jobs).result()
+
+
+def run_suite(
+    sizes: List[int],
+    workdir: Path,
+    benchmarks: List[str] = BENCHMARKS,
+    seed: int = 0,
+    jobs: int = 1,
+) -> List[Dict]:
+    """Generate (or reuse) each size's repo under workdir and run the benchmarks on it."""
+    results = []
+    for size in sizes:
+        root = workdir / f"repo-{size}-seed{seed}"
+        repo = generate(root, size, seed)
+        print(f"size {size}: {repo['pages']} pages, {repo['page_bytes']} bytes", file=sys.stderr)
+        for name in benchmarks:
+            for row in measure(name, str(root), jobs):
+                results.append({"size": size, **row})
+    return results
+
+
+def environment() -> Dict:
+    return {"python": platform.python_version(), "platform": platform.platform()}
+
+
+def _print_table(results: List[Dict]) -> None:
+    header = (f"{'size':>7}  {'benchmark':<28} {'files':>7} {'seconds':>9} {'files/s':>10} "
+              f"{'MB/s':>8} {'p95 ms':>8} {'RSS MB':>7}")
+    print(header, file=sys.stderr)
+    for row in results:
+        print(
+            f"{row['size']:>7}  {row['benchmark']:<28} {row['files']:>7} {row['seconds']:>9.4f} "
+            f"{row['files_per_sec'] or 0:>10.1f} {row['mb_per_sec'] or 0:>8.2f} "
+            f"{row['p95_file_ms'] or 0:>8.3f} {row['peak_rss_mb'] or 0:>7.1f}",
+            file=sys.stderr,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run_benchmarks",
+        description="Hermes Clew throughput benchmarks on synthetic repositories.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), metavar="N",
+                        help="Repo sizes in scannable pages (default: 100 1000 10000 100000).")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default 0).")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N", help="--jobs for the run_scan benchmark.")
+    parser.add_argument("--workdir", default=None, metavar="DIR",
+                        help="Keep generated repos here and reuse them between runs.")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="hermes-bench-"))
+    try:
+        results = run_suite(args.sizes, workdir, args.benchmarks, args.seed, args.jobs)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    _print_table(results)
+    print(json.dumps({
+        **environment(),
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
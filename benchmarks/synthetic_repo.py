@@ -0,0 +1,131 @@
+"""
+synthetic_repo.py — Deterministic synthetic repositories for benchmarks.
+
+Builds a project tree of N scannable pages derived from tests/fixtures
+(HTML and JSX as-is, TSX made from the JSX fixtures), each page a few
+fixtures stitched together so sizes vary, spread over the usual source
+directories. Alongside them it adds the noise a real checkout has:
+- node_modules/ and dist/ full of HTML/JSX the walker must prune
+- .js/.css/.json/.md files next to the pages
+- a .gitignore'd generated/ directory
+- a few pages over MAX_FILE_SIZE_BYTES
+
+Same (size, seed) always gives byte-identical trees, so results are
+comparable across releases.
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+# Bump when the layout or content recipe changes; cached trees are rebuilt.
+GENERATOR_VERSION = 1
+MARKER_FILE = ".hermes-synthetic.json"
+
+# (directory, share of pages)
+SOURCE_DIRS = [
+    ("src/components", 0.35),
+    ("src/pages", 0.15),
+    ("app", 0.15),
+    ("pages", 0.10),
+    ("public", 0.10),
+    ("legacy/templates", 0.15),
+]
+FILES_PER_DIR = 50
+OVERSIZED_SHARE = 0.005  # pages over the 50KB limit
+NOISE_FILES_PER_PAGE = 0.5  # node_modules/dist pages per scannable page
+OTHER_FILES_PER_PAGE = 0.5  # .js/.css/.json/.md per scannable page
+IGNORED_FILES_PER_PAGE = 0.05
+
+OTHER_EXTENSIONS = [".js", ".css", ".json", ".md"]
+
+
+def _load_templates() -> Dict[str, List[str]]:
+    """Fixture sources grouped by the extension they are written out as."""
+    html = [p.read_text(encoding="utf-8") for p in sorted(FIXTURES.glob("*.html"))]
+    jsx = [p.read_text(encoding="utf-8") for p in sorted(FIXTURES.glob("*.jsx"))]
+    tsx = [
+        "type Props = { title?: string };\n\n"
+        + source.replace("() {", "(props: Props): JSX.Element {")
+        for source in jsx
+    ]
+    return {".html": html, ".jsx": jsx, ".tsx": tsx}
+
+
+def _page(rng: random.Random, templates: List[str], page_id: int, parts: int) -> str:
+    chunks = [rng.choice(templates) for _ in range(parts)]
+    # Unique per page so content-keyed caches see distinct files.
+    return f"<!-- synthetic page {page_id} -->\n" + "\n".join(chunks)
+
+
+def _write(path: Path, text: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    return len(data)
+
+
+def generate(root: Path, size: int, seed: int = 0) -> Dict:
+    """Write a synthetic repo with `size` scannable pages under root.
+
+    Reuses an existing tree when its marker matches (size, seed, version)
+    and replaces it otherwise. Returns the marker dict: pages, bytes and
+    noise counts. Raises ValueError rather than overwrite a non-empty
+    directory that was not generated here.
+    """
+    root = Path(root)
+    marker_path = root / MARKER_FILE
+    wanted = {"generator_version": GENERATOR_VERSION, "size": size, "seed": seed}
+    if marker_path.is_file():
+        marker = json.loads(marker_path.read_text(encoding="utf-8"))
+        if all(marker.get(k) == v for k, v in wanted.items()):
+            return marker
+        shutil.rmtree(root)
+    elif root.exists() and any(root.iterdir()):
+        raise ValueError(f"Refusing to overwrite non-synthetic directory: {root}")
+
+    rng = random.Random(seed)
+    templates = _load_templates()
+    extensions = [".html", ".jsx", ".tsx"]
+    counts = {"pages": 0, "page_bytes": 0, "oversized": 0, "noise": 0, "other": 0, "ignored": 0}
+
+    for directory, share in SOURCE_DIRS:
+        pages_here = round(size * share) if directory != SOURCE_DIRS[-1][0] else size - counts["pages"]
+        for i in range(pages_here):
+            page_id = counts["pages"]
+            ext = rng.choice(extensions)
+            folder = root / directory / f"section_{i // FILES_PER_DIR:04d}"
+            if rng.random() < OVERSIZED_SHARE:
+                parts = 80  # well over MAX_FILE_SIZE_BYTES
+                counts["oversized"] += 1
+            else:
+                parts = rng.randint(1, 6)
+            text = _page(rng, templates[ext], page_id, parts)
+            counts["page_bytes"] += _write(folder / f"page_{page_id:06d}{ext}", text)
+            counts["pages"] += 1
+
+            if rng.random() < OTHER_FILES_PER_PAGE:
+                other = rng.choice(OTHER_EXTENSIONS)
+                _write(folder / f"asset_{page_id:06d}{other}", f"/* asset {page_id} */\n" * 20)
+                counts["other"] += 1
+
+    for n in range(round(size * NOISE_FILES_PER_PAGE)):
+        ext = rng.choice(extensions)
+        package = f"pkg-{n // FILES_PER_DIR:04d}"
+        base = "node_modules" if n % 4 else "dist"
+        text = _page(rng, templates[ext], -n - 1, 1)
+        _write(root / base / package / "lib" / f"component_{n:06d}{ext}", text)
+        counts["noise"] += 1
+
+    _write(root / ".gitignore", "generated/\n")
+    for n in range(round(size * IGNORED_FILES_PER_PAGE)):
+        _write(root / "generated" / f"out_{n:06d}.html", _page(rng, templates[".html"], -n - 1, 1))
+        counts["ignored"] += 1
+
+    marker = {**wanted, **counts}
+    marker_path.write_text(json.dumps(marker, indent=2), encoding="utf-8")
+    return marker
@@ -0,0 +1,162 @@
+"""
+cache.py — Persistent per-file result cache (sqlite3, stdlib only).
+
+Stores each file's per-check partials (the map step output from checks.py)
+keyed by:
+- content: git blob SHA when discovery already knows it (no read needed),
+  otherwise the SHA-256 of the file bytes
+- name: the file name, because findings embed it
+- engine: a fingerprint of the check code, so any change to a check,
+  the tokenizer or document loading invalidates old entries
+
+run_scan() only runs checks on cache misses and merges cached partials for
+everything else. New entries are written in batches while the scan runs.
+The database is capped in size; least recently used entries are evicted
+when a scan finishes. Entries from other check code stay until they are
+evicted, so branches with different checks can share one cache.
+"""
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from scan import checks, document, findings, jsx_lexer, preprocess, tokenizer
+from scan.checks import FilePartials
+from scan.findings import to_json
+
+CACHE_FILE_NAME = "hermes_clew_cache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# New entries held in memory before they are written out
+WRITE_BATCH = 256
+
+# Bump to invalidate every cache entry without touching check code
+# (e.g. when the partials format changes in a way the fingerprint can't see).
+ENGINE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partials (
+    content   TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    engine    TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (content, name, engine)
+);
+CREATE INDEX IF NOT EXISTS partials_lru ON partials (last_used);
+"""
+
+
+def engine_fingerprint() -> str:
+    """Hash of ENGINE_VERSION plus the source of every module the map step runs."""
+    modules = [checks, document, findings, jsx_lexer, preprocess, tokenizer, *checks.CHECKS.values(), *checks.ANALYSES.values()]
+    digest = hashlib.sha256(str(ENGINE_VERSION).encode())
+    for module in modules:
+        digest.update(Path(inspect.getsourcefile(module)).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def content_key(raw: Optional[bytes] = None, blob_sha: Optional[str] = None) -> str:
+    """Cache key for file content: the git blob SHA if known, else SHA-256 of raw."""
+    if blob_sha:
+        return f"git:{blob_sha}"
+    return f"sha256:{hashlib.sha256(raw).hexdigest()}"
+
+
+class ResultCache:
+    """sqlite-backed map of (content, name, engine) -> per-file partials."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, engine: Optional[str] = None):
+        directory = Path(cache_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / CACHE_FILE_NAME
+        self.max_bytes = max_bytes
+        self.engine = engine or engine_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._touched: List[Tuple[str, str]] = []
+        self._new: List[Tuple[str, str, str]] = []
+        self._closed = False
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, content: str, name: str) -> Optional[FilePartials]:
+        """Cached partials for this content and file name, or None (counted as a miss)."""
+        row = self._conn.execute(
+            "SELECT data FROM partials WHERE content = ? AND name = ? AND engine = ?",
+            (content, name, self.engine),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.append((content, name))
+        return json.loads(row[0])
+
+    def put(self, content: str, name: str, partials: FilePartials) -> None:
+        """Queue partials for storage; written every WRITE_BATCH entries and by close()."""
+        self._new.append((content, name, json.dumps(partials, separators=(",", ":"), default=to_json)))
+        if len(self._new) >= WRITE_BATCH:
+            with self._conn:
+                self._write_new()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted}
+
+    def close(self) -> None:
+        """Write new entries, refresh LRU stamps of hits, evict down to max_bytes.
+
+        Safe to call more than once; later calls do nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        now = time.time_ns()
+        try:
+            with self._conn:
+                self._write_new()
+                self._conn.executemany(
+                    "UPDATE partials SET last_used = ? WHERE content = ? AND name = ? AND engine = ?",
+                    [(now, c, n, self.engine) for c, n in self._touched],
+                )
+                self._evict()
+        finally:
+            self._new.clear()
+            self._touched.clear()
+            self._conn.close()
+
+    def _write_new(self) -> None:
+        """Insert the queued entries (inside the caller's transaction)."""
+        now = time.time_ns()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO partials (content, name, engine, data, size, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(c, n, self.engine, data, len(data), now) for c, n, data in self._new],
+        )
+        self._new.clear()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM partials").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for rowid, size in self._conn.execute("SELECT rowid, size FROM partials ORDER BY last_used, rowid"):
+            doomed.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM partials WHERE rowid = ?", doomed)
+        self.evicted += len(doomed)
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -4,57 +4,151 @@ check_aria.py — Category 3: ARIA & Accessibility Attributes (Weight: 15%)
 Checks for role attributes, aria-live regions, alt text, and aria-label on icon-only buttons.
 Returns a dict with score, max, and detailed findings.
 
-Detection: regex + string matching. NO AST parsing.
+Detection: shared tag tokenizer + attribute parser. NO AST parsing.
 """
 
 import re
-from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Custom interactive components with event handlers but no role
-# Match: div/span with onClick/onPress but WITHOUT a role attribute
-DIV_HANDLER_PATTERN = re.compile(
-    r"<(div|span)\b([^>]*)(onClick|onclick|onPress)\s*=([^>]*)>",
-    re.IGNORECASE | re.DOTALL,
-)
+from scan.document import Source, SourceDocument, as_documents
+from scan.findings import Finding, as_dict
+from scan.tokenizer import Tag, TokenStream
 
-ROLE_ATTR_PATTERN = re.compile(r'\brole\s*=\s*["\']', re.IGNORECASE)
+# Custom interactive components with event handlers but no role
+# Match: div/span tags with onClick/onPress but WITHOUT a role attribute
+# (attribute names as parsed by Tag.attributes, i.e. lower-cased)
+HANDLER_ATTRS = ("onclick", "onpress")
+HANDLER_HINT = re.compile(r"on(?:click|press)", re.IGNORECASE)
 
 # aria-live regions
-ARIA_LIVE_PATTERN = re.compile(r'\baria-live\s*=\s*["\']', re.IGNORECASE)
-
-# Images
-IMG_PATTERN = re.compile(r"<img\b([^>]*)\/?>", re.IGNORECASE | re.DOTALL)
-ALT_ATTR_PATTERN = re.compile(r'\balt\s*=\s*["\']', re.IGNORECASE)
+ARIA_LIVE_HINT = re.compile(r"aria-live", re.IGNORECASE)
 
 # Icon-only buttons: buttons containing only SVG or <img> with no text content
-# We detect buttons/elements that contain svg or img child but check for aria-label
-BUTTON_WITH_SVG_PATTERN = re.compile(
-    r"<button\b([^>]*)>(\s*<(?:svg|img)\b[^>]*>.*?)\s*</button>",
-    re.IGNORECASE | re.DOTALL,
-)
+# We detect buttons/elements whose first child is svg or img and check for aria-label
+ICON_TAGS = ("svg", "img")
 
-# Also catch div/span icon buttons
-DIV_ICON_PATTERN = re.compile(
-    r"<(div|span)\b([^>]*(?:onClick|onclick|onPress)[^>]*)>\s*<(?:svg|img)\b[^>]*>.*?</\1>",
-    re.IGNORECASE | re.DOTALL,
-)
 
-ARIA_LABEL_PATTERN = re.compile(
-    r'\baria-label\s*=\s*["\']([^"\']+)["\']',
-    re.IGNORECASE,
-)
+# The *_HINT patterns are cheap pre-filters on the raw attribute text, so
+# only candidate tags get their attributes parsed.
+def _has_handler(tag: Tag) -> bool:
+    if not HANDLER_HINT.search(tag.attrs):
+        return False
+    attrs = tag.attributes
+    return any(name in attrs for name in HANDLER_ATTRS)
 
 
-def check_aria(files: List[Path]) -> Dict:
-    """Run all Category 3 checks across the given files.
+def _has_aria_label(tag: Tag) -> bool:
+    """A non-empty aria-label (quoted text or a JSX expression)."""
+    return bool(tag.get("aria-label"))
 
-    Checks:
-    1. Custom interactive components have role attribute
-    2. Dynamic content areas have aria-live
-    3. Images have alt text
-    4. Icon-only buttons have aria-label
+
+def _icon_wrappers(
+    tokens: TokenStream,
+    names: Tuple[str, ...],
+    predicate: Optional[Callable[[Tag], bool]] = None,
+) -> Iterator[Tag]:
+    """Yield <name> tags that open directly onto an <svg>/<img> and are later closed.
+
+    predicate, when given, must accept the wrapper tag.
+
+    Non-overlapping, like re.finditer: once a wrapper matches, tags before its
+    closing tag are skipped. Closing tags are found by binary search, so the
+    whole walk is linear in the number of tags even when wrappers never close.
     """
+    resume_at = 0
+    for tag in tokens.start_tags(*names):
+        if tag.start < resume_at:
+            continue
+        if predicate is not None and not predicate(tag):
+            continue
+        icon = tokens.next_tag(tag)
+        if (icon is None or icon.is_end or icon.name not in ICON_TAGS
+                or tokens.text_after(tag).strip()):
+            continue
+        close = tokens.first_end_tag(tag.name, icon.end)
+        if close is None:
+            continue
+        resume_at = close.end
+        yield tag
+
+
+def scan_file(doc: SourceDocument) -> Dict:
+    """Per-file (map) step: collect Category 3 signals from one document."""
+    tokens = doc.tokens
+    fname = doc.name
+    findings = []
+
+    custom_interactives_without_role = 0
+    custom_interactives_total = 0
+    has_aria_live = False
+    images_total = 0
+    images_with_alt = 0
+    icon_buttons_total = 0
+    icon_buttons_with_label = 0
+
+    # Check 1: Custom interactive divs/spans with handlers — do they have role?
+    for tag in tokens.start_tags("div", "span"):
+        if not _has_handler(tag):
+            continue
+        custom_interactives_total += 1
+        if "role" not in tag.attributes:
+            custom_interactives_without_role += 1
+            findings.append(Finding(
+                "custom_widget_role", False, fname,
+                "{file}: <{}> with click handler lacks role attribute.", tag.raw_name,
+            ))
+
+    # Check 2: aria-live regions
+    if any(not tag.is_end and ARIA_LIVE_HINT.search(tag.attrs) and "aria-live" in tag.attributes
+           for tag in tokens.tags):
+        has_aria_live = True
+
+    # Check 3: Images with alt text
+    for tag in tokens.start_tags("img"):
+        images_total += 1
+        if "alt" in tag.attributes:
+            images_with_alt += 1
+        else:
+            findings.append(Finding(
+                "image_alt_text", False, fname,
+                "{file}: <img> missing alt attribute.",
+            ))
+
+    # Check 4: Icon-only buttons with aria-label
+    for tag in _icon_wrappers(tokens, ("button",)):
+        icon_buttons_total += 1
+        if _has_aria_label(tag):
+            icon_buttons_with_label += 1
+        else:
+            findings.append(Finding(
+                "icon_button_label", False, fname,
+                "{file}: Icon-only <button> (contains SVG/img) lacks aria-label.",
+            ))
+
+    for tag in _icon_wrappers(tokens, ("div", "span"), _has_handler):
+        icon_buttons_total += 1
+        if _has_aria_label(tag):
+            icon_buttons_with_label += 1
+        else:
+            findings.append(Finding(
+                "icon_button_label", False, fname,
+                "{file}: Icon-only <{}> with handler lacks aria-label.", tag.raw_name,
+            ))
+
+    return {
+        "findings": findings,
+        "widgets_without_role": custom_interactives_without_role,
+        "widgets": custom_interactives_total,
+        "has_aria_live": has_aria_live,
+        "images": images_total,
+        "images_with_alt": images_with_alt,
+        "icon_buttons": icon_buttons_total,
+        "icon_buttons_with_label": icon_buttons_with_label,
+    }
+
+
+def merge_results(partials: Iterable[Dict]) -> Dict:
+    """Merge (reduce) step: fold per-file partials, in file order, into the category result."""
     findings = []
     total_checks = 0
     passed_checks = 0
@@ -67,67 +161,15 @@ def check_aria(files: List[Path]) -> Dict:
     icon_buttons_total = 0
     icon_buttons_with_label = 0
 
-    for filepath in files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Check 1: Custom interactive divs/spans with handlers — do they have role?
-        for match in DIV_HANDLER_PATTERN.finditer(content):
-            custom_interactives_total += 1
-            full_attrs = match.group(2) + match.group(4)
-            if not ROLE_ATTR_PATTERN.search(full_attrs):
-                custom_interactives_without_role += 1
-                findings.append({
-                    "check": "custom_widget_role",
-                    "passed": False,
-                    "detail": f"{fname}: <{match.group(1)}> with click handler lacks role attribute.",
-                    "file": fname,
-                })
-
-        # Check 2: aria-live regions
-        if ARIA_LIVE_PATTERN.search(content):
-            has_aria_live = True
-
-        # Check 3: Images with alt text
-        for match in IMG_PATTERN.finditer(content):
-            images_total += 1
-            attrs = match.group(1)
-            if ALT_ATTR_PATTERN.search(attrs):
-                images_with_alt += 1
-            else:
-                findings.append({
-                    "check": "image_alt_text",
-                    "passed": False,
-                    "detail": f"{fname}: <img> missing alt attribute.",
-                    "file": fname,
-                })
-
-        # Check 4: Icon-only buttons with aria-label
-        for match in BUTTON_WITH_SVG_PATTERN.finditer(content):
-            icon_buttons_total += 1
-            attrs = match.group(1)
-            if ARIA_LABEL_PATTERN.search(attrs):
-                icon_buttons_with_label += 1
-            else:
-                findings.append({
-                    "check": "icon_button_label",
-                    "passed": False,
-                    "detail": f"{fname}: Icon-only <button> (contains SVG/img) lacks aria-label.",
-                    "file": fname,
-                })
-
-        for match in DIV_ICON_PATTERN.finditer(content):
-            icon_buttons_total += 1
-            attrs = match.group(2)
-            if ARIA_LABEL_PATTERN.search(attrs):
-                icon_buttons_with_label += 1
-            else:
-                findings.append({
-                    "check": "icon_button_label",
-                    "passed": False,
-                    "detail": f"{fname}: Icon-only <{match.group(1)}> with handler lacks aria-label.",
-                    "file": fname,
-                })
+    for partial in partials:
+        findings.extend(map(as_dict, partial["findings"]))
+        custom_interactives_without_role += partial["widgets_without_role"]
+        custom_interactives_total += partial["widgets"]
+        has_aria_live = has_aria_live or partial["has_aria_live"]
+        images_total += partial["images"]
+        images_with_alt += partial["images_with_alt"]
+        icon_buttons_total += partial["icon_buttons"]
+        icon_buttons_with_label += partial["icon_buttons_with_label"]
 
     # --- Aggregate checks ---
 
@@ -207,3 +249,15 @@ def check_aria(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_aria(files: List[Source]) -> Dict:
+    """Run all Category 3 checks across the given files.
+
+    Checks:
+    1. Custom interactive components have role attribute
+    2. Dynamic content areas have aria-live
+    3. Images have alt text
+    4. Icon-only buttons have aria-label
+    """
+    return merge_results(scan_file(doc) for doc in as_documents(files))
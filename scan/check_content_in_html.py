@@ -5,22 +5,21 @@ Checks whether HTML files contain actual content vs. being empty SPA shells.
 This category is inherently unreliable without fetching the deployed URL.
 Only safe, high-confidence checks are scored. Everything else is Claude advisory.
 
-Detection: string matching for shell patterns, noscript, SSR markers.
+Detection: shared tag tokenizer for shell patterns and noscript, string matching for SSR markers.
 """
 
 import re
-from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
+
+from scan.document import Source, SourceDocument, as_documents
+from scan.tokenizer import TokenStream, strip_tags
 
 # Empty shell detection: <div id="root"></div> + script tags, little else
-ROOT_DIV_PATTERN = re.compile(
-    r'<div\b[^>]*id\s*=\s*["\'](root|app|__next)["\'][^>]*>\s*</div>',
+ROOT_ID_ATTR_PATTERN = re.compile(
+    r'id\s*=\s*["\'](root|app|__next)["\']',
     re.IGNORECASE,
 )
 
-# Noscript fallback
-NOSCRIPT_PATTERN = re.compile(r"<noscript\b", re.IGNORECASE)
-
 # SSR framework markers
 SSR_MARKERS = [
     "__NEXT_DATA__",         # Next.js
@@ -32,58 +31,143 @@ SSR_MARKERS = [
 ]
 
 # Meaningful text content: paragraphs, headings with text
-MEANINGFUL_CONTENT_PATTERN = re.compile(
-    r"<(p|h[1-6]|li|td|th|blockquote|figcaption|dt|dd)\b[^>]*>[^<]{10,}",
-    re.IGNORECASE,
+MEANINGFUL_CONTENT_TAGS = (
+    "p", "h1", "h2", "h3", "h4", "h5", "h6",
+    "li", "td", "th", "blockquote", "figcaption", "dt", "dd",
 )
-
-# Script-only pattern: body contains almost nothing but script tags
-SCRIPT_TAG_PATTERN = re.compile(r"<script\b", re.IGNORECASE)
-
-
-def _is_empty_shell(content: str) -> bool:
+MIN_MEANINGFUL_TEXT = 10
+
+
+def _has_empty_root_div(tokens: TokenStream) -> bool:
+    """<div id="root|app|__next"> immediately closed by </div> (whitespace only between)."""
+    for tag in tokens.start_tags("div"):
+        if not ROOT_ID_ATTR_PATTERN.search(tag.attrs):
+            continue
+        following = tokens.next_tag(tag)
+        if (following is not None and following.is_end and following.name == "div"
+                and not tokens.text_after(tag).strip()):
+            return True
+    return False
+
+
+def _meaningful_blocks(tokens: TokenStream) -> int:
+    """Count content tags followed by at least MIN_MEANINGFUL_TEXT chars of text."""
+    text = tokens.text
+    count = 0
+    for tag in tokens.start_tags(*MEANINGFUL_CONTENT_TAGS):
+        next_lt = text.find("<", tag.end)
+        run = (len(text) if next_lt == -1 else next_lt) - tag.end
+        if run >= MIN_MEANINGFUL_TEXT:
+            count += 1
+    return count
+
+
+def _is_empty_shell(doc: SourceDocument) -> bool:
     """Heuristic: is this HTML file essentially an empty SPA shell?
 
     An empty shell has a root div, one or more script tags,
     and very little other content in the body.
     """
-    if not ROOT_DIV_PATTERN.search(content):
+    if not _has_empty_root_div(doc.tokens):
         return False
 
-    # Extract body content
-    body_match = re.search(r"<body\b[^>]*>(.*)</body>", content, re.IGNORECASE | re.DOTALL)
-    if not body_match:
-        return False
+    tokens = doc.tokens
+    text = tokens.text
 
-    body = body_match.group(1)
+    # Extract body content: first <body ...> up to the last </body>
+    bodies = tokens.start_tags("body")
+    body_ends = tokens.end_tags("body")
+    if not bodies or not body_ends or body_ends[-1].start < bodies[0].end:
+        return False
+    body_start, body_end = bodies[0].end, body_ends[-1].start
+
+    # Remove script tags and their content (each <script> pairs with the
+    # first </script> after it, skipping scripts nested inside a removed one)
+    kept = []
+    pos = body_start
+    for script in tokens.start_tags("script"):
+        if script.start < pos:
+            continue
+        if script.end > body_end:
+            break
+        close = tokens.first_end_tag("script", script.end)
+        if close is None or close.end > body_end:
+            break
+        kept.append(text[pos:script.start])
+        pos = close.end
+    kept.append(text[pos:body_end])
 
-    # Remove script tags and their content
-    body_no_scripts = re.sub(r"<script\b[^>]*>.*?</script>", "", body, flags=re.IGNORECASE | re.DOTALL)
     # Remove HTML tags
-    text_only = re.sub(r"<[^>]+>", "", body_no_scripts).strip()
+    text_only = strip_tags("".join(kept)).strip()
 
     # If remaining text is very short, it's a shell
     return len(text_only) < 50
 
 
-def check_content_in_html(files: List[Path]) -> Dict:
-    """Run all Category 5 checks across the given files.
+def scan_file(doc: SourceDocument) -> Optional[Dict]:
+    """Per-file (map) step: collect Category 5 signals from one document.
 
-    Safe checks (scored):
-    1. HTML files are NOT empty root shells
-    2. <noscript> fallback present
-    3. SSR framework markers present
+    Returns None for non-HTML files (these checks apply to HTML entry points).
+    """
+    if doc.suffix.lower() != ".html":
+        return None
 
-    Claude advisory (NOT scored — mentioned in findings for context):
-    - Whether meaningful text content appears in source
+    content = doc.text
+
+    # Check 3: SSR markers
+    ssr_marker = None
+    for marker in SSR_MARKERS:
+        if marker in content:
+            ssr_marker = marker
+            break
+
+    return {
+        "findings": [],
+        "file": doc.name,
+        # Check 1: Empty shell?
+        "is_shell": _is_empty_shell(doc),
+        # Check 2: Noscript
+        "has_noscript": doc.tokens.has("noscript"),
+        "ssr_marker": ssr_marker,
+        # Advisory: meaningful content
+        "has_content": _meaningful_blocks(doc.tokens) >= 3,
+    }
+
+
+def merge_results(partials: Iterable[Optional[Dict]]) -> Dict:
+    """Merge (reduce) step: fold per-file partials into the category result.
+
+    None partials (non-HTML files) are ignored.
     """
     findings = []
     total_checks = 0
     passed_checks = 0
 
-    html_files = [f for f in files if f.suffix.lower() == ".html"]
+    shell_files = []
+    non_shell_files = []
+    has_noscript = False
+    has_ssr_markers = False
+    ssr_marker_found = ""
+    files_with_content = 0
+    html_file_count = 0
+
+    for partial in partials:
+        if partial is None:
+            continue
+        html_file_count += 1
+        findings.extend(partial["findings"])
+        if partial["is_shell"]:
+            shell_files.append(partial["file"])
+        else:
+            non_shell_files.append(partial["file"])
+        has_noscript = has_noscript or partial["has_noscript"]
+        if partial["ssr_marker"]:
+            has_ssr_markers = True
+            ssr_marker_found = partial["ssr_marker"]
+        if partial["has_content"]:
+            files_with_content += 1
 
-    if not html_files:
+    if not html_file_count:
         return {
             "category": "content_in_html",
             "passed": 0,
@@ -95,39 +179,6 @@ def check_content_in_html(files: List[Path]) -> Dict:
             }],
         }
 
-    shell_files = []
-    non_shell_files = []
-    has_noscript = False
-    has_ssr_markers = False
-    ssr_marker_found = ""
-    files_with_content = 0
-
-    for filepath in html_files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Check 1: Empty shell?
-        if _is_empty_shell(content):
-            shell_files.append(fname)
-        else:
-            non_shell_files.append(fname)
-
-        # Check 2: Noscript
-        if NOSCRIPT_PATTERN.search(content):
-            has_noscript = True
-
-        # Check 3: SSR markers
-        for marker in SSR_MARKERS:
-            if marker in content:
-                has_ssr_markers = True
-                ssr_marker_found = marker
-                break
-
-        # Advisory: meaningful content
-        meaningful_matches = MEANINGFUL_CONTENT_PATTERN.findall(content)
-        if len(meaningful_matches) >= 3:
-            files_with_content += 1
-
     # --- Aggregate checks ---
 
     # Check 1: Not empty shells
@@ -137,7 +188,7 @@ def check_content_in_html(files: List[Path]) -> Dict:
         findings.append({
             "check": "not_empty_shell",
             "passed": True,
-            "detail": f"All {len(html_files)} HTML files contain content beyond a bare root div.",
+            "detail": f"All {html_file_count} HTML files contain content beyond a bare root div.",
         })
     elif shell_files and non_shell_files:
         findings.append({
@@ -189,7 +240,7 @@ def check_content_in_html(files: List[Path]) -> Dict:
         findings.append({
             "check": "meaningful_content_advisory",
             "passed": True,
-            "detail": f"[ADVISORY — not scored] {files_with_content} of {len(html_files)} HTML files contain meaningful text content in source.",
+            "detail": f"[ADVISORY — not scored] {files_with_content} of {html_file_count} HTML files contain meaningful text content in source.",
         })
     else:
         findings.append({
@@ -204,3 +255,19 @@ def check_content_in_html(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_content_in_html(files: List[Source]) -> Dict:
+    """Run all Category 5 checks across the given files.
+
+    Safe checks (scored):
+    1. HTML files are NOT empty root shells
+    2. <noscript> fallback present
+    3. SSR framework markers present
+
+    Claude advisory (NOT scored — mentioned in findings for context):
+    - Whether meaningful text content appears in source
+    """
+    # Only HTML entry points apply; skip reading JSX/TSX entirely.
+    html_files = [f for f in files if f.suffix.lower() == ".html"]
+    return merge_results(scan_file(doc) for doc in as_documents(html_files))
@@ -4,88 +4,151 @@ check_form_accessibility.py — Category 2: Form Accessibility (Weight: 20%)
 Checks whether form elements are properly labeled and identifiable by agents.
 Returns a dict with score, max, and detailed findings.
 
-Detection: regex + string matching. NO AST parsing.
+Detection: shared tag tokenizer + attribute parser. NO AST parsing.
 """
 
-import re
-from pathlib import Path
-from typing import List, Dict
-
-# Find all input elements (self-closing or not)
-INPUT_PATTERN = re.compile(
-    r"<input\b([^>]*)\/?>",
-    re.IGNORECASE | re.DOTALL,
-)
-
-TEXTAREA_PATTERN = re.compile(
-    r"<textarea\b([^>]*)>",
-    re.IGNORECASE | re.DOTALL,
-)
-
-SELECT_PATTERN = re.compile(
-    r"<select\b([^>]*)>",
-    re.IGNORECASE | re.DOTALL,
-)
-
-# Label patterns (matches both HTML for= and JSX htmlFor=)
-LABEL_FOR_PATTERN = re.compile(
-    r'<label\b[^>]*\b(?:html[Ff]or|for)\s*=\s*["\']([^"\']+)["\']',
-    re.IGNORECASE,
-)
-
-# Wrapping label: <label>...<input>...</label>
-LABEL_WRAP_PATTERN = re.compile(
-    r"<label\b[^>]*>.*?<(input|textarea|select)\b.*?</label>",
-    re.IGNORECASE | re.DOTALL,
-)
-
-# Attribute extraction helpers
-def _get_attr(attrs_str: str, attr_name: str) -> str | None:
-    """Extract an attribute value from an element's attribute string."""
-    match = re.search(
-        rf'\b{attr_name}\s*=\s*["\']([^"\']*)["\']',
-        attrs_str,
-        re.IGNORECASE,
-    )
-    return match.group(1) if match else None
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from scan.document import Source, SourceDocument, as_documents
+from scan.tokenizer import Tag, TokenStream
 
-def _has_attr(attrs_str: str, attr_name: str) -> bool:
-    """Check if an attribute exists (even without a value)."""
-    return bool(re.search(rf"\b{attr_name}\b", attrs_str, re.IGNORECASE))
+# Label association attributes (HTML for= and JSX htmlFor=)
+LABEL_FOR_ATTRS = ("htmlfor", "for")
 
+FORM_CONTROL_TAGS = ("input", "textarea", "select")
 
-# Submit button patterns
-SUBMIT_BUTTON_PATTERN = re.compile(
-    r'<button\b[^>]*\btype\s*=\s*["\']submit["\']',
-    re.IGNORECASE,
-)
+# Hidden/submit/button inputs we should skip when checking labels
+SKIP_INPUT_TYPES = {"hidden", "submit", "button", "reset", "image"}
 
-INPUT_SUBMIT_PATTERN = re.compile(
-    r'<input\b[^>]*\btype\s*=\s*["\']submit["\']',
-    re.IGNORECASE,
-)
 
-# A <button> without an explicit type defaults to submit inside a form
-BUTTON_DEFAULT_SUBMIT = re.compile(
-    r"<button\b(?![^>]*\btype\s*=)",
-    re.IGNORECASE,
-)
+class _Control:
+    """One user-fillable <input>/<textarea>/<select> seen by _analyze()."""
 
-# Hidden/submit/button inputs we should skip when checking labels
-SKIP_INPUT_TYPES = {"hidden", "submit", "button", "reset", "image"}
+    __slots__ = ("id", "typed", "named", "required", "labeled", "form")
 
+    def __init__(self, tag: Tag, typed: bool, form: Optional["_Form"]):
+        attrs = tag.attributes
+        self.id = attrs.get("id")
+        self.typed = typed
+        self.named = "name" in attrs
+        self.required = "required" in attrs or "aria-required" in attrs
+        self.labeled = "aria-label" in attrs or "aria-labelledby" in attrs
+        self.form = form
 
-def check_form_accessibility(files: List[Path]) -> Dict:
-    """Run all Category 2 checks across the given files.
 
-    Checks:
-    1. Every <input> has an associated <label> (via for/id or wrapping)
-    2. Inputs have type attribute
-    3. Inputs have name attribute
-    4. Submit buttons exist and are identifiable
-    5. Required fields are marked with required or aria-required
+class _Form:
+    """One <form> element: its controls, whether it can be submitted and marks required fields."""
+
+    __slots__ = ("controls", "has_submit", "has_required")
+
+    def __init__(self):
+        self.controls = 0
+        self.has_submit = False
+        self.has_required = False
+
+
+def _is_submit_control(tag: Tag) -> bool:
+    """<button> without a type (submit by default), or button/input type=submit."""
+    input_type = tag.get("type")
+    if tag.name == "button" and input_type is None:
+        return True
+    return (input_type or "").lower() == "submit"
+
+
+def _analyze(tokens: TokenStream) -> Tuple[List[_Control], List[_Form]]:
+    """One pass over the form-related tags with an element stack for <form> and <label>.
+
+    Every control records its own form and labels itself when it is
+    - wrapped: inside a <label> that is later closed (unclosed labels
+      label nothing, like the wrapping regex they replace), or
+    - referenced by a label for=/htmlFor= id; ids are indexed and resolved
+      after the pass, so labels may come before or after their control, or
+    - named by aria-label / aria-labelledby.
     """
+    controls: List[_Control] = []
+    forms: List[_Form] = []
+    form_stack: List[_Form] = []
+    label_stack: List[List[_Control]] = []  # controls inside each open <label>
+    label_for_ids = set()
+
+    for tag in tokens.tags_named("form", "label", "button", *FORM_CONTROL_TAGS):
+        name = tag.name
+        if tag.is_end:
+            if name == "label" and label_stack:
+                for control in label_stack.pop():
+                    control.labeled = True
+            elif name == "form" and form_stack:
+                form_stack.pop()
+            continue
+
+        if name == "label":
+            label_for = next((tag.get(a) for a in LABEL_FOR_ATTRS if tag.get(a)), None)
+            if label_for:
+                label_for_ids.add(label_for)
+            if not tag.self_closing:
+                label_stack.append([])
+        elif name == "form":
+            form = _Form()
+            forms.append(form)
+            if not tag.self_closing:
+                form_stack.append(form)
+        elif name == "button" or name in FORM_CONTROL_TAGS:
+            form = form_stack[-1] if form_stack else None
+            if name in ("button", "input") and form is not None and _is_submit_control(tag):
+                form.has_submit = True
+            if name == "button":
+                continue
+            if name == "input":
+                input_type = tag.get("type")
+                # Skip hidden/submit/button/reset/image — not user-fillable
+                if (input_type or "text").lower() in SKIP_INPUT_TYPES:
+                    continue
+                control = _Control(tag, input_type is not None, form)
+            else:
+                control = _Control(tag, True, form)  # textarea/select are inherently typed
+            controls.append(control)
+            if form is not None:
+                form.controls += 1
+            if label_stack:
+                label_stack[-1].append(control)
+
+    for control in controls:
+        if control.id and control.id in label_for_ids:
+            control.labeled = True
+        if control.required and control.form is not None:
+            control.form.has_required = True
+    return controls, forms
+
+
+def scan_file(doc: SourceDocument) -> Dict:
+    """Per-file (map) step: count Category 2 signals in one document."""
+    tokens = doc.tokens
+    controls, forms = _analyze(tokens)
+
+    # Outside any <form> (e.g. JSX components), any submit control in the
+    # file counts.
+    has_submit_mechanism = any(
+        _is_submit_control(tag) for tag in tokens.start_tags("button", "input")
+    )
+    form_controls = [form for form in forms if form.controls]
+
+    return {
+        "findings": [],
+        "inputs": len(controls),
+        "labeled": sum(1 for c in controls if c.labeled),
+        "typed": sum(1 for c in controls if c.typed),
+        "named": sum(1 for c in controls if c.named),
+        "required": sum(1 for c in controls if c.required),
+        "has_inputs": bool(controls),
+        "has_submit": has_submit_mechanism,
+        "forms": len(form_controls),
+        "forms_without_submit": sum(1 for form in form_controls if not form.has_submit),
+        "forms_without_required": sum(1 for form in form_controls if not form.has_required),
+    }
+
+
+def merge_results(partials: Iterable[Dict]) -> Dict:
+    """Merge (reduce) step: fold per-file partials into the category result."""
     findings = []
     total_checks = 0
     passed_checks = 0
@@ -95,102 +158,25 @@ def check_form_accessibility(files: List[Path]) -> Dict:
     typed_inputs = 0
     named_inputs = 0
     inputs_with_required_attr = 0
-    inputs_needing_required = 0  # inputs that have required or aria-required
 
     has_any_form_inputs = False
     has_submit_mechanism = False
-    total_wrapped_count = 0
-
-    for filepath in files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Collect all label[for] ids in this file
-        label_for_ids = set(LABEL_FOR_PATTERN.findall(content))
-
-        # Find wrapping labels per-file (avoid cross-file false positives)
-        total_wrapped_count += len(LABEL_WRAP_PATTERN.findall(content))
-
-        # Check submit mechanisms
-        if (SUBMIT_BUTTON_PATTERN.search(content)
-                or INPUT_SUBMIT_PATTERN.search(content)
-                or BUTTON_DEFAULT_SUBMIT.search(content)):
-            has_submit_mechanism = True
-
-        # Process each <input>
-        for match in INPUT_PATTERN.finditer(content):
-            attrs = match.group(1)
-            input_type = _get_attr(attrs, "type") or "text"
-
-            # Skip hidden/submit/button/reset/image — not user-fillable
-            if input_type.lower() in SKIP_INPUT_TYPES:
-                continue
-
-            has_any_form_inputs = True
-            all_inputs_count += 1
-
-            # Check: has type attribute?
-            if _has_attr(attrs, "type"):
-                typed_inputs += 1
-
-            # Check: has name attribute?
-            if _has_attr(attrs, "name"):
-                named_inputs += 1
-
-            # Check: has associated label?
-            input_id = _get_attr(attrs, "id")
-            if input_id and input_id in label_for_ids:
-                labeled_inputs += 1
-            elif _has_attr(attrs, "aria-label") or _has_attr(attrs, "aria-labelledby"):
-                labeled_inputs += 1
-            # Note: wrapping labels are harder to match per-input with regex,
-            # we count them as a bulk check below.
-
-            # Check: required marking
-            if _has_attr(attrs, "required") or _has_attr(attrs, "aria-required"):
-                inputs_with_required_attr += 1
-
-        # Process <textarea>
-        for match in TEXTAREA_PATTERN.finditer(content):
-            attrs = match.group(1)
-            has_any_form_inputs = True
-            all_inputs_count += 1
-            # name check
-            if _has_attr(attrs, "name"):
-                named_inputs += 1
-            typed_inputs += 1  # textarea is inherently typed
-            # label check
-            input_id = _get_attr(attrs, "id")
-            if input_id and input_id in label_for_ids:
-                labeled_inputs += 1
-            elif _has_attr(attrs, "aria-label") or _has_attr(attrs, "aria-labelledby"):
-                labeled_inputs += 1
-
-            if _has_attr(attrs, "required") or _has_attr(attrs, "aria-required"):
-                inputs_with_required_attr += 1
-
-        # Process <select>
-        for match in SELECT_PATTERN.finditer(content):
-            attrs = match.group(1)
-            has_any_form_inputs = True
-            all_inputs_count += 1
-            if _has_attr(attrs, "name"):
-                named_inputs += 1
-            typed_inputs += 1  # select is inherently typed
-            input_id = _get_attr(attrs, "id")
-            if input_id and input_id in label_for_ids:
-                labeled_inputs += 1
-            elif _has_attr(attrs, "aria-label") or _has_attr(attrs, "aria-labelledby"):
-                labeled_inputs += 1
-
-            if _has_attr(attrs, "required") or _has_attr(attrs, "aria-required"):
-                inputs_with_required_attr += 1
-
-    # Don't double-count: wrapped labels supplement for/id labels
-    remaining_unlabeled = all_inputs_count - labeled_inputs
-    if remaining_unlabeled > 0 and total_wrapped_count > 0:
-        additionally_labeled = min(remaining_unlabeled, total_wrapped_count)
-        labeled_inputs += additionally_labeled
+    forms = 0
+    forms_without_submit = 0
+    forms_without_required = 0
+
+    for partial in partials:
+        findings.extend(partial["findings"])
+        all_inputs_count += partial["inputs"]
+        labeled_inputs += partial["labeled"]
+        typed_inputs += partial["typed"]
+        named_inputs += partial["named"]
+        inputs_with_required_attr += partial["required"]
+        has_any_form_inputs = has_any_form_inputs or partial["has_inputs"]
+        has_submit_mechanism = has_submit_mechanism or partial["has_submit"]
+        forms += partial["forms"]
+        forms_without_submit += partial["forms_without_submit"]
+        forms_without_required += partial["forms_without_required"]
 
     # --- Aggregate checks ---
 
@@ -258,9 +244,16 @@ def check_form_accessibility(files: List[Path]) -> Dict:
             "detail": f"{unnamed} of {all_inputs_count} inputs are missing a name attribute. Agents use name to identify fields.",
         })
 
-    # Check 4: Submit mechanism
+    # Check 4: Submit mechanism — per <form> when there are forms with
+    # inputs, else anywhere in the files (e.g. JSX components without <form>)
     total_checks += 1
-    if has_submit_mechanism:
+    if forms and forms_without_submit:
+        findings.append({
+            "check": "submit_button",
+            "passed": False,
+            "detail": f"{forms_without_submit} of {forms} forms have no identifiable submit button. Agents need <button type='submit'> or <input type='submit'>.",
+        })
+    elif forms or has_submit_mechanism:
         passed_checks += 1
         findings.append({
             "check": "submit_button",
@@ -274,9 +267,16 @@ def check_form_accessibility(files: List[Path]) -> Dict:
             "detail": "No identifiable submit button found. Agents need <button type='submit'> or <input type='submit'>.",
         })
 
-    # Check 5: Required fields marked
+    # Check 5: Required fields marked — per <form> like the submit check,
+    # else anywhere in the files
     total_checks += 1
-    if inputs_with_required_attr > 0:
+    if forms and forms_without_required:
+        findings.append({
+            "check": "required_fields",
+            "passed": False,
+            "detail": f"{forms_without_required} of {forms} forms mark no field with required or aria-required. Agents can't determine which fields are mandatory.",
+        })
+    elif inputs_with_required_attr > 0:
         passed_checks += 1
         findings.append({
             "check": "required_fields",
@@ -296,3 +296,16 @@ def check_form_accessibility(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_form_accessibility(files: List[Source]) -> Dict:
+    """Run all Category 2 checks across the given files.
+
+    Checks:
+    1. Every <input> has an associated <label> (via for/id or wrapping)
+    2. Inputs have type attribute
+    3. Inputs have name attribute
+    4. Every form has an identifiable submit button
+    5. Every form marks its required fields with required or aria-required
+    """
+    return merge_results(scan_file(doc) for doc in as_documents(files))
@@ -4,18 +4,14 @@ check_link_navigation.py — Category 6: Link & Navigation Clarity (Weight: 10%)
 Checks for descriptive link text, proper href attributes, and consistent navigation structure.
 Returns a dict with score, max, and detailed findings.
 
-Detection: regex pattern matching on anchor tags and navigation elements.
+Detection: shared tag tokenizer for anchors and navigation elements + attribute parser.
 """
 
-import re
-from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 
-# Anchor tags
-ANCHOR_PATTERN = re.compile(
-    r"<a\b([^>]*)>(.*?)</a>",
-    re.IGNORECASE | re.DOTALL,
-)
+from scan.document import Source, SourceDocument, as_documents
+from scan.findings import Finding, as_dict
+from scan.tokenizer import Tag, TokenStream, strip_tags
 
 # Generic/vague link text patterns (case-insensitive match against inner text)
 # Short single words are matched exactly; multi-word phrases use startswith
@@ -33,40 +29,108 @@ GENERIC_LINK_TEXT_PREFIX = [
     "read more",
 ]
 
-# href attribute (HTML quotes and JSX curly braces)
-HREF_PATTERN = re.compile(r'\bhref\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
-HREF_JSX_PATTERN = re.compile(r'\bhref\s*=\s*\{', re.IGNORECASE)
+# Non-functional hrefs
+NONFUNCTIONAL_HREFS = {"#", "javascript:void(0)", "javascript:void(0);", "javascript:;"}
 
-# Anchor with onClick but no href (JS-only navigation)
-ANCHOR_ONCLICK_NO_HREF = re.compile(
-    r"<a\b(?![^>]*\bhref\s*=)[^>]*(onClick|onclick)\s*=",
-    re.IGNORECASE,
-)
 
-# Navigation element with links
-NAV_WITH_LINKS = re.compile(
-    r"<nav\b[^>]*>.*?<a\b.*?</nav>",
-    re.IGNORECASE | re.DOTALL,
-)
+def _has_nav_with_links(tokens: TokenStream) -> bool:
+    """A <nav> start tag followed by an <a> and then a closing </nav>."""
+    navs = tokens.start_tags("nav")
+    if not navs:
+        return False
+    nav = navs[0]
+    anchor = next((a for a in tokens.start_tags("a") if a.start >= nav.end), None)
+    if anchor is None:
+        return False
+    return any(end.start > anchor.start for end in tokens.end_tags("nav"))
 
-# Non-functional hrefs
-NONFUNCTIONAL_HREFS = {"#", "javascript:void(0)", "javascript:void(0);", "javascript:;"}
+
+def _anchors(tokens: TokenStream) -> Iterator[Tuple[Tag, str]]:
+    """Yield (<a> tag, inner HTML) for each <a ...>...</a>, non-overlapping.
+
+    The closing </a> is found by binary search, and an <a> that is never
+    closed ends the walk (no later <a> can close either), so unclosed
+    anchors cost O(log n) each instead of a rescan to end of file.
+    """
+    resume_at = 0
+    for tag in tokens.start_tags("a"):
+        if tag.start < resume_at:
+            continue
+        close = tokens.first_end_tag("a", tag.end)
+        if close is None:
+            return
+        resume_at = close.end
+        yield tag, tokens.text[tag.end:close.start]
 
 
 def _extract_text(html_fragment: str) -> str:
     """Strip HTML tags and get visible text."""
-    text = re.sub(r"<[^>]+>", "", html_fragment)
-    return text.strip()
+    return strip_tags(html_fragment).strip()
 
 
-def check_link_navigation(files: List[Path]) -> Dict:
-    """Run all Category 6 checks across the given files.
+def scan_file(doc: SourceDocument) -> Dict:
+    """Per-file (map) step: collect Category 6 signals from one document."""
+    fname = doc.name
+    findings = []
 
-    Checks:
-    1. Links have descriptive text (not "click here", "learn more", etc.)
-    2. Links have href attributes (not JS-only navigation)
-    3. Navigation structure is consistent (<nav> with links)
-    """
+    total_links = 0
+    generic_text_links = 0
+    links_without_href = 0
+    links_with_nonfunctional_href = 0
+    has_nav_with_links = False
+
+    # Check for <nav> containing links
+    if _has_nav_with_links(doc.tokens):
+        has_nav_with_links = True
+
+    # Process each anchor tag
+    for tag, inner_html in _anchors(doc.tokens):
+        total_links += 1
+        link_text = _extract_text(inner_html).lower()
+
+        # Check 1: Generic link text
+        # Exact match for short words, startswith for multi-word phrases
+        is_generic = (
+            link_text in GENERIC_LINK_TEXT_EXACT
+            or any(link_text.startswith(prefix) for prefix in GENERIC_LINK_TEXT_PREFIX)
+        )
+        if is_generic:
+            generic_text_links += 1
+            findings.append(Finding(
+                "descriptive_link_text", False, fname,
+                "{file}: Link with generic text \"{}\". Agents can't determine purpose.", link_text,
+            ))
+
+        # Check 2: href attribute
+        # (HTML quoted/unquoted values and JSX {expr}; only literal
+        # values can be non-functional)
+        href = tag.get("href")
+        if href is None:
+            links_without_href += 1
+            findings.append(Finding(
+                "link_has_href", False, fname,
+                "{file}: <a> tag without href attribute. Agents can't follow this link.",
+            ))
+        elif href.strip().lower() in NONFUNCTIONAL_HREFS:
+            links_with_nonfunctional_href += 1
+            findings.append(Finding(
+                "link_has_href", False, fname,
+                "{file}: <a> tag with non-functional href=\"{}\". Agents treat this as a dead link.",
+                href,
+            ))
+
+    return {
+        "findings": findings,
+        "links": total_links,
+        "generic_text": generic_text_links,
+        "without_href": links_without_href,
+        "nonfunctional_href": links_with_nonfunctional_href,
+        "has_nav_with_links": has_nav_with_links,
+    }
+
+
+def merge_results(partials: Iterable[Dict]) -> Dict:
+    """Merge (reduce) step: fold per-file partials, in file order, into the category result."""
     findings = []
     total_checks = 0
     passed_checks = 0
@@ -77,59 +141,13 @@ def check_link_navigation(files: List[Path]) -> Dict:
     links_with_nonfunctional_href = 0
     has_nav_with_links = False
 
-    for filepath in files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Check for <nav> containing links
-        if NAV_WITH_LINKS.search(content):
-            has_nav_with_links = True
-
-        # Process each anchor tag
-        for match in ANCHOR_PATTERN.finditer(content):
-            total_links += 1
-            attrs = match.group(1)
-            inner_html = match.group(2)
-            link_text = _extract_text(inner_html).lower()
-
-            # Check 1: Generic link text
-            # Exact match for short words, startswith for multi-word phrases
-            is_generic = (
-                link_text in GENERIC_LINK_TEXT_EXACT
-                or any(link_text.startswith(prefix) for prefix in GENERIC_LINK_TEXT_PREFIX)
-            )
-            if is_generic:
-                generic_text_links += 1
-                findings.append({
-                    "check": "descriptive_link_text",
-                    "passed": False,
-                    "detail": f"{fname}: Link with generic text \"{link_text}\". Agents can't determine purpose.",
-                    "file": fname,
-                })
-
-            # Check 2: href attribute
-            href_match = HREF_PATTERN.search(attrs)
-            has_jsx_href = HREF_JSX_PATTERN.search(attrs)
-            if not href_match and not has_jsx_href:
-                links_without_href += 1
-                findings.append({
-                    "check": "link_has_href",
-                    "passed": False,
-                    "detail": f"{fname}: <a> tag without href attribute. Agents can't follow this link.",
-                    "file": fname,
-                })
-            elif href_match and href_match.group(1).strip().lower() in NONFUNCTIONAL_HREFS:
-                links_with_nonfunctional_href += 1
-                findings.append({
-                    "check": "link_has_href",
-                    "passed": False,
-                    "detail": f"{fname}: <a> tag with non-functional href=\"{href_match.group(1)}\". Agents treat this as a dead link.",
-                    "file": fname,
-                })
-
-        # Also catch anchors with onClick but no href at all
-        onclick_no_href = ANCHOR_ONCLICK_NO_HREF.findall(content)
-        # These may overlap with the above; findings are deduplicated by Claude reasoning
+    for partial in partials:
+        findings.extend(map(as_dict, partial["findings"]))
+        total_links += partial["links"]
+        generic_text_links += partial["generic_text"]
+        links_without_href += partial["without_href"]
+        links_with_nonfunctional_href += partial["nonfunctional_href"]
+        has_nav_with_links = has_nav_with_links or partial["has_nav_with_links"]
 
     if total_links == 0:
         return {
@@ -200,3 +218,14 @@ def check_link_navigation(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_link_navigation(files: List[Source]) -> Dict:
+    """Run all Category 6 checks across the given files.
+
+    Checks:
+    1. Links have descriptive text (not "click here", "learn more", etc.)
+    2. Links have href attributes (not JS-only navigation)
+    3. Navigation structure is consistent (<nav> with links)
+    """
+    return merge_results(scan_file(doc) for doc in as_documents(files))
@@ -4,48 +4,83 @@ check_semantic_html.py — Category 1: Semantic HTML (Weight: 25%)
 Checks whether files use semantic HTML elements that agents can identify by tag name.
 Returns a dict with score, max, and detailed findings.
 
-Detection: regex + string matching. NO AST parsing. NO judgment (that's Claude's job).
+Detection: shared tag tokenizer + regex. NO AST parsing. NO judgment (that's Claude's job).
 """
 
 import re
-from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List
 
-# Patterns for div/span with click handlers (anti-pattern)
-DIV_CLICK_PATTERN = re.compile(
-    r"<(div|span)\b[^>]*(onClick|onclick|onPress)\s*=",
+from scan.document import Source, SourceDocument, as_documents
+from scan.findings import Finding, as_dict
+
+# div/span with click handlers (anti-pattern): handler attribute on the tag
+CLICK_HANDLER_ATTR_PATTERN = re.compile(
+    r"(onClick|onclick|onPress)\s*=",
     re.IGNORECASE,
 )
 
 # Semantic interactive elements
-BUTTON_PATTERN = re.compile(r"<button\b", re.IGNORECASE)
-ANCHOR_PATTERN = re.compile(r"<a\b", re.IGNORECASE)
-INPUT_PATTERN = re.compile(r"<input\b", re.IGNORECASE)
-SELECT_PATTERN = re.compile(r"<select\b", re.IGNORECASE)
-TEXTAREA_PATTERN = re.compile(r"<textarea\b", re.IGNORECASE)
-
-NAV_PATTERN = re.compile(r"<nav\b", re.IGNORECASE)
-MAIN_PATTERN = re.compile(r"<main\b", re.IGNORECASE)
-FORM_PATTERN = re.compile(r"<form\b", re.IGNORECASE)
+INTERACTIVE_TAGS = ("button", "a", "input", "select", "textarea")
 
 # Heading hierarchy
-HEADING_PATTERN = re.compile(r"<h([1-6])\b", re.IGNORECASE)
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
 
 # List elements
-LIST_PATTERN = re.compile(r"<(ul|ol)\b", re.IGNORECASE)
-LIST_ITEM_PATTERN = re.compile(r"<li\b", re.IGNORECASE)
+LIST_TAGS = ("ul", "ol")
 
 
-def check_semantic_html(files: List[Path]) -> Dict:
-    """Run all Category 1 checks across the given files.
+def scan_file(doc: SourceDocument) -> Dict:
+    """Per-file (map) step: count Category 1 signals in one document.
 
-    Checks:
-    1. Interactive elements use <button>, <a>, <input>, <select>, <textarea> (not div/span with onClick)
-    2. Navigation uses <nav>
-    3. Main content uses <main>
-    4. Headers use <h1>-<h6> with proper hierarchy
-    5. Lists use <ul>, <ol>, <li>
-    6. Forms use <form>
+    Returns a small JSON-serializable partial result consumed by merge_results().
+    """
+    tokens = doc.tokens
+    fname = doc.name
+    findings = []
+
+    # Check 1: Interactive elements — semantic vs div-click
+    div_clicks = sum(
+        1 for tag in tokens.start_tags("div", "span")
+        if CLICK_HANDLER_ATTR_PATTERN.search(tag.attrs)
+    )
+    semantic_interactives = tokens.count(*INTERACTIVE_TAGS)
+
+    if div_clicks > 0:
+        findings.append(Finding(
+            "semantic_interactive_elements", False, fname,
+            "{file}: Found {} div/span with click handlers instead of semantic elements.", div_clicks,
+        ))
+
+    # Check 4: Heading hierarchy
+    headings = [int(tag.name[1]) for tag in tokens.start_tags(*HEADING_TAGS)]
+    # Check for skipped levels
+    for i in range(len(headings) - 1):
+        if headings[i + 1] > headings[i] + 1:
+            findings.append(Finding(
+                "heading_hierarchy", False, fname,
+                "{file}: Heading level skips from h{} to h{}.", headings[i], headings[i + 1],
+            ))
+
+    return {
+        "findings": findings,
+        "div_clicks": div_clicks,
+        "semantic_interactives": semantic_interactives,
+        # Check 2: Navigation
+        "has_nav": tokens.has("nav"),
+        # Check 3: Main content
+        "has_main": tokens.has("main"),
+        "has_headings": bool(headings),
+        # Check 5: Lists
+        "has_lists": bool(tokens.count(*LIST_TAGS) and tokens.has("li")),
+        # Check 6: Forms
+        "has_forms": tokens.has("form"),
+    }
+
+
+def merge_results(partials: Iterable[Dict]) -> Dict:
+    """Merge (reduce) step: fold per-file partials into the category result.
+
+    Partials must arrive in file order so findings keep a stable order.
     """
     findings = []
     total_checks = 0
@@ -61,61 +96,16 @@ def check_semantic_html(files: List[Path]) -> Dict:
     total_div_click_count = 0
     total_semantic_interactive_count = 0
 
-    for filepath in files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Check 1: Interactive elements — semantic vs div-click
-        div_clicks = len(DIV_CLICK_PATTERN.findall(content))
-        semantic_interactives = (
-            len(BUTTON_PATTERN.findall(content))
-            + len(ANCHOR_PATTERN.findall(content))
-            + len(INPUT_PATTERN.findall(content))
-            + len(SELECT_PATTERN.findall(content))
-            + len(TEXTAREA_PATTERN.findall(content))
-        )
-        total_div_click_count += div_clicks
-        total_semantic_interactive_count += semantic_interactives
-
-        if div_clicks > 0:
-            findings.append({
-                "check": "semantic_interactive_elements",
-                "passed": False,
-                "detail": f"{fname}: Found {div_clicks} div/span with click handlers instead of semantic elements.",
-                "file": fname,
-            })
-
-        # Check 2: Navigation
-        if NAV_PATTERN.search(content):
-            has_any_nav = True
-
-        # Check 3: Main content
-        if MAIN_PATTERN.search(content):
-            has_any_main = True
-
-        # Check 4: Heading hierarchy
-        headings = [int(m) for m in HEADING_PATTERN.findall(content)]
-        if headings:
-            has_any_headings = True
-            # Check for skipped levels
-            for i in range(len(headings) - 1):
-                if headings[i + 1] > headings[i] + 1:
-                    findings.append({
-                        "check": "heading_hierarchy",
-                        "passed": False,
-                        "detail": f"{fname}: Heading level skips from h{headings[i]} to h{headings[i+1]}.",
-                        "file": fname,
-                    })
-
-        # Check 5: Lists
-        if LIST_PATTERN.search(content) and LIST_ITEM_PATTERN.search(content):
-            has_any_lists = True
-
-        # Check 6: Forms
-        if FORM_PATTERN.search(content):
-            has_any_forms = True
-
-        if semantic_interactives > 0:
+    for partial in partials:
+        findings.extend(map(as_dict, partial["findings"]))
+        total_div_click_count += partial["div_clicks"]
+        total_semantic_interactive_count += partial["semantic_interactives"]
+        has_any_nav = has_any_nav or partial["has_nav"]
+        has_any_main = has_any_main or partial["has_main"]
+        has_any_headings = has_any_headings or partial["has_headings"]
+        has_any_lists = has_any_lists or partial["has_lists"]
+        has_any_forms = has_any_forms or partial["has_forms"]
+        if partial["semantic_interactives"] > 0:
             has_any_interactive = True
 
     # --- Aggregate checks ---
@@ -238,3 +228,17 @@ def check_semantic_html(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_semantic_html(files: List[Source]) -> Dict:
+    """Run all Category 1 checks across the given files.
+
+    Checks:
+    1. Interactive elements use <button>, <a>, <input>, <select>, <textarea> (not div/span with onClick)
+    2. Navigation uses <nav>
+    3. Main content uses <main>
+    4. Headers use <h1>-<h6> with proper hierarchy
+    5. Lists use <ul>, <ol>, <li>
+    6. Forms use <form>
+    """
+    return merge_results(scan_file(doc) for doc in as_documents(files))
@@ -4,51 +4,79 @@ check_structured_data.py — Category 4: Structured Data (Weight: 15%)
 Checks for Schema.org JSON-LD, Open Graph meta tags, title, and meta description.
 Returns a dict with score, max, and detailed findings.
 
-Detection: string search in HTML head sections.
+Detection: shared tag tokenizer + attribute regexes on <head> tags; JSON-LD
+blocks come from the preprocessor (SourceDocument.json_ld).
 """
 
 import re
-from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
-# Schema.org JSON-LD
-JSONLD_PATTERN = re.compile(
-    r'<script\b[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>',
-    re.IGNORECASE,
-)
+from scan.document import Source, SourceDocument, as_documents
+from scan.tokenizer import TokenStream
 
-# Open Graph meta tags
-OG_PATTERN = re.compile(
-    r'<meta\b[^>]*property\s*=\s*["\']og:[^"\']+["\']',
+# Open Graph meta tags (applied to <meta> tag attributes)
+OG_ATTR_PATTERN = re.compile(
+    r'property\s*=\s*["\']og:[^"\']+["\']',
     re.IGNORECASE,
 )
 
-# Title tag with content
-TITLE_PATTERN = re.compile(
-    r"<title\b[^>]*>(.+?)</title>",
-    re.IGNORECASE | re.DOTALL,
-)
-
-# Meta description
-META_DESC_PATTERN = re.compile(
-    r'<meta\b[^>]*name\s*=\s*["\']description["\'][^>]*content\s*=\s*["\']([^"\']+)["\']',
+# Meta description (applied to <meta> tag attributes)
+META_DESC_ATTR_PATTERN = re.compile(
+    r'name\s*=\s*["\']description["\'][^>]*content\s*=\s*["\']([^"\']+)["\']',
     re.IGNORECASE,
 )
 # Also match reversed attribute order
-META_DESC_PATTERN_ALT = re.compile(
-    r'<meta\b[^>]*content\s*=\s*["\']([^"\']+)["\'][^>]*name\s*=\s*["\']description["\']',
+META_DESC_ATTR_PATTERN_ALT = re.compile(
+    r'content\s*=\s*["\']([^"\']+)["\'][^>]*name\s*=\s*["\']description["\']',
     re.IGNORECASE,
 )
 
 
-def check_structured_data(files: List[Path]) -> Dict:
-    """Run all Category 4 checks across the given files.
+def _title_text(tokens: TokenStream) -> Optional[str]:
+    """Text of the first <title>...</title> pair, stripped; None if empty/absent."""
+    titles = tokens.start_tags("title")
+    if not titles:
+        return None
+    opening = titles[0]
+    # At least one character of content, as the old (.+?) pattern required
+    close = tokens.first_end_tag("title", opening.end + 1)
+    if close is None:
+        return None
+    return tokens.text[opening.end:close.start].strip() or None
 
-    Checks:
-    1. Schema.org JSON-LD present
-    2. Open Graph meta tags present
-    3. Page has descriptive <title>
-    4. Meta description present
+
+def scan_file(doc: SourceDocument) -> Optional[Dict]:
+    """Per-file (map) step: collect Category 4 signals from one document.
+
+    Returns None for non-HTML files (JSX/TSX won't have <head> meta).
+    """
+    if doc.suffix.lower() != ".html":
+        return None
+
+    tokens = doc.tokens
+    metas = tokens.start_tags("meta")
+
+    return {
+        "findings": [],
+        # Check 1: JSON-LD (extracted once by the preprocessor)
+        "has_jsonld": bool(doc.json_ld),
+        # Check 2: OG tags
+        "og_count": sum(1 for tag in metas if OG_ATTR_PATTERN.search(tag.attrs)),
+        # Check 3: Title
+        "title": _title_text(tokens),
+        # Check 4: Meta description
+        "has_meta_desc": any(
+            META_DESC_ATTR_PATTERN.search(tag.attrs) or META_DESC_ATTR_PATTERN_ALT.search(tag.attrs)
+            for tag in metas
+        ),
+    }
+
+
+def merge_results(partials: Iterable[Optional[Dict]]) -> Dict:
+    """Merge (reduce) step: fold per-file partials into the category result.
+
+    None partials (non-HTML files) are ignored. The first file (in file
+    order) with a non-empty <title> supplies the reported title.
     """
     findings = []
     total_checks = 0
@@ -60,11 +88,24 @@ def check_structured_data(files: List[Path]) -> Dict:
     has_meta_desc = False
     title_content = ""
     og_count = 0
-
-    # Only check HTML files for structured data (JSX/TSX won't have <head> meta)
-    html_files = [f for f in files if f.suffix.lower() == ".html"]
-
-    if not html_files:
+    html_file_count = 0
+
+    for partial in partials:
+        if partial is None:
+            continue
+        html_file_count += 1
+        findings.extend(partial["findings"])
+        has_jsonld = has_jsonld or partial["has_jsonld"]
+        if partial["og_count"]:
+            has_og_tags = True
+            og_count += partial["og_count"]
+        # Capture the first file's title
+        if not has_title and partial["title"]:
+            has_title = True
+            title_content = partial["title"]
+        has_meta_desc = has_meta_desc or partial["has_meta_desc"]
+
+    if not html_file_count:
         # JSX/TSX only — structured data checks are not applicable
         return {
             "category": "structured_data",
@@ -77,33 +118,6 @@ def check_structured_data(files: List[Path]) -> Dict:
             }],
         }
 
-    for filepath in html_files:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        fname = filepath.name
-
-        # Check 1: JSON-LD
-        if JSONLD_PATTERN.search(content):
-            has_jsonld = True
-
-        # Check 2: OG tags
-        og_matches = OG_PATTERN.findall(content)
-        if og_matches:
-            has_og_tags = True
-            og_count += len(og_matches)
-
-        # Check 3: Title (capture the first file's title)
-        if not has_title:
-            title_match = TITLE_PATTERN.search(content)
-            if title_match:
-                title_text = title_match.group(1).strip()
-                if title_text:
-                    has_title = True
-                    title_content = title_text
-
-        # Check 4: Meta description
-        if META_DESC_PATTERN.search(content) or META_DESC_PATTERN_ALT.search(content):
-            has_meta_desc = True
-
     # --- Aggregate checks ---
 
     # Check 1: Schema.org JSON-LD
@@ -176,3 +190,17 @@ def check_structured_data(files: List[Path]) -> Dict:
         "total": total_checks,
         "findings": findings,
     }
+
+
+def check_structured_data(files: List[Source]) -> Dict:
+    """Run all Category 4 checks across the given files.
+
+    Checks:
+    1. Schema.org JSON-LD present
+    2. Open Graph meta tags present
+    3. Page has descriptive <title>
+    4. Meta description present
+    """
+    # Only check HTML files; skip reading JSX/TSX entirely.
+    html_files = [f for f in files if f.suffix.lower() == ".html"]
+    return merge_results(scan_file(doc) for doc in as_documents(html_files))
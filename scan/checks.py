@@ -0,0 +1,76 @@
+"""
+checks.py — Registry of the 6 category checks as per-file map + merge pairs.
+
+Each check module exposes:
+- scan_file(doc)          -> small JSON-serializable partial for one file (map)
+- merge_results(partials) -> the category result dict (reduce)
+
+ANALYSES are per-file steps that are not scored (e.g. components, whose
+cross-file resolution runs after the merge). They are mapped, cached and
+spilled with the checks' partials.
+
+check_<category>(files) in each module is simply merge_results over scan_file,
+so the serial path and the process-pool path produce identical results as long
+as partials are merged in file order.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scan import (
+    check_aria,
+    check_content_in_html,
+    check_form_accessibility,
+    check_link_navigation,
+    check_semantic_html,
+    check_structured_data,
+    components,
+)
+from scan.document import SourceDocument, load_document
+
+# Category name -> check module. Order matches the output JSON.
+CHECKS = {
+    "semantic_html": check_semantic_html,
+    "form_accessibility": check_form_accessibility,
+    "aria": check_aria,
+    "structured_data": check_structured_data,
+    "content_in_html": check_content_in_html,
+    "link_navigation": check_link_navigation,
+}
+
+# Unscored per-file analyses: name -> module with scan_file(doc)
+ANALYSES = {
+    "components": components,
+}
+
+# Per-file partials for every category and analysis: {name: partial or None}
+FilePartials = Dict[str, Optional[Dict]]
+
+
+def map_document(doc: SourceDocument) -> FilePartials:
+    """Run every category's and analysis' per-file step on one document."""
+    return {name: module.scan_file(doc) for name, module in {**CHECKS, **ANALYSES}.items()}
+
+
+def map_path(
+    path: str,
+    root: Optional[str] = None,
+    blob_sha: Optional[str] = None,
+    raw: Optional[bytes] = None,
+) -> FilePartials:
+    """Read a file and map it. Top-level so it can run in a worker process.
+
+    Only the small partials travel back to the parent. raw is the file's
+    bytes when the parent already read them (to compute a cache key), so
+    the file is not read twice and the partials match the cached key.
+    """
+    doc = load_document(Path(path), Path(root) if root else None, blob_sha, raw)
+    return map_document(doc)
+
+
+def merge_partials(per_file: List[FilePartials]) -> Dict[str, Dict]:
+    """Fold per-file partials (in file order) into the categories dict."""
+    return {
+        name: module.merge_results(partials[name] for partials in per_file)
+        for name, module in CHECKS.items()
+    }
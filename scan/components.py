@@ -0,0 +1,271 @@
+"""
+components.py — Cross-file React component resolution.
+
+Pages are composed from <Button>, <NavLink>, <TextField> ... defined in
+other .jsx/.tsx files, and the checks only see each file's own tags. This
+module answers "what does <NavLink> render as?" in two steps that follow
+the map/merge split of the checks:
+
+- scan_file(doc) (map, per file, cached with the other partials): the
+  file's imports, the components it defines with the root tag each one
+  returns, and how often it uses each imported or locally defined component.
+- ComponentGraph (merge, whole repo): maps each used component to its
+  defining file through the relative imports and computes a "renders-as"
+  summary (root element, role, aria-label, forwarded props), following
+  components that render other components. Each (file, component) summary
+  is computed once and reused for every usage.
+
+Only relative imports ("./Button", "../ui") of scanned files are resolved;
+package imports and path aliases are counted as unresolved.
+
+Detection: regex + the shared tokenizer. NO AST parsing.
+"""
+
+import posixpath
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from scan.document import SourceDocument
+from scan.tokenizer import Tag
+
+COMPONENT_EXTENSIONS = (".jsx", ".tsx")
+MODULE_EXTENSIONS = (".jsx", ".tsx", ".js", ".ts")
+
+# import Default, { A, B as C } from "./x"   (also "import type ...")
+IMPORT_PATTERN = re.compile(
+    r"""^[ \t]*import\s+(?:type\s+)?([\w$\s{},*]+?)\s+from\s+['"]([^'"]+)['"]""",
+    re.MULTILINE,
+)
+IMPORT_SPECIFIER_PATTERN = re.compile(r"([\w$]+)(?:\s+as\s+([\w$]+))?")
+
+# function Button(  |  const Button = ...  (optionally exported / default)
+DEFINITION_PATTERN = re.compile(
+    r"^[ \t]*(export\s+(?:default\s+)?)?"
+    r"(?:(?:async\s+)?function\s*\*?\s*([A-Z][\w$]*)|(?:const|let|var)\s+([A-Z][\w$]*)\b[^=\n]*=)",
+    re.MULTILINE,
+)
+DEFAULT_EXPORT_PATTERN = re.compile(r"^[ \t]*export\s+default\s+(?:\w+\()?\s*([A-Z][\w$]*)", re.MULTILINE)
+
+# Where a component's JSX starts: return <x ...> / => <x ...> (optionally in parens)
+RETURN_JSX_PATTERN = re.compile(r"(?:\breturn|=>)\s*\(?\s*(?=<[A-Za-z])")
+# Nesting that separates a component's own return from its callbacks'
+BRACKET_PATTERN = re.compile(r"[{}()]")
+
+# {...props} on the root element: callers' attributes reach it
+SPREAD_PATTERN = re.compile(r"\{\s*\.\.\.")
+
+# Root elements that make a component interactive / a link / a form control
+INTERACTIVE_ELEMENTS = {"button", "a", "input", "select", "textarea", "summary"}
+
+# Nested components followed before giving up (guards cycles and deep chains)
+MAX_DEPTH = 16
+
+
+def _is_component_name(name: str) -> bool:
+    return name[:1].isupper()
+
+
+def _parse_imports(text: str) -> Dict[str, List[str]]:
+    """Local name -> [module source, imported name ("default" for default imports)]."""
+    imports: Dict[str, List[str]] = {}
+    for m in IMPORT_PATTERN.finditer(text):
+        clause, source = m.group(1), m.group(2)
+        named_start = clause.find("{")
+        default_part = clause if named_start == -1 else clause[:named_start]
+        default_name = default_part.strip().rstrip(",").strip()
+        if default_name and not default_name.startswith("*"):
+            imports[default_name] = [source, "default"]
+        if named_start != -1:
+            named = clause[named_start + 1:clause.find("}", named_start) if "}" in clause else None]
+            for spec in IMPORT_SPECIFIER_PATTERN.finditer(named):
+                imported, local = spec.group(1), spec.group(2) or spec.group(1)
+                if imported != "type":
+                    imports[local] = [source, imported]
+    return imports
+
+
+def _nesting_depths(doc: SourceDocument, offsets: List[int], start: int = 0) -> List[int]:
+    """{ } / ( ) nesting depth at each offset (ascending), counted from start.
+
+    Counted in doc.markup, where strings and comments are blanked.
+    """
+    depths = []
+    depth = 0
+    brackets = BRACKET_PATTERN.finditer(doc.markup, start, offsets[-1] if offsets else start)
+    bracket = next(brackets, None)
+    for offset in offsets:
+        while bracket is not None and bracket.start() < offset:
+            depth += 1 if bracket.group() in "{(" else -1
+            bracket = next(brackets, None)
+        depths.append(depth)
+    return depths
+
+
+def _root_tag(doc: SourceDocument, start: int, end: int) -> Optional[Tag]:
+    """The JSX element the component body between start and end returns.
+
+    That is the last return <x> / => <x> at the body's own nesting level
+    (the shallowest one), so the <li> of items.map(item => <li>) does not
+    win over the component's own return <nav>.
+    """
+    tags = doc.tokens.tags
+    returns = list(RETURN_JSX_PATTERN.finditer(doc.text, start, end))
+    root, root_depth = None, None
+    for m, depth in zip(returns, _nesting_depths(doc, [m.start() for m in returns], start)):
+        if root_depth is not None and depth > root_depth:
+            continue
+        i = bisect_left(tags, m.end(), key=lambda t: t.start)
+        if i < len(tags) and tags[i].start == m.end():
+            root, root_depth = tags[i], depth
+    return root
+
+
+def _root_summary(doc: SourceDocument, start: int, end: int) -> Optional[Dict]:
+    """What the JSX element returned by a component's body (start to end) is."""
+    tag = _root_tag(doc, start, end)
+    if tag is None:
+        return None
+    attrs = tag.attributes
+    return {
+        "renders": tag.raw_name if _is_component_name(tag.raw_name) else tag.name,
+        "role": attrs.get("role"),
+        "aria_label": bool(attrs.get("aria-label") or attrs.get("aria-labelledby")),
+        "forwards_props": bool(SPREAD_PATTERN.search(tag.attrs)),
+    }
+
+
+def scan_file(doc: SourceDocument) -> Optional[Dict]:
+    """Per-file (map) step: imports, defined components and component usages.
+
+    None for files that are not .jsx/.tsx. Depends only on the file's
+    content (no paths), so it can be cached like the check partials.
+    """
+    if doc.suffix.lower() not in COMPONENT_EXTENSIONS:
+        return None
+    text = doc.text
+
+    # Top-level definitions only: a helper defined inside a component is
+    # part of that component's body.
+    found = list(DEFINITION_PATTERN.finditer(text))
+    definitions = [
+        m for m, depth in zip(found, _nesting_depths(doc, [m.start() for m in found])) if depth == 0
+    ]
+    defined: Dict[str, Optional[Dict]] = {}
+    default_export = None
+    for i, m in enumerate(definitions):
+        name = m.group(2) or m.group(3)
+        # A component's body runs until the next top-level definition.
+        end = definitions[i + 1].start() if i + 1 < len(definitions) else len(text)
+        defined.setdefault(name, _root_summary(doc, m.end(), end))
+        if m.group(1) and "default" in m.group(1):
+            default_export = name
+    if default_export is None:
+        m = DEFAULT_EXPORT_PATTERN.search(text)
+        if m and m.group(1) in defined:
+            default_export = m.group(1)
+
+    # Usages of imported or locally defined components only (so TS generics
+    # like useState<Order> are not counted).
+    imports = _parse_imports(text)
+    usages: Dict[str, int] = {}
+    for tag in doc.tokens.tags:
+        name = tag.raw_name
+        if not tag.is_end and (name in imports or name in defined):
+            usages[name] = usages.get(name, 0) + 1
+
+    return {
+        "imports": imports,
+        "defines": defined,
+        "default_export": default_export,
+        "uses": dict(sorted(usages.items())),
+    }
+
+
+class ComponentGraph:
+    """Resolves component usages across files, memoizing one summary per component.
+
+    files is the scanned files' relative paths (POSIX), partials the
+    matching components.scan_file() results (None for non-JSX files).
+    """
+
+    def __init__(self, files: List[str], partials: List[Optional[Dict]]):
+        self._partials: Dict[str, Dict] = {
+            path: partial for path, partial in zip(files, partials) if partial is not None
+        }
+        self._summaries: Dict[Tuple[str, str], Optional[Dict]] = {}
+        self.computed = 0
+
+    def resolve_module(self, importer: str, source: str) -> Optional[str]:
+        """The scanned file a relative import refers to, or None."""
+        if not source.startswith("."):
+            return None
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), source))
+        candidates = [base] + [base + ext for ext in MODULE_EXTENSIONS]
+        candidates += [posixpath.join(base, "index" + ext) for ext in MODULE_EXTENSIONS]
+        return next((c for c in candidates if c in self._partials), None)
+
+    def _locate(self, file: str, name: str) -> Optional[Tuple[str, str]]:
+        """(defining file, name there) for a component name used in file."""
+        partial = self._partials[file]
+        if name in partial["defines"]:
+            return file, name
+        imported = partial["imports"].get(name)
+        if imported is None:
+            return None
+        target = self.resolve_module(file, imported[0])
+        if target is None:
+            return None
+        exported = imported[1]
+        if exported == "default":
+            exported = self._partials[target]["default_export"]
+        if exported is None or exported not in self._partials[target]["defines"]:
+            return None
+        return target, exported
+
+    def summary(self, file: str, name: str, depth: int = 0) -> Optional[Dict]:
+        """Renders-as summary of component name as used in file (memoized)."""
+        located = self._locate(file, name)
+        if located is None:
+            return None
+        if located in self._summaries:
+            return self._summaries[located]
+        # Placeholder while resolving breaks import cycles.
+        self._summaries[located] = None
+        self.computed += 1
+        target, defined = located
+        root = self._partials[target]["defines"][defined]
+        result = None
+        if root is not None:
+            result = {"component": defined, "file": target, **root, "via": []}
+            inner = root["renders"]
+            if _is_component_name(inner) and depth < MAX_DEPTH:
+                nested = self.summary(target, inner, depth + 1)
+                if nested is not None:
+                    result.update(
+                        renders=nested["renders"],
+                        role=root["role"] or nested["role"],
+                        aria_label=root["aria_label"] or nested["aria_label"],
+                        forwards_props=root["forwards_props"] and nested["forwards_props"],
+                        via=[inner] + nested["via"],
+                    )
+        self._summaries[located] = result
+        return result
+
+    def report(self) -> Dict:
+        """Every resolved component with its summary and usage count, plus unresolved counts."""
+        resolved: Dict[Tuple[str, str], Dict] = {}
+        unresolved: Dict[str, int] = {}
+        for file, partial in self._partials.items():
+            for name, count in partial["uses"].items():
+                summary = self.summary(file, name)
+                if summary is None:
+                    unresolved[name] = unresolved.get(name, 0) + count
+                    continue
+                key = (summary["file"], summary["component"])
+                entry = resolved.setdefault(key, {**summary, "interactive": summary["renders"] in INTERACTIVE_ELEMENTS, "usages": 0})
+                entry["usages"] += count
+        return {
+            "resolved": [resolved[key] for key in sorted(resolved)],
+            "unresolved": dict(sorted(unresolved.items())),
+        }
@@ -0,0 +1,136 @@
+"""
+document.py — Read-once source documents shared by all 6 category checks.
+
+run_scan() loads every discovered file into a SourceDocument exactly once.
+The checks consume the decoded text instead of re-reading the file themselves.
+
+Check functions still accept plain Path objects so they can be called
+standalone (tests, ad-hoc use). as_documents() loads those on demand.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from scan.preprocess import Preprocessed, preprocess
+from scan.tokenizer import TokenStream
+
+
+@dataclass
+class SourceDocument:
+    """One source file, read and decoded once per scan."""
+
+    path: Path
+    relative_path: str
+    text: str
+    size: int
+    sha256: str
+    # Staged git blob SHA when discovered via the git index and unmodified.
+    blob_sha: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @cached_property
+    def preprocessed(self) -> Preprocessed:
+        """Markup view and JSON-LD blocks, computed once and shared by all checks."""
+        return preprocess(self.text, self.suffix)
+
+    @property
+    def markup(self) -> str:
+        """text with everything that is not markup blanked (same offsets).
+
+        HTML comments and <script>/<style> bodies for .html; JavaScript
+        comments, strings, comparisons and generics for .jsx/.tsx.
+        """
+        return self.preprocessed.markup
+
+    @property
+    def json_ld(self) -> List[str]:
+        """Bodies of the document's <script type="application/ld+json"> blocks."""
+        return self.preprocessed.json_ld
+
+    @cached_property
+    def tokens(self) -> TokenStream:
+        """Tag stream for this document, tokenized once and shared by all checks."""
+        return TokenStream(self.text, self.markup)
+
+
+# A check accepts either already-loaded documents or bare paths.
+Source = Union[Path, SourceDocument]
+
+
+def decode_source(raw: bytes) -> str:
+    """Decode file bytes the same way Path.read_text() does.
+
+    UTF-8 with undecodable bytes dropped, and universal newlines
+    (\\r\\n and \\r become \\n) so offsets match text-mode reads.
+    """
+    text = raw.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def load_document(
+    path: Path,
+    root: Optional[Path] = None,
+    blob_sha: Optional[str] = None,
+    raw: Optional[bytes] = None,
+) -> SourceDocument:
+    """Read a single file into a SourceDocument.
+
+    Args:
+        path: File to read.
+        root: Project root. When given, relative_path is relative to it;
+              otherwise relative_path is just the file name.
+        blob_sha: Git blob SHA for the file, if already known.
+        raw: The file's bytes, if the caller already read them.
+    """
+    if raw is None:
+        raw = path.read_bytes()
+    if root is not None:
+        relative_path = path.relative_to(root).as_posix()
+    else:
+        relative_path = path.name
+
+    return SourceDocument(
+        path=path,
+        relative_path=relative_path,
+        text=decode_source(raw),
+        size=len(raw),
+        sha256=hashlib.sha256(raw).hexdigest(),
+        blob_sha=blob_sha,
+    )
+
+
+def load_documents(
+    files: Iterable[Path],
+    root: Optional[Path] = None,
+    blob_shas: Optional[Dict[str, str]] = None,
+) -> List[SourceDocument]:
+    """Read every file once, preserving input order.
+
+    blob_shas maps str(path) to a git blob SHA (see find_tracked_source_files).
+    """
+    blob_shas = blob_shas or {}
+    return [load_document(path, root, blob_shas.get(str(path))) for path in files]
+
+
+def as_documents(files: Iterable[Source]) -> List[SourceDocument]:
+    """Normalize a mix of Paths and SourceDocuments into SourceDocuments.
+
+    Already-loaded documents are passed through untouched, so run_scan()
+    never triggers a second read.
+    """
+    return [
+        f if isinstance(f, SourceDocument) else load_document(Path(f))
+        for f in files
+    ]
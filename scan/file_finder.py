@@ -2,13 +2,30 @@
 file_finder.py — Finds HTML, JSX, and TSX files in a repository.
 
 Returns a list of Path objects. Does NOT read file contents.
+Walks with os.scandir and prunes EXCLUDED_DIRS and .gitignore/.hermesignore
+matches before descending into them (see ignore_rules.py).
+find_tracked_source_files() lists tracked files from .git/index instead, and
+discover_paths() applies the same rules to a known list of paths.
 
 Security: Rejects symlinks, path traversal (..), and files outside project root.
 Respects v1.3 hard constraints: max 100 files, excluded directories, prioritized directories.
 """
 
+import os
+import stat
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from scan.git_index import (
+    MODE_REGULAR,
+    MODE_SYMLINK,
+    MODE_TYPE_MASK,
+    GitIndexError,
+    find_git_dir,
+    read_index,
+    worktree_root,
+)
+from scan.ignore_rules import IGNORE_FILE_NAMES, is_ignored, load_matcher
 
 ALLOWED_EXTENSIONS = {".html", ".jsx", ".tsx"}
 
@@ -29,31 +46,372 @@ MAX_FILES = 100
 MAX_FILE_SIZE_BYTES = 50 * 1024  # 50KB
 
 
-def find_source_files(repo_path: str) -> Tuple[List[Path], List[Dict]]:
+class Discovered(NamedTuple):
+    """One file found during discovery: a candidate, or a skip with its reason."""
+
+    path: Path
+    priority: bool
+    skip_reason: Optional[str] = None
+
+    def skipped_entry(self) -> Dict:
+        return {"path": str(self.path), "reason": self.skip_reason}
+
+
+def find_source_files(repo_path: str, respect_ignore_files: bool = True) -> Tuple[List[Path], List[Dict]]:
     """Find all scannable HTML/JSX/TSX files in the given repo path.
 
     Returns a tuple of (files, skipped) where files is a list of Path objects
     sorted by priority (src/app/pages/components first), capped at MAX_FILES,
     and skipped is a list of dicts with path and reason for each skipped file.
+
+    When respect_ignore_files is True, .gitignore and .hermesignore files
+    inside the repo are honored: ignored directories are never entered and
+    ignored files are silently left out (like EXCLUDED_DIRS).
+    """
+    priority_files = []
+    other_files = []
+    skipped = []
+
+    for item in iter_source_files(repo_path, respect_ignore_files):
+        if item.skip_reason is not None:
+            skipped.append(item.skipped_entry())
+        elif item.priority:
+            priority_files.append(item.path)
+        else:
+            other_files.append(item.path)
+
+    return _prioritize(priority_files, other_files, skipped)
+
+
+def iter_source_files(repo_path: str, respect_ignore_files: bool = True) -> Iterator[Discovered]:
+    """Walk the repo and yield each candidate or skipped file as it is found.
+
+    Unordered and uncapped: callers that need the final file list should use
+    find_source_files(). This is the streaming form used by scan.pipeline so
+    checks can start while the walk is still running.
+
+    Raises ValueError immediately (not on first next()) for invalid paths.
     """
     root = Path(repo_path).resolve()
 
     if not root.exists() or not root.is_dir():
         raise ValueError(f"Invalid repository path: {repo_path}")
 
+    return _walk(root, respect_ignore_files)
+
+
+def _walk(root: Path, respect_ignore_files: bool) -> Iterator[Discovered]:
+    """Generator behind iter_source_files()."""
+    # Walk with os.scandir so excluded directories are pruned before we enter
+    # them, and DirEntry's cached type info replaces per-path stat calls.
+    # Each stack entry: (directory path, root-relative posix path,
+    # is inside a PRIORITY_DIRS folder, active ignore matchers).
+    stack = [(str(root), "", False, ())]
+    while stack:
+        dir_path, rel_dir, in_priority, matchers = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            # Unreadable directory: nothing we can scan inside it.
+            continue
+
+        if respect_ignore_files:
+            ignore_paths = [
+                os.path.join(dir_path, name)
+                for name in IGNORE_FILE_NAMES
+                if any(e.name == name for e in entries)
+            ]
+            if ignore_paths:
+                matcher = load_matcher(ignore_paths)
+                if matcher is not None:
+                    matchers = matchers + ((rel_dir, matcher),)
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+            # Security: reject symlinks (never followed, never descended into)
+            if entry.is_symlink():
+                if entry.is_file():
+                    yield Discovered(Path(entry.path), in_priority, "symlink")
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                # Prune: never descend into excluded directories
+                if entry.name in EXCLUDED_DIRS:
+                    continue
+                if matchers and is_ignored(matchers, rel_path, is_dir=True):
+                    continue
+                stack.append((
+                    entry.path,
+                    rel_path,
+                    in_priority or entry.name in PRIORITY_DIRS,
+                    matchers,
+                ))
+                continue
+
+            # Security: skip non-files (sockets, fifos, devices)
+            if not entry.is_file(follow_symlinks=False):
+                continue
+
+            # Filter: only allowed extensions
+            if os.path.splitext(entry.name)[1].lower() not in ALLOWED_EXTENSIONS:
+                continue
+
+            # Filter: .gitignore / .hermesignore
+            if matchers and is_ignored(matchers, rel_path, is_dir=False):
+                continue
+
+            path = Path(entry.path)
+
+            # Security: reject path traversal
+            if ".." in path.parts:
+                yield Discovered(path, in_priority, "path_traversal")
+                continue
+
+            # Security: reject files outside project root
+            try:
+                path.resolve().relative_to(root)
+            except ValueError:
+                yield Discovered(path, in_priority, "outside_project_root")
+                continue
+
+            # v1.3: skip oversized files
+            try:
+                if entry.stat(follow_symlinks=False).st_size > MAX_FILE_SIZE_BYTES:
+                    yield Discovered(path, in_priority, "exceeds_50kb")
+                    continue
+            except OSError:
+                yield Discovered(path, in_priority, "stat_error")
+                continue
+
+            yield Discovered(path, in_priority)
+
+
+def file_limit_entry(found: int, max_files: int = MAX_FILES) -> Dict:
+    """Skip record added when more than max_files candidates were found."""
+    return {
+        "path": "multiple",
+        "reason": f"file_limit_exceeded: {found} found, capped at {max_files}",
+    }
+
+
+def _prioritize(
+    priority_files: List[Path],
+    other_files: List[Path],
+    skipped: List[Dict],
+) -> Tuple[List[Path], List[Dict]]:
+    """Order files (priority dirs first, then sorted paths) and apply MAX_FILES."""
+    # Sort within groups for deterministic ordering across platforms.
+    priority_files.sort(key=lambda p: str(p))
+    other_files.sort(key=lambda p: str(p))
+
+    # Priority dirs first, then others. Cap at MAX_FILES.
+    all_files = priority_files + other_files
+
+    if len(all_files) > MAX_FILES:
+        skipped.append(file_limit_entry(len(all_files)))
+
+    return all_files[:MAX_FILES], skipped
+
+
+def is_priority_path(rel_path: str) -> bool:
+    """Whether a root-relative file path is inside a PRIORITY_DIRS folder."""
+    return any(part in PRIORITY_DIRS for part in rel_path.split("/")[:-1])
+
+
+class _DirectoryRules:
+    """(excluded, active ignore matchers) per root-relative directory, cached.
+
+    Mirrors the walker for discovery modes that look at known paths instead
+    of walking: a directory is excluded if any ancestor is, and each
+    directory's ignore files apply below it. ignore_files_for(rel_dir) names
+    the ignore files present in that directory.
+    """
+
+    def __init__(self, root: Path, ignore_files_for):
+        self._root = root
+        self._ignore_files_for = ignore_files_for
+        self._cache: Dict[str, Tuple[bool, tuple]] = {}
+
+    def state(self, rel_dir: str) -> Tuple[bool, tuple]:
+        if rel_dir in self._cache:
+            return self._cache[rel_dir]
+        excluded, matchers = False, ()
+        if rel_dir:
+            parent, _, name = rel_dir.rpartition("/")
+            excluded, matchers = self.state(parent)
+            if not excluded:
+                excluded = name in EXCLUDED_DIRS or (
+                    bool(matchers) and is_ignored(matchers, rel_dir, is_dir=True)
+                )
+        if not excluded:
+            names = sorted(self._ignore_files_for(rel_dir), key=IGNORE_FILE_NAMES.index)
+            if names:
+                matcher = load_matcher([os.path.join(self._root, rel_dir, n) for n in names])
+                if matcher is not None:
+                    matchers = matchers + ((rel_dir, matcher),)
+        self._cache[rel_dir] = (excluded, matchers)
+        return self._cache[rel_dir]
+
+
+def discover_paths(
+    repo_path: str,
+    rel_paths: Iterable[str],
+    respect_ignore_files: bool = True,
+) -> Iterator[Discovered]:
+    """Apply the walker's rules to specific root-relative paths (no walk).
+
+    Used by incremental scans to classify just the changed files. Paths
+    that would not be discovered (wrong extension, excluded or ignored,
+    missing on disk) yield nothing; rejected files yield a skip record.
+    """
+    root = Path(repo_path).resolve()
+
+    def _ignore_files_on_disk(rel_dir: str) -> List[str]:
+        if not respect_ignore_files:
+            return []
+        return [n for n in IGNORE_FILE_NAMES if os.path.isfile(os.path.join(root, rel_dir, n))]
+
+    rules = _DirectoryRules(root, _ignore_files_on_disk)
+
+    for rel_path in rel_paths:
+        rel_dir, _, name = rel_path.rpartition("/")
+        priority = is_priority_path(rel_path)
+        path = root / rel_path
+
+        # Security: reject path traversal
+        if ".." in rel_path.split("/"):
+            yield Discovered(path, priority, "path_traversal")
+            continue
+
+        excluded, matchers = rules.state(rel_dir)
+        if excluded:
+            continue
+
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue  # deleted
+
+        # Security: reject symlinks (never followed)
+        if stat.S_ISLNK(st.st_mode):
+            if path.is_file():
+                yield Discovered(path, priority, "symlink")
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+
+        # Filter: only allowed extensions
+        if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+            continue
+
+        # Filter: .gitignore / .hermesignore
+        if matchers and is_ignored(matchers, rel_path, is_dir=False):
+            continue
+
+        # Security: reject files outside project root
+        try:
+            path.resolve().relative_to(root)
+        except ValueError:
+            yield Discovered(path, priority, "outside_project_root")
+            continue
+
+        # v1.3: skip oversized files
+        if st.st_size > MAX_FILE_SIZE_BYTES:
+            yield Discovered(path, priority, "exceeds_50kb")
+            continue
+
+        yield Discovered(path, priority)
+
+
+def find_tracked_source_files(
+    repo_path: str,
+    respect_ignore_files: bool = True,
+) -> Optional[Tuple[List[Path], List[Dict], Dict[str, str]]]:
+    """Find scannable files from the git index instead of walking the tree.
+
+    Parses .git/index directly (see git_index.py), so discovery costs
+    O(tracked files) and untracked files are never considered. Applies the
+    same filters and skip reasons as find_source_files().
+
+    Returns (files, skipped, blob_shas), where blob_shas maps str(path) to
+    the staged blob SHA for files unmodified since they were staged.
+    Returns None when repo_path is not inside a readable git checkout,
+    so callers can fall back to find_source_files().
+    """
+    root = Path(repo_path).resolve()
+
+    if not root.exists() or not root.is_dir():
+        raise ValueError(f"Invalid repository path: {repo_path}")
+
+    git_dir = find_git_dir(root)
+    if git_dir is None:
+        return None
+    try:
+        entries = read_index(git_dir)
+        top = worktree_root(git_dir).resolve()
+        prefix = root.relative_to(top).as_posix()
+    except (GitIndexError, ValueError):
+        return None
+    prefix = "" if prefix == "." else prefix + "/"
+
+    # Keep only entries under the scanned root, as root-relative paths.
+    tracked = [
+        (entry.path[len(prefix):], entry)
+        for entry in entries
+        if entry.path.startswith(prefix)
+    ]
+
+    # Tracked ignore files, loaded lazily per directory.
+    ignore_files: Dict[str, List[str]] = {}
+    if respect_ignore_files:
+        for rel_path, _entry in tracked:
+            rel_dir, _, name = rel_path.rpartition("/")
+            if name in IGNORE_FILE_NAMES:
+                ignore_files.setdefault(rel_dir, []).append(name)
+    rules = _DirectoryRules(root, lambda rel_dir: ignore_files.get(rel_dir, ()))
+
     priority_files = []
     other_files = []
     skipped = []
+    blob_shas = {}
+
+    for rel_path, entry in tracked:
+        mode_type = entry.mode & MODE_TYPE_MASK
+        if mode_type not in (MODE_REGULAR, MODE_SYMLINK):
+            continue  # submodules, sparse-index directories
+
+        rel_dir, _, name = rel_path.rpartition("/")
+        excluded, matchers = rules.state(rel_dir)
+        if excluded:
+            continue
+
+        path = root / rel_path
+
+        # Security: reject symlinks (as staged)
+        if mode_type == MODE_SYMLINK:
+            skipped.append({"path": str(path), "reason": "symlink"})
+            continue
 
-    for path in root.rglob("*"):
-        # Security: skip non-files
-        if not path.is_file():
+        # Filter: only allowed extensions
+        if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
             continue
 
-        # Security: reject symlinks
-        if path.is_symlink():
+        # Filter: .gitignore / .hermesignore
+        if matchers and is_ignored(matchers, rel_path, is_dir=False):
+            continue
+
+        # Security: reject symlinks (as found on disk)
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue  # tracked but deleted / not checked out
+        if stat.S_ISLNK(st.st_mode):
             skipped.append({"path": str(path), "reason": "symlink"})
             continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
 
         # Security: reject path traversal
         if ".." in path.parts:
@@ -67,42 +425,22 @@ def find_source_files(repo_path: str) -> Tuple[List[Path], List[Dict]]:
             skipped.append({"path": str(path), "reason": "outside_project_root"})
             continue
 
-        # Filter: only allowed extensions
-        if path.suffix.lower() not in ALLOWED_EXTENSIONS:
-            continue
-
-        # Filter: skip excluded directories
-        if any(part in EXCLUDED_DIRS for part in path.parts):
-            continue
-
         # v1.3: skip oversized files
-        try:
-            if path.stat().st_size > MAX_FILE_SIZE_BYTES:
-                skipped.append({"path": str(path), "reason": "exceeds_50kb"})
-                continue
-        except OSError:
-            skipped.append({"path": str(path), "reason": "stat_error"})
+        if st.st_size > MAX_FILE_SIZE_BYTES:
+            skipped.append({"path": str(path), "reason": "exceeds_50kb"})
             continue
 
+        # The staged blob SHA is only valid if the file is unchanged since.
+        if (st.st_size == entry.size
+                and int(st.st_mtime) == entry.mtime_s
+                and st.st_mtime_ns % 1_000_000_000 == entry.mtime_ns):
+            blob_shas[str(path)] = entry.sha
+
         # Sort into priority vs other
-        relative_parts = path.relative_to(root).parts
-        if any(part in PRIORITY_DIRS for part in relative_parts):
+        if is_priority_path(rel_path):
             priority_files.append(path)
         else:
             other_files.append(path)
 
-    # Sort within groups for deterministic ordering across platforms.
-    priority_files.sort(key=lambda p: str(p))
-    other_files.sort(key=lambda p: str(p))
-
-    # Priority dirs first, then others. Cap at MAX_FILES.
-    all_files = priority_files + other_files
-
-    if len(all_files) > MAX_FILES:
-        skipped.append({
-            "path": "multiple",
-            "reason": f"file_limit_exceeded: {len(all_files)} found, capped at {MAX_FILES}",
-        })
-
-    files_capped = len(all_files) > MAX_FILES
-    return all_files[:MAX_FILES], skipped
+    files, skipped = _prioritize(priority_files, other_files, skipped)
+    return files, skipped, blob_shas
@@ -0,0 +1,99 @@
+"""
+findings.py — Compact per-file finding records.
+
+Per-file findings (one per <img> without alt, per generic link, ...) are the
+bulk of a scan's allocations on large pages. A Finding keeps them small:
+- the check id and the file name are interned
+- the detail is a template plus its arguments, formatted only when read
+
+A Finding is a read-only Mapping with the same keys, in the same order, as
+the dict it replaces ({"check", "passed", "detail", "file"}), so code that
+reads findings, and compares them with dicts, is unchanged.
+
+Findings only live in per-file partials: each category's merge_results()
+turns them into plain dicts (as_dict), so scan results are plain JSON.
+Partials are serialized (cache, baseline) with the to_json default hook
+(json.dumps(obj, default=to_json)). The --max-memory spill
+round-trips findings through JSON with to_record / from_record, which keep
+the template and arguments, so reloaded findings stay compact.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List
+
+_KEYS = ("check", "passed", "detail", "file")
+
+
+class Finding(Mapping):
+    """One file-level finding; detail is template.format(*args, file=file) on demand."""
+
+    __slots__ = ("check", "passed", "file", "_template", "_args")
+
+    def __init__(self, check: str, passed: bool, file: str, template: str, *args: Any):
+        self.check = sys.intern(check)
+        self.passed = passed
+        # Shared by every finding of the file, and by findings rebuilt from
+        # pickles or the spill; freed with the last of them.
+        self.file = sys.intern(file)
+        self._template = template
+        self._args = args
+
+    @property
+    def detail(self) -> str:
+        return self._template.format(*self._args, file=self.file)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __repr__(self) -> str:
+        return f"Finding({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (Finding, (self.check, self.passed, self.file, self._template, *self._args))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"check": self.check, "passed": self.passed, "detail": self.detail, "file": self.file}
+
+
+def as_dict(finding: Mapping) -> Dict[str, Any]:
+    """A finding as a plain dict (merge_results output is plain JSON)."""
+    return finding.to_dict() if isinstance(finding, Finding) else finding
+
+
+def to_json(obj: Any) -> Dict[str, Any]:
+    """json.dumps default hook: serialize Finding as its dict."""
+    if isinstance(obj, Finding):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Key of the to_record() form of a Finding
+RECORD_KEY = "__finding__"
+
+
+def to_record(obj: Any) -> Dict[str, List[Any]]:
+    """json.dumps default hook: serialize Finding losslessly (template and args)."""
+    if isinstance(obj, Finding):
+        return {RECORD_KEY: [obj.check, obj.passed, obj.file, obj._template, *obj._args]}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def from_record(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook: rebuild the Findings written with to_record."""
+    record = obj.get(RECORD_KEY)
+    if record is None or len(obj) != 1:
+        return obj
+    check, passed, file, template, *args = record
+    # Interned like the tag names they mostly are, which findings share
+    # before a round trip.
+    args = [sys.intern(arg) if isinstance(arg, str) else arg for arg in args]
+    return Finding(check, passed, file, sys.intern(template), *args)
@@ -0,0 +1,187 @@
+"""
+git_index.py — Reads tracked file entries straight from .git/index.
+
+Stdlib only: no git binary required. Supports index versions 2, 3 and 4
+(v4 path prefix compression) and SHA-1 or SHA-256 object formats.
+
+Used by file_finder.find_tracked_source_files() so CI discovery is
+O(tracked files) instead of a full working-tree walk, and so every
+unmodified file comes with its blob SHA for free.
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+# File modes stored in the index (upper bits of the 32-bit mode field)
+MODE_TYPE_MASK = 0o170000
+MODE_REGULAR = 0o100000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000
+
+_ENTRY_HEADER = struct.Struct(">10I")  # ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_NAME_MASK = 0x0FFF
+
+
+class GitIndexError(Exception):
+    """The index file is missing, unsupported, or corrupt."""
+
+
+class IndexEntry(NamedTuple):
+    path: str       # posix path relative to the worktree root
+    mode: int
+    size: int       # size recorded when the file was last staged
+    sha: str        # hex object id of the staged blob
+    mtime_s: int
+    mtime_ns: int
+
+
+def find_git_dir(start: Path) -> Optional[Path]:
+    """Find the .git directory for the checkout containing start.
+
+    Walks up from start. Handles worktrees/submodules where .git is a
+    "gitdir: <path>" file. Returns None when start is not in a checkout.
+    """
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = directory / git_dir
+                return git_dir
+            return None
+    return None
+
+
+def worktree_root(git_dir: Path) -> Path:
+    """Return the working-tree root a .git directory belongs to."""
+    if git_dir.name == ".git":
+        return git_dir.parent
+    # Linked worktree / submodule: <gitdir>/gitdir points back at <root>/.git
+    back_link = git_dir / "gitdir"
+    try:
+        return Path(back_link.read_text(encoding="utf-8").strip()).parent
+    except OSError:
+        raise GitIndexError(f"Cannot locate worktree for {git_dir}")
+
+
+def _hash_length(git_dir: Path) -> int:
+    """20 bytes for SHA-1 repositories, 32 for extensions.objectformat=sha256."""
+    config_dirs = [git_dir]
+    try:
+        # Linked worktrees keep their config in the common git dir.
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        config_dirs.append(git_dir / common)
+    except OSError:
+        pass
+
+    for config_dir in config_dirs:
+        try:
+            text = (config_dir / "config").read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        for line in text.splitlines():
+            key, _, value = line.partition("=")
+            if key.strip().lower() == "objectformat" and value.strip().lower() == "sha256":
+                return 32
+    return 20
+
+
+def _read_varint(data: bytes, pos: int):
+    """Decode git's offset varint (used by index v4 path compression)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def read_index(git_dir: Path) -> List[IndexEntry]:
+    """Parse <git_dir>/index and return one entry per tracked path.
+
+    Conflicted paths (stages 1-3) are reported once. Raises GitIndexError
+    when the index is missing, truncated, or fails its checksum.
+    """
+    try:
+        data = (git_dir / "index").read_bytes()
+    except OSError as e:
+        raise GitIndexError(f"Cannot read git index: {e}")
+
+    hash_len = _hash_length(git_dir)
+    if len(data) < 12 + hash_len or data[:4] != b"DIRC":
+        raise GitIndexError("Not a git index file")
+
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"Unsupported git index version {version}")
+
+    checksum = hashlib.sha256 if hash_len == 32 else hashlib.sha1
+    if checksum(data[:-hash_len]).digest() != data[-hash_len:]:
+        raise GitIndexError("Git index checksum mismatch")
+
+    entries = []
+    seen = set()
+    pos = 12
+    previous_path = b""
+    end_of_entries = len(data) - hash_len
+
+    try:
+        for _ in range(count):
+            entry_start = pos
+            (_cs, _cns, mtime_s, mtime_ns, _dev, _ino,
+             mode, _uid, _gid, size) = _ENTRY_HEADER.unpack_from(data, pos)
+            pos += _ENTRY_HEADER.size
+            sha = data[pos:pos + hash_len].hex()
+            pos += hash_len
+            (flags,) = struct.unpack_from(">H", data, pos)
+            pos += 2
+            if flags & _FLAG_EXTENDED:
+                pos += 2
+
+            if version == 4:
+                strip, pos = _read_varint(data, pos)
+                name_end = data.index(b"\x00", pos)
+                path = previous_path[:len(previous_path) - strip] + data[pos:name_end]
+                pos = name_end + 1
+            else:
+                name_len = flags & _NAME_MASK
+                if name_len == _NAME_MASK:
+                    name_end = data.index(b"\x00", pos)
+                else:
+                    name_end = pos + name_len
+                path = data[pos:name_end]
+                # Entries are NUL-padded to a multiple of 8 bytes.
+                pos = entry_start + ((name_end - entry_start + 8) & ~7)
+            previous_path = path
+
+            if pos > end_of_entries:
+                raise GitIndexError("Truncated git index")
+
+            if flags & _FLAG_STAGE_MASK and path in seen:
+                continue
+            seen.add(path)
+            entries.append(IndexEntry(
+                path=path.decode("utf-8", errors="surrogateescape"),
+                mode=mode,
+                size=size,
+                sha=sha,
+                mtime_s=mtime_s,
+                mtime_ns=mtime_ns,
+            ))
+    except (struct.error, ValueError, IndexError) as e:
+        raise GitIndexError(f"Corrupt git index: {e}")
+
+    return entries
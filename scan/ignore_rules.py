@@ -0,0 +1,178 @@
+"""
+ignore_rules.py — .gitignore / .hermesignore matching for file discovery.
+
+Each directory's ignore files are compiled into ONE IgnoreMatcher holding two
+regexes (one for files, one for directories). The walker in file_finder.py
+asks the matchers while it walks, so ignored directories are pruned instead
+of being filtered after the fact.
+
+Supported gitignore syntax: comments, blank lines, negation (!), directory-only
+rules (trailing /), anchored rules (leading or middle /), *, ?, [...] and **.
+Only ignore files inside the scanned root are read (not global git config).
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+IGNORE_FILE_NAMES = (".gitignore", ".hermesignore")
+
+# (regex source, negated, directory-only)
+Rule = Tuple[str, bool, bool]
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one path segment of a glob (no slashes) into regex source."""
+    out = []
+    i = 0
+    n = len(segment)
+    while i < n:
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(segment[i]))
+        elif c == "[":
+            end = segment.find("]", i + 2 if segment[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore pattern (already stripped of !, trailing /) to regex source."""
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    parts = pattern.split("/")
+    regex = []
+    for idx, part in enumerate(parts):
+        last = idx == len(parts) - 1
+        if part == "**":
+            regex.append(".*" if last else "(?:.*/)?")
+        else:
+            regex.append(_translate_segment(part))
+            if not last:
+                regex.append("/")
+
+    source = "".join(regex)
+    if not anchored:
+        # No slash: matches a name at any depth below the ignore file.
+        source = "(?:.*/)?" + source
+    return source
+
+
+def parse_rules(lines: Sequence[str]) -> List[Rule]:
+    """Parse ignore-file lines into (regex, negated, dir_only) rules."""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n")
+        # Trailing spaces are ignored unless escaped with a backslash.
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+
+        if not line or line.startswith("#"):
+            continue
+
+        negated = False
+        if line.startswith("!"):
+            negated = True
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        rules.append((_translate(line), negated, dir_only))
+    return rules
+
+
+def _compile(rules: Sequence[Tuple[int, Rule]]) -> Optional["re.Pattern"]:
+    """Compile rules into one alternation; the LAST rule listed wins.
+
+    Alternatives are emitted in reverse order, so fullmatch() stops at the
+    last matching rule and lastgroup identifies it.
+    """
+    if not rules:
+        return None
+    alternatives = [f"(?P<r{idx}>{source})" for idx, (source, _neg, _dir) in reversed(rules)]
+    return re.compile("|".join(alternatives), re.DOTALL)
+
+
+class IgnoreMatcher:
+    """All ignore rules declared in one directory, compiled once."""
+
+    __slots__ = ("_negated", "_file_regex", "_dir_regex")
+
+    def __init__(self, rules: Sequence[Rule]):
+        indexed = list(enumerate(rules))
+        self._negated = [negated for _source, negated, _dir in rules]
+        self._file_regex = _compile([(i, r) for i, r in indexed if not r[2]])
+        self._dir_regex = _compile(indexed)
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if ignored, False if re-included by !, None if no rule applies.
+
+        Args:
+            relative_path: Posix path relative to the directory of the ignore file.
+            is_dir: Whether the path is a directory (enables dir-only rules).
+        """
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is None:
+            return None
+        m = regex.fullmatch(relative_path)
+        if m is None:
+            return None
+        return not self._negated[int(m.lastgroup[1:])]
+
+
+def load_matcher(paths: Sequence[str]) -> Optional[IgnoreMatcher]:
+    """Build one matcher from the ignore files found in a directory.
+
+    Files are read in the given order, so later files (.hermesignore)
+    override earlier ones (.gitignore). Unreadable files are skipped.
+    """
+    rules: List[Rule] = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8", errors="ignore") as fh:
+                rules.extend(parse_rules(fh.readlines()))
+        except OSError:
+            continue
+    return IgnoreMatcher(rules) if rules else None
+
+
+def is_ignored(matchers: Sequence[Tuple[str, IgnoreMatcher]], relative_path: str, is_dir: bool) -> bool:
+    """Check a root-relative path against the active matchers.
+
+    Args:
+        matchers: (base, matcher) pairs from the root down to the current
+                  directory; base is the root-relative directory of the
+                  ignore file ("" for the root itself).
+        relative_path: Root-relative posix path of the entry.
+        is_dir: Whether the entry is a directory.
+
+    Deeper ignore files take precedence over shallower ones, as in git.
+    """
+    for base, matcher in reversed(matchers):
+        local = relative_path[len(base) + 1:] if base else relative_path
+        result = matcher.match(local, is_dir)
+        if result is not None:
+            return result
+    return False
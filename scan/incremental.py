@@ -0,0 +1,194 @@
+"""
+incremental.py — Merge-request scans that only re-check changed files.
+
+A baseline (written with --write-baseline on the target branch) records every
+scanned file's per-check partials. With --since <ref>, the scanner asks git
+which paths differ between <ref> and the working tree (plus untracked files),
+re-checks just those, and reuses the baseline partials for everything else.
+The merged result is the same as a full scan of the working tree.
+
+Falls back to a full scan (still reporting the score delta) when an exact
+merge is not possible: git unavailable or the ref unknown, a ref that is not
+the commit the baseline was written at, a changed .gitignore/.hermesignore
+(which can add or drop unchanged files), a baseline from different check
+code, or a baseline that hit the MAX_FILES cap.
+"""
+
+import json
+import subprocess
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from scan.cache import engine_fingerprint
+from scan.checks import FilePartials
+from scan.findings import to_json
+from scan.file_finder import Discovered, discover_paths, is_priority_path
+from scan.ignore_rules import IGNORE_FILE_NAMES
+from scan.watchdog import UNFINISHED_REASONS
+
+BASELINE_VERSION = 1
+
+
+class IncrementalPlan(NamedTuple):
+    """What an incremental scan reuses, what it re-checks, and why."""
+
+    reused: List[Tuple[Discovered, FilePartials]]
+    rescan: List[Discovered]
+    skipped: List[Dict]
+    changed: List[str]  # root-relative paths git reported as changed
+
+
+def _git(root: Path, *args: str) -> Optional[bytes]:
+    try:
+        return subprocess.run(
+            ["git", "-C", str(root), *args],
+            check=True,
+            capture_output=True,
+            timeout=60,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _split_z(output: bytes) -> List[str]:
+    return [p.decode("utf-8", errors="surrogateescape") for p in output.split(b"\0") if p]
+
+
+def changed_paths(root: Path, ref: str) -> Optional[List[str]]:
+    """Root-relative paths that differ between ref and the working tree.
+
+    Includes untracked (not ignored) files. Returns None when git is not
+    available, root is not in a checkout, or ref cannot be resolved.
+    """
+    diff = _git(root, "diff", "--name-only", "-z", "--no-renames", "--relative", ref, "--")
+    if diff is None:
+        return None
+    untracked = _git(root, "ls-files", "-z", "--others", "--exclude-standard")
+    if untracked is None:
+        return None
+    return sorted(set(_split_z(diff)) | set(_split_z(untracked)))
+
+
+def head_commit(root: Path) -> Optional[str]:
+    return resolve_commit(root, "HEAD")
+
+
+def resolve_commit(root: Path, ref: str) -> Optional[str]:
+    """Commit SHA that ref points to (tags peeled), or None if it does not resolve."""
+    output = _git(root, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    return output.decode().strip() if output else None
+
+
+# --- baseline file ---
+
+def build_baseline(
+    root: Path,
+    files: List[Path],
+    per_file: List[FilePartials],
+    skipped: List[Dict],
+    result: Dict,
+) -> Dict:
+    """Baseline document for a finished scan (paths stored root-relative)."""
+
+    def _relative(path: str) -> str:
+        try:
+            return Path(path).relative_to(root).as_posix()
+        except ValueError:
+            return path  # e.g. "multiple"
+
+    return {
+        "baseline_version": BASELINE_VERSION,
+        "engine": engine_fingerprint(),
+        "commit": head_commit(root),
+        "capped": any(entry["path"] == "multiple" for entry in skipped),
+        "total_score": result["total_score"],
+        "breakdown": result["breakdown"],
+        "files": [
+            {"path": path.relative_to(root).as_posix(), "partials": partials}
+            for path, partials in zip(files, per_file)
+        ],
+        "skipped": [
+            {"path": _relative(entry["path"]), "reason": entry["reason"]}
+            for entry in skipped
+        ],
+    }
+
+
+def write_baseline(path: str, baseline: Dict) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(baseline, fh, separators=(",", ":"), default=to_json)
+
+
+def load_baseline(path: str) -> Dict:
+    """Read a baseline file. Raises ValueError if it is missing or malformed."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read baseline {path}: {e}")
+    if not isinstance(baseline, dict) or baseline.get("baseline_version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline file: {path}")
+    return baseline
+
+
+# --- planning ---
+
+def plan(root: Path, ref: str, baseline: Dict) -> Tuple[Optional[IncrementalPlan], str]:
+    """Work out an incremental scan, or (None, reason) if a full scan is needed."""
+    if baseline["engine"] != engine_fingerprint():
+        return None, "baseline was produced by different check code"
+    if baseline["capped"]:
+        # Files beyond the cap were never checked, so removals can't be backfilled.
+        return None, "baseline hit the file cap"
+
+    commit = resolve_commit(root, ref)
+    if commit is None:
+        return None, f"git could not resolve {ref}"
+    if commit != baseline["commit"]:
+        # The diff would be against a tree the baseline partials do not describe.
+        return None, f"baseline was written at {baseline['commit'] or 'no commit'}, not at {ref} ({commit})"
+
+    changed = changed_paths(root, ref)
+    if changed is None:
+        return None, f"git could not diff against {ref}"
+    ignore_files = [path for path in changed if Path(path).name in IGNORE_FILE_NAMES]
+    if ignore_files:
+        # Unchanged files may now be ignored, or no longer ignored.
+        return None, f"ignore rules changed ({', '.join(ignore_files)})"
+
+    # Files the baseline could not finish (timed out, worker crashed) must be checked again.
+    stale = {entry["path"] for entry in baseline["skipped"] if entry["reason"] in UNFINISHED_REASONS}
+    rescan_paths = set(changed) | stale
+
+    reused = [
+        (Discovered(root / entry["path"], is_priority_path(entry["path"])), entry["partials"])
+        for entry in baseline["files"]
+        if entry["path"] not in rescan_paths
+    ]
+    skipped = [
+        {"path": str(root / entry["path"]), "reason": entry["reason"]}
+        for entry in baseline["skipped"]
+        if entry["path"] not in rescan_paths
+        and entry["reason"] not in UNFINISHED_REASONS
+    ]
+
+    rescan = []
+    for item in discover_paths(str(root), sorted(rescan_paths)):
+        if item.skip_reason is not None:
+            skipped.append(item.skipped_entry())
+        else:
+            rescan.append(item)
+
+    return IncrementalPlan(reused, rescan, skipped, changed), ""
+
+
+def score_delta(result: Dict, baseline: Dict) -> Dict:
+    """Total and per-category score change relative to the baseline."""
+    return {
+        "baseline_score": baseline["total_score"],
+        "score_delta": result["total_score"] - baseline["total_score"],
+        "category_deltas": {
+            name: info["earned"] - baseline["breakdown"].get(name, {}).get("earned", 0)
+            for name, info in result["breakdown"].items()
+        },
+    }
@@ -0,0 +1,215 @@
+"""
+jsx_lexer.py — One-pass JSX/TSX lexer that masks everything but JSX markup.
+
+The tag tokenizer is an HTML tokenizer: run over .jsx/.tsx source it also
+"sees" <a in a string or template literal, // <button> in a comment,
+generics like Array<div> or useState<Item>, and it ends a tag at the
+">" of an arrow function inside an attribute (onClick={() => go()}).
+
+mask_jsx() walks the source once, tracking whether it is in JavaScript,
+inside a JSX tag, or in a JSX element's children, and returns a copy of
+the same length (newlines kept) in which, in JavaScript:
+- comments and the contents of string and template literals are blanked
+- every "<" that does not start a JSX element and every ">" is blanked
+and, inside JSX tags, "<" and ">" within quoted attribute values are
+blanked. JSX tags, attribute text and children text are untouched, so
+offsets into the masked text are offsets into the source and the
+tokenizer only finds JSX elements.
+
+A "<" starts a JSX element only where an expression can start (after
+"(", "=", ",", "return", "=>", ...) and when it is not a TSX generic
+(<T,> or <T extends U>). Heuristics, like the rest of the scanner: NO AST
+parsing. Regex literals are not recognized.
+"""
+
+import re
+from typing import List, Tuple
+
+JSX_EXTENSIONS = (".jsx", ".tsx")
+
+# JavaScript: line comment | block comment | string literal | "{" "}" "<" ">".
+# Unterminated strings end at the line end, template literals and block
+# comments at end of file.
+JS_TOKEN_PATTERN = re.compile(
+    r"""(//[^\n]*)|(/\*[\s\S]*?(?:\*/|\Z))"""
+    r"""|("(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?|`(?:[^`\\]|\\.)*`?)"""
+    r"""|([{}<>])"""
+)
+
+
+def _possessive(body: str, name: str) -> str:
+    """body* matched without backtracking, as (?=(?P<name>(?:body)*))(?P=name).
+
+    Same as the possessive (?:body)*+, which needs Python 3.11.
+    """
+    return rf"(?=(?P<{name}>(?:{body})*))(?P={name})"
+
+
+# {expressions} with nothing to mask in them ({handleSubmit}, {true}, ...)
+_PLAIN_EXPRESSION = r"""\{[^{}"'`<>/]*\}"""
+# Attribute text that needs no masking: names, plain {expressions}, quoted
+# values without "<" / ">" (no backtracking).
+_ATTRIBUTE_BODY = r"""[^"'{}<>/]+|"[^"<>]*"|'[^'<>]*'|""" + _PLAIN_EXPRESSION + r"""|/(?!>)"""
+# Rest of a tag: its plain attribute run, then ">" / "/>" if the tag ends
+# there (else it continues at a {expression} or special quoted value).
+TAG_REST_PATTERN = re.compile(_possessive(_ATTRIBUTE_BODY, "attrs") + r"(?P<end>/?>)?")
+# Inside a tag: a plain attribute run, then "/>", "{", "}", "<", ">" or a
+# quoted value with "<" / ">" in it.
+TAG_TOKEN_PATTERN = re.compile(
+    _possessive(_ATTRIBUTE_BODY, "attrs")
+    + r"""(?:(?P<token>/>|[{}<>])|(?P<quoted>"[^"]*"?|'[^']*'?))"""
+)
+# Children: text and plain {expressions}, then a {expression} | a tag
+# (simple ones consumed whole) | a stray "<"
+CHILDREN_STEP_PATTERN = re.compile(
+    _possessive(r"[^<{]+|" + _PLAIN_EXPRESSION, "text")
+    + r"(?:(?P<expression>\{)|<\s*(?P<closing>/?)\s*(?:[A-Za-z][\w.:-]*|(?=>))"
+    + _possessive(_ATTRIBUTE_BODY, "attrs")
+    + r"(?P<end>/?>)?|(?P<stray><))"
+)
+
+# "<" + optional "/" + tag name (empty for fragments <> and </>)
+TAG_START_PATTERN = re.compile(r"<\s*(/?)\s*([A-Za-z][\w.:-]*)?")
+# <T,> and <T extends U> in TSX are type parameters, not elements
+GENERIC_PARAMS_PATTERN = re.compile(r"\s*(?:,|extends\b)")
+
+# Characters and keywords after which a "<" is in expression position
+EXPRESSION_START_CHARS = set("([{,;:=?&|!~+-*%^>}")
+EXPRESSION_START_WORDS = {"return", "yield", "default", "case", "else", "do", "await", "in", "of"}
+
+BLANK_PATTERN = re.compile(r"[^\n]")
+ANGLE_PATTERN = re.compile(r"[<>]")
+
+# Lexer modes (stack frames)
+_JS, _TAG, _CLOSING_TAG, _CHILDREN = range(4)
+
+
+def is_jsx_path(suffix: str) -> bool:
+    return suffix.lower() in JSX_EXTENSIONS
+
+
+def _starts_element(text: str, pos: int) -> bool:
+    """Whether the "<" at pos opens a JSX element (vs. comparison or generic)."""
+    m = TAG_START_PATTERN.match(text, pos)
+    if m.group(1):
+        return False  # "</" in JavaScript is never an element start
+    if m.group(2) is None:
+        if not text.startswith(">", m.end()):
+            return False
+    elif GENERIC_PARAMS_PATTERN.match(text, m.end()):
+        return False
+    j = pos - 1
+    while j >= 0 and text[j].isspace():
+        j -= 1
+    if j < 0:
+        return True
+    prev = text[j]
+    if prev in EXPRESSION_START_CHARS:
+        return True
+    if prev.isalnum() or prev in "_$":
+        start = j
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] in "_$"):
+            start -= 1
+        return text[start:j + 1] in EXPRESSION_START_WORDS
+    return False
+
+
+def mask_jsx(text: str) -> str:
+    """text with comments, strings and non-JSX "<"/">" blanked; same length and lines."""
+    blanks: List[Tuple[int, int, re.Pattern]] = []  # (start, end, chars to blank)
+    stack = [_JS]
+    braces = [0]  # open "{" count per JS frame
+    pos, end = 0, len(text)
+
+    # Locals: this loop runs once per tag, string and comment.
+    push, pop = stack.append, stack.pop
+    blank = blanks.append
+    children_step = CHILDREN_STEP_PATTERN.match
+    tag_token = TAG_TOKEN_PATTERN.match
+    js_token = JS_TOKEN_PATTERN.search
+
+    while pos < end:
+        mode = stack[-1]
+        if mode == _CHILDREN:
+            m = children_step(text, pos)
+            if m is None:
+                break
+            pos = m.end()
+            expression, closing, tag_end, stray = m.group("expression", "closing", "end", "stray")
+            if expression:
+                push(_JS)
+                braces.append(0)
+            elif stray:
+                blank((pos - 1, pos, BLANK_PATTERN))
+            elif tag_end is None:  # tag continues at a {expression} or special value
+                push(_CLOSING_TAG if closing else _TAG)
+            elif tag_end == ">":
+                if closing:
+                    pop()  # the closing tag ends its element
+                else:
+                    push(_CHILDREN)
+
+        elif mode == _JS:
+            m = js_token(text, pos)
+            if m is None:
+                break
+            at, pos = m.span()
+            kind = m.lastindex
+            if kind < 3:  # comment
+                blank((at, pos, BLANK_PATTERN))
+            elif kind == 3:  # string literal: blank its contents
+                blank((at + 1, max(at + 1, pos - 1), BLANK_PATTERN))
+            else:
+                token = m.group(4)
+                if token == "{":
+                    braces[-1] += 1
+                elif token == "}":
+                    if braces[-1]:
+                        braces[-1] -= 1
+                    elif len(stack) > 1:  # closes an attribute or child {expression}
+                        pop()
+                        braces.pop()
+                elif token == "<" and _starts_element(text, at):
+                    rest = TAG_REST_PATTERN.match(text, TAG_START_PATTERN.match(text, at).end())
+                    pos = rest.end()
+                    tag_end = rest.group("end")
+                    if tag_end is None:
+                        push(_TAG)
+                    elif tag_end == ">":
+                        push(_CHILDREN)
+                else:
+                    blank((at, pos, BLANK_PATTERN))
+
+        else:  # _TAG or _CLOSING_TAG
+            m = tag_token(text, pos)
+            if m is None:
+                break
+            pos = m.end()
+            token = m.group("token")
+            if token is None:  # quoted value containing "<" or ">"
+                blank((m.start("quoted"), pos, ANGLE_PATTERN))
+            elif token == "{":
+                push(_JS)
+                braces.append(0)
+            elif token == "/>":
+                pop()
+            elif token == ">":
+                pop()
+                if mode == _TAG:
+                    push(_CHILDREN)
+                elif stack[-1] == _CHILDREN:
+                    pop()  # the closing tag ends its element
+            else:
+                # Stray "}" or "<" inside a tag: blank it, stay in the tag.
+                blank((pos - 1, pos, BLANK_PATTERN))
+
+    if not blanks:
+        return text
+    pieces = []
+    last = 0
+    for start, stop, pattern in blanks:
+        pieces.append(text[last:start])
+        pieces.append(pattern.sub(" ", text[start:stop]))
+        last = stop
+    pieces.append(text[last:])
+    return "".join(pieces)
@@ -0,0 +1,167 @@
+"""
+memory.py — Memory-bounded scans (--max-memory).
+
+Two pieces:
+- MemoryBudget traces the scan's Python allocations with tracemalloc and
+  raises MemoryBudgetExceeded (with the top allocation sites from a
+  snapshot) as soon as current usage passes the budget.
+- PartialsSpill moves each file's partials to a temporary JSON-lines file
+  as soon as the file is finished, so only small offsets stay in memory
+  until the merge reads them back one file at a time, in file order.
+  Each category's partial is its own line: merging a category reads only
+  that category's partials, and findings come back as Finding records
+  (findings.from_record), as compact as before they were spilled.
+
+File contents are already dropped after each file's map step; what
+grows with repo size is the per-file partials (every img, a, label ...
+finding), which is what the spill takes off the heap.
+
+Only the scanning process is traced: worker processes (--jobs, time
+budgets) have their own memory and are not counted.
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Union
+
+from scan.checks import FilePartials
+from scan.findings import from_record, to_record
+
+_MB = 1024 * 1024
+_TOP_SITES = 5
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Traced memory went over the --max-memory budget."""
+
+
+class MemoryBudget:
+    """tracemalloc-backed budget for the scan's own allocations."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+    def used(self) -> int:
+        return tracemalloc.get_traced_memory()[0] - self._baseline
+
+    def peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] - self._baseline
+
+    def check(self) -> None:
+        """Raise MemoryBudgetExceeded if current usage is over budget."""
+        used = self.used()
+        if used <= self.max_bytes:
+            return
+        top = tracemalloc.take_snapshot().statistics("lineno")[:_TOP_SITES]
+        sites = "; ".join(f"{stat.traceback[0]}: {stat.size / _MB:.2f} MB" for stat in top)
+        raise MemoryBudgetExceeded(
+            f"Memory budget exceeded: {used / _MB:.2f} MB used, {self.max_bytes / _MB:.2f} MB allowed"
+            f" (top allocations: {sites})"
+        )
+
+    def report(self, spilled_files: int) -> Dict:
+        return {
+            "budget_mb": round(self.max_bytes / _MB, 2),
+            "peak_mb": round(self.peak() / _MB, 2),
+            "spilled_files": spilled_files,
+        }
+
+    def close(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+
+
+class SpillRef:
+    """Where one file's partials live in a PartialsSpill: name -> line offset."""
+
+    __slots__ = ("offsets",)
+
+    def __init__(self, offsets: Dict[str, int]):
+        self.offsets = offsets
+
+
+class PartialsSpill:
+    """Temporary JSON-lines file of per-file partials, read back by offset."""
+
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="hermes-partials-", suffix=".jsonl", dir=directory)
+        self._file = os.fdopen(fd, "w+b")
+        self.count = 0
+
+    def store(self, partials: FilePartials) -> SpillRef:
+        offset = self._file.seek(0, os.SEEK_END)
+        offsets = {}
+        for name, partial in partials.items():
+            line = json.dumps(partial, separators=(",", ":"), default=to_record).encode("utf-8") + b"\n"
+            self._file.write(line)
+            offsets[name] = offset
+            offset += len(line)
+        self.count += 1
+        return SpillRef(offsets)
+
+    def load_partial(self, ref: SpillRef, name: str) -> Optional[Dict]:
+        """One category's (or analysis') partial of a spilled file."""
+        self._file.seek(ref.offsets[name])
+        return json.loads(self._file.readline(), object_hook=from_record)
+
+    def load(self, ref: SpillRef) -> FilePartials:
+        return {name: self.load_partial(ref, name) for name in ref.offsets}
+
+    def sequence(self, items: List[Union[FilePartials, SpillRef]]) -> "SpilledPartials":
+        """Re-iterable view of items with every SpillRef loaded on the fly."""
+        return SpilledPartials(self, items)
+
+    def close(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class _LazyPartials(Mapping):
+    """A spilled file's partials, each read from the spill when looked up."""
+
+    __slots__ = ("_spill", "_ref")
+
+    def __init__(self, spill: PartialsSpill, ref: SpillRef):
+        self._spill = spill
+        self._ref = ref
+
+    def __getitem__(self, name: str) -> Optional[Dict]:
+        if name not in self._ref.offsets:
+            raise KeyError(name)
+        return self._spill.load_partial(self._ref, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ref.offsets)
+
+    def __len__(self) -> int:
+        return len(self._ref.offsets)
+
+
+class SpilledPartials:
+    """Per-file partials in file order, loaded from the spill one at a time.
+
+    Spilled files are yielded as lazy mappings, so merge_partials() (one
+    pass per category) reads each file's partial for that category only.
+    """
+
+    def __init__(self, spill: PartialsSpill, items: List[Union[FilePartials, SpillRef]]):
+        self._spill = spill
+        self._items = items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[FilePartials]:
+        for item in self._items:
+            yield _LazyPartials(self._spill, item) if isinstance(item, SpillRef) else item
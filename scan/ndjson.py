@@ -0,0 +1,67 @@
+"""
+ndjson.py — Streaming NDJSON output (--format ndjson).
+
+One JSON object per line:
+- {"type": "finding", "category", "check", "file", "passed", "detail"} for
+  each file-level finding, written as soon as that file's results are final
+- the same for each category-level finding (file is null) once all files
+  are merged
+- a last {"type": "summary", ...} record with total_score, rating,
+  breakdown and the rest of the scan result except the categories
+
+Every category's merge_results() lists the file-level findings first, in
+file order, followed by its aggregate findings, so the records add up to
+exactly the findings of the regular JSON output.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, IO, List, Optional
+
+from scan.checks import CHECKS, FilePartials
+
+
+def finding_record(category: str, finding: Dict) -> Dict:
+    return {
+        "type": "finding",
+        "category": category,
+        "check": finding["check"],
+        "file": finding.get("file"),
+        "passed": finding["passed"],
+        "detail": finding["detail"],
+    }
+
+
+class NdjsonWriter:
+    """Writes finding records per file as they finish, then aggregates and a summary."""
+
+    def __init__(self, stream: IO[str]):
+        self._stream = stream
+        self._emitted = {name: 0 for name in CHECKS}
+
+    def _write(self, records: List[Dict]) -> None:
+        for record in records:
+            self._stream.write(json.dumps(record) + "\n")
+        self._stream.flush()
+
+    def file_done(self, path: Path, partials: FilePartials) -> None:
+        """run_scan on_file hook: stream this file's findings."""
+        records = []
+        for name in CHECKS:
+            partial: Optional[Dict] = partials.get(name)
+            if not partial:
+                continue
+            findings = partial["findings"]
+            records.extend(finding_record(name, finding) for finding in findings)
+            self._emitted[name] += len(findings)
+        self._write(records)
+
+    def finish(self, result: Dict) -> None:
+        """Category-level findings not streamed yet, then the summary record."""
+        records = []
+        for name, category in result["categories"].items():
+            aggregates = category["findings"][self._emitted.get(name, 0):]
+            records.extend(finding_record(name, finding) for finding in aggregates)
+        summary = {key: value for key, value in result.items() if key != "categories"}
+        records.append({"type": "summary", **summary})
+        self._write(records)
@@ -0,0 +1,140 @@
+"""
+pipeline.py — Streaming discovery: process files while the walk is still running.
+
+Discovery runs in a background thread and feeds a bounded queue. The calling
+thread processes each file as it arrives, so walk latency overlaps with file
+reads and check work instead of waiting for the full list.
+
+Output stays deterministic: results are returned in the same order
+find_source_files() produces (priority dirs first, then sorted paths), and
+MAX_FILES is applied with a bounded selection, so files that can no longer
+make the cut are never processed.
+"""
+
+import heapq
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
+
+from scan.file_finder import MAX_FILES, Discovered, file_limit_entry
+
+T = TypeVar("T")
+
+DEFAULT_QUEUE_SIZE = 256
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception raised by the discovery thread to the consumer."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Worst:
+    """Heap entry ordered so the heap top is the LARGEST (worst-ranked) key."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Worst") -> bool:
+        return self.key > other.key
+
+
+def sort_key(item: Discovered) -> Tuple[int, str]:
+    """Same ordering as file_finder: priority dirs first, then by path."""
+    return (0 if item.priority else 1, str(item.path))
+
+
+def _put(out: "queue.Queue", value, stop: threading.Event) -> bool:
+    """Queue value unless the consumer stops first. Returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            out.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(discovered: Iterable[Discovered], out: "queue.Queue", stop: threading.Event) -> None:
+    """Discovery thread: push items until done, or until the consumer stops.
+
+    Every put gives up once stop is set, so a consumer that fails (and stops
+    reading) while the queue is full never leaves this thread blocked.
+    """
+    try:
+        for item in discovered:
+            if not _put(out, item, stop):
+                return
+        _put(out, _DONE, stop)
+    except BaseException as e:  # surfaced to the consumer thread
+        _put(out, _Failure(e), stop)
+
+
+def stream_scan(
+    discovered: Iterable[Discovered],
+    process: Callable[[Path], T],
+    max_files: int = MAX_FILES,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Tuple[List[T], List[Dict]]:
+    """Consume discovery output concurrently and process files as they arrive.
+
+    Args:
+        discovered: Discovery stream, e.g. file_finder.iter_source_files().
+        process: Per-file work (read, check) run in arrival order.
+        max_files: Cap on processed files, applied exactly like find_source_files().
+        queue_size: Bound on files discovered but not yet processed.
+
+    Returns:
+        (results, skipped): results in deterministic file order, and skip
+        records in discovery order (plus file_limit_exceeded when capped).
+    """
+    items: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_produce, args=(discovered, items, stop), name="hermes-discovery", daemon=True,
+    )
+    producer.start()
+
+    skipped: List[Dict] = []
+    selected: List[_Worst] = []  # heap of the best max_files keys seen so far
+    results: Dict[Tuple[int, str], T] = {}
+    found = 0
+
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            if item.skip_reason is not None:
+                skipped.append(item.skipped_entry())
+                continue
+
+            found += 1
+            key = sort_key(item)
+            if len(selected) < max_files:
+                heapq.heappush(selected, _Worst(key))
+            elif selected and key < selected[0].key:
+                # Displaces the current worst; its work is discarded.
+                evicted = heapq.heapreplace(selected, _Worst(key))
+                results.pop(evicted.key, None)
+            else:
+                continue  # can never be in the final top max_files
+            results[key] = process(item.path)
+    finally:
+        stop.set()
+        producer.join()
+
+    if found > max_files:
+        skipped.append(file_limit_entry(found, max_files))
+
+    return [results[key] for key in sorted(results)], skipped
@@ -0,0 +1,111 @@
+"""
+preprocess.py — One pass per file that masks what is not markup.
+
+Every check finds tags through the shared tokenizer, so anything that looks
+like a tag but is not rendered markup inflates every count: a commented-out
+<img> without alt, "<a href=#>" built in an inline script, a selector in a
+<style> block. preprocess() runs once per document (cached on
+SourceDocument.preprocessed) and returns:
+
+- markup: a copy of the text of the same length (newlines kept) with
+  HTML comments, <script> bodies and <style> bodies blanked (.html), or
+  JavaScript comments, strings and generics blanked (.jsx/.tsx, see
+  jsx_lexer). The tokenizer finds tags in it; offsets are unchanged, so
+  attribute and text slices still come from the original text.
+- json_ld: the bodies of <script type="application/ld+json"> blocks,
+  extracted before their scripts are blanked.
+
+<script type="text/template"> (and other HTML template types) bodies are
+markup and are left alone. String checks that look for content anywhere
+in the source (SSR markers) keep reading SourceDocument.text.
+
+Detection: regex + str.find, linear in the file size. NO HTML parsing.
+"""
+
+import re
+from typing import List, NamedTuple
+
+from scan.jsx_lexer import is_jsx_path, mask_jsx
+
+# "<!--" or the start of a <script>/<style> tag
+RAW_TEXT_START_PATTERN = re.compile(r"<!--|<(script|style)\b", re.IGNORECASE)
+RAW_TEXT_END_PATTERNS = {
+    "script": re.compile(r"</script\b", re.IGNORECASE),
+    "style": re.compile(r"</style\b", re.IGNORECASE),
+}
+
+# Schema.org JSON-LD (applied to <script> tag attributes; the type attribute
+# itself, not data-type= or x-type=)
+JSONLD_TYPE_ATTR_PATTERN = re.compile(
+    r'(?<![\w-])type\s*=\s*["\']application/ld\+json["\']',
+    re.IGNORECASE,
+)
+# <script> types whose body is HTML (text/template, text/x-handlebars-template, text/html, ...)
+TEMPLATE_TYPE_ATTR_PATTERN = re.compile(
+    r"""(?<![\w-])type\s*=\s*["']?[^"'\s>]*(?:template|html)""",
+    re.IGNORECASE,
+)
+
+
+def _blank(chunk: str) -> str:
+    """chunk with every character but newlines replaced by a space."""
+    if "\n" not in chunk:
+        return " " * len(chunk)
+    return "\n".join(" " * len(line) for line in chunk.split("\n"))
+
+
+class Preprocessed(NamedTuple):
+    """A document's markup view and its extracted JSON-LD blocks."""
+
+    markup: str
+    json_ld: List[str]
+
+
+def mask_html(text: str) -> Preprocessed:
+    """Blank HTML comments and <script>/<style> bodies; extract JSON-LD blocks.
+
+    Comments are blanked from "<!--" through "-->", script and style bodies
+    between their start tag and the next </script> / </style> (the tags
+    themselves are kept). An unterminated comment or body runs to the end of
+    the file, as in a browser.
+    """
+    json_ld: List[str] = []
+    pieces = []
+    last = 0
+    pos, end = 0, len(text)
+    search = RAW_TEXT_START_PATTERN.search
+    while pos < end:
+        m = search(text, pos)
+        if m is None:
+            break
+        element = m.group(1)
+        if element is None:
+            close = text.find("-->", m.end())
+            start, pos = m.start(), end if close == -1 else close + 3
+        else:
+            tag_end = text.find(">", m.end())
+            if tag_end == -1:
+                break
+            attrs = text[m.end():tag_end]
+            start = tag_end + 1
+            close = RAW_TEXT_END_PATTERNS[element.lower()].search(text, start)
+            pos = end if close is None else close.start()
+            if element.lower() == "script":
+                if JSONLD_TYPE_ATTR_PATTERN.search(attrs):
+                    json_ld.append(text[start:pos].strip())
+                elif TEMPLATE_TYPE_ATTR_PATTERN.search(attrs):
+                    continue
+        pieces.append(text[last:start])
+        pieces.append(_blank(text[start:pos]))
+        last = pos
+    if not pieces:
+        return Preprocessed(text, json_ld)
+    pieces.append(text[last:])
+    return Preprocessed("".join(pieces), json_ld)
+
+
+def preprocess(text: str, suffix: str) -> Preprocessed:
+    """The markup view of a file's text, chosen by its extension."""
+    if is_jsx_path(suffix):
+        return Preprocessed(mask_jsx(text), [])
+    return mask_html(text)
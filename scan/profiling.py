@@ -0,0 +1,199 @@
+"""
+profiling.py — Opt-in wall/CPU timings for a scan (--profile).
+
+Measures discovery, file reads, tokenization, each of the 6 checks and each
+file, plus bytes read, and reports them as a "timings" block in the scan
+JSON with the slowest files listed first.
+
+CPU times use time.thread_time(), so discovery (its own thread) and file
+work are measured separately even in a serial scan. Per-file numbers are
+taken wherever the file is processed (in-process or in a worker) and travel
+back with its partials, so files served from the cache or a baseline are not
+counted. "total" CPU covers the parent process only.
+
+The same measurements can also be written as a Chrome trace_event file
+(--trace FILE) for chrome://tracing or Perfetto: one span per discovery
+phase, per file, and per read / tokenize / check on that file, tagged with
+the process and thread that ran it.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from scan import regex_profile
+from scan.checks import ANALYSES, CHECKS, FilePartials
+from scan.document import load_document
+
+T = TypeVar("T")
+
+DEFAULT_TOP_N = 10
+
+# Per-file timing record: {"path", "bytes", "wall_s", "cpu_s", "stages": {stage: (wall, cpu)}},
+# plus "regex" (per-pattern stats) and "trace" (trace events) when those are on.
+FileTiming = Dict
+
+
+class _Stopwatch:
+    """Wall + CPU (current thread) time of a block."""
+
+    __slots__ = ("wall", "cpu", "started_ns", "_wall0", "_cpu0")
+
+    def __enter__(self) -> "_Stopwatch":
+        self.started_ns = time.time_ns()  # comparable across processes, for traces
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.thread_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall = time.perf_counter() - self._wall0
+        self.cpu = time.thread_time() - self._cpu0
+
+
+def trace_event(name: str, category: str, watch: _Stopwatch, args: Optional[Dict] = None) -> Dict:
+    """Complete ("X") trace_event for a finished stopwatch, in this process and thread."""
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": watch.started_ns / 1000,
+        "dur": watch.wall * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+def profiled_map_path(
+    path: str,
+    root: Optional[str] = None,
+    blob_sha: Optional[str] = None,
+    raw: Optional[bytes] = None,
+    regex: bool = False,
+    trace: bool = False,
+) -> Tuple[FilePartials, FileTiming]:
+    """checks.map_path with timings. Top-level so it can run in a worker process.
+
+    With regex=True the check modules' patterns are also profiled (see
+    regex_profile); stage timings then include the wrappers' overhead.
+    With trace=True the record also carries this file's trace events.
+    """
+    if regex:
+        with regex_profile.recording() as pattern_stats:
+            partials, timing = profiled_map_path(path, root, blob_sha, raw, trace=trace)
+        timing["regex"] = pattern_stats
+        return partials, timing
+
+    watches = {}
+    with _Stopwatch() as total:
+        with _Stopwatch() as watches["read"]:
+            doc = load_document(Path(path), Path(root) if root else None, blob_sha, raw)
+
+        with _Stopwatch() as watches["tokenize"]:
+            doc.tokens
+
+        partials = {}
+        for name, module in {**CHECKS, **ANALYSES}.items():
+            with _Stopwatch() as watches[name]:
+                partials[name] = module.scan_file(doc)
+
+    timing = {
+        "path": doc.relative_path,
+        "bytes": doc.size,
+        "wall_s": total.wall,
+        "cpu_s": total.cpu,
+        "stages": {stage: (watch.wall, watch.cpu) for stage, watch in watches.items()},
+    }
+    if trace:
+        timing["trace"] = [trace_event(doc.relative_path, "file", total, {"bytes": doc.size})] + [
+            trace_event(stage, "check" if stage in CHECKS else stage, watch, {"file": doc.relative_path})
+            for stage, watch in watches.items()
+        ]
+    return partials, timing
+
+
+class ScanProfile:
+    """Collects timings for one scan and renders the "timings" block."""
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N, trace: bool = False):
+        self.top_n = top_n
+        self.trace_events: Optional[List[Dict]] = [] if trace else None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.discovery_wall = 0.0
+        self.discovery_cpu = 0.0
+        self.stages: Dict[str, List[float]] = {}
+        self.files: List[FileTiming] = []
+        self.patterns: regex_profile.PatternStats = {}
+
+    @contextmanager
+    def discovery(self) -> Iterator[None]:
+        """Count the enclosed block as discovery time."""
+        watch = _Stopwatch().__enter__()
+        try:
+            yield
+        finally:
+            watch.__exit__()
+            self.discovery_wall += watch.wall
+            self.discovery_cpu += watch.cpu
+            if self.trace_events is not None:
+                self.trace_events.append(trace_event("discovery", "discovery", watch))
+
+    def timed_discovery(self, discovered: Iterable[T]) -> Iterator[T]:
+        """Wrap a discovery stream; CPU is measured in the thread that consumes it."""
+        with self.discovery():
+            yield from discovered
+
+    def add_file(self, timing: FileTiming) -> None:
+        self.files.append(timing)
+        for stage, (wall, cpu) in timing["stages"].items():
+            totals = self.stages.setdefault(stage, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+        if "regex" in timing:
+            regex_profile.merge_stats(self.patterns, timing.pop("regex"))
+        if "trace" in timing:
+            events = timing.pop("trace")
+            if self.trace_events is not None:
+                self.trace_events.extend(events)
+
+    def write_trace(self, path: str) -> None:
+        """Write the collected events as a Chrome trace_event JSON file."""
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "scanner"}}]
+        metadata += [
+            {"name": "process_name", "ph": "M", "pid": worker, "args": {"name": "check worker"}}
+            for worker in sorted({e["pid"] for e in self.trace_events} - {pid})
+        ]
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": metadata + self.trace_events, "displayTimeUnit": "ms"}, fh)
+
+    def to_dict(self) -> Dict:
+        def _pair(wall: float, cpu: float) -> Dict[str, float]:
+            return {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6)}
+
+        slowest = sorted(self.files, key=lambda t: t["wall_s"], reverse=True)[:self.top_n]
+        return {
+            "total": _pair(time.perf_counter() - self._wall0, time.process_time() - self._cpu0),
+            "discovery": _pair(self.discovery_wall, self.discovery_cpu),
+            "read": _pair(*self.stages.get("read", (0.0, 0.0))),
+            "tokenize": _pair(*self.stages.get("tokenize", (0.0, 0.0))),
+            "checks": {name: _pair(*self.stages.get(name, (0.0, 0.0))) for name in CHECKS},
+            "analyses": {name: _pair(*self.stages.get(name, (0.0, 0.0))) for name in ANALYSES},
+            "files_profiled": len(self.files),
+            "bytes_read": sum(t["bytes"] for t in self.files),
+            "slowest_files": [
+                {"path": t["path"], "bytes": t["bytes"], **_pair(t["wall_s"], t["cpu_s"])}
+                for t in slowest
+            ],
+        }
+
+    def regex_report(self) -> List[Dict]:
+        """Per-pattern calls, matches, total and worst-call time across the scan."""
+        return regex_profile.pattern_report(self.patterns)
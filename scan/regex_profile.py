@@ -0,0 +1,204 @@
+"""
+regex_profile.py — Per-pattern cost of the check modules' regexes (--profile-regex).
+
+While recording, every module-level compiled pattern in the check modules, the
+preprocessors and the tokenizer is swapped for a wrapper that counts calls and
+matches and times each call. Ad-hoc re.search()/re.match()/... calls made through those modules'
+`re` name are wrapped the same way, keyed by their pattern text.
+
+Patterns are restored when recording stops, so the wrappers only ever exist
+for the duration of one file's map step.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator, List, Optional
+
+from scan import checks, jsx_lexer, preprocess, tokenizer
+
+# Pattern key -> [calls, matches, total seconds, worst single call seconds]
+PatternStats = Dict[str, List[float]]
+
+# Collector for the current recording; None when not recording.
+_active: Optional[PatternStats] = None
+
+_RE_FUNCTIONS = ("search", "match", "fullmatch", "findall", "finditer", "sub", "subn", "split")
+
+
+def profiled_modules() -> List[ModuleType]:
+    return [preprocess, jsx_lexer, tokenizer, *checks.CHECKS.values()]
+
+
+def _record(key: str, elapsed: float, matches: int) -> None:
+    if _active is None:
+        return
+    stats = _active.get(key)
+    if stats is None:
+        stats = _active[key] = [0, 0, 0.0, 0.0]
+    stats[0] += 1
+    stats[1] += matches
+    stats[2] += elapsed
+    if elapsed > stats[3]:
+        stats[3] = elapsed
+
+
+class ProfiledPattern:
+    """Stand-in for a compiled pattern that records every call under key."""
+
+    __slots__ = ("_pattern", "_key")
+
+    def __init__(self, pattern: re.Pattern, key: str):
+        self._pattern = pattern
+        self._key = key
+
+    def __getattr__(self, name):
+        # pattern, flags, groups, groupindex, scanner
+        return getattr(self._pattern, name)
+
+    def _timed(self, method: str, args, kwargs, count):
+        start = time.perf_counter()
+        result = getattr(self._pattern, method)(*args, **kwargs)
+        _record(self._key, time.perf_counter() - start, count(result))
+        return result
+
+    def search(self, *args, **kwargs):
+        return self._timed("search", args, kwargs, lambda m: m is not None)
+
+    def match(self, *args, **kwargs):
+        return self._timed("match", args, kwargs, lambda m: m is not None)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._timed("fullmatch", args, kwargs, lambda m: m is not None)
+
+    def findall(self, *args, **kwargs):
+        return self._timed("findall", args, kwargs, len)
+
+    def split(self, *args, **kwargs):
+        return self._timed("split", args, kwargs, lambda parts: len(parts) - 1)
+
+    def subn(self, *args, **kwargs):
+        return self._timed("subn", args, kwargs, lambda result: result[1])
+
+    def sub(self, *args, **kwargs):
+        return self.subn(*args, **kwargs)[0]
+
+    def finditer(self, *args, **kwargs) -> Iterator[re.Match]:
+        """Counted as one call; time spent by the caller between matches is excluded."""
+        elapsed = 0.0
+        matches = 0
+        start = time.perf_counter()
+        iterator = self._pattern.finditer(*args, **kwargs)
+        try:
+            for match in iterator:
+                elapsed += time.perf_counter() - start
+                matches += 1
+                yield match
+                start = time.perf_counter()
+            elapsed += time.perf_counter() - start
+        finally:
+            _record(self._key, elapsed, matches)
+
+
+class _ProfiledRe:
+    """Replacement for a module's `re` name: module-level re.* calls go through ProfiledPattern."""
+
+    def __init__(self, module_name: str):
+        self._prefix = f"{module_name}.re"
+        self._compiled: Dict[tuple, ProfiledPattern] = {}
+
+    def __getattr__(self, name):
+        return getattr(re, name)
+
+    def _wrapped(self, pattern, flags: int = 0) -> ProfiledPattern:
+        wrapped = self._compiled.get((pattern, flags))
+        if wrapped is None:
+            compiled = re.compile(pattern, flags)
+            wrapped = ProfiledPattern(compiled, f"{self._prefix}:{compiled.pattern}")
+            self._compiled[(pattern, flags)] = wrapped
+        return wrapped
+
+    def search(self, pattern, string, flags=0):
+        return self._wrapped(pattern, flags).search(string)
+
+    def match(self, pattern, string, flags=0):
+        return self._wrapped(pattern, flags).match(string)
+
+    def fullmatch(self, pattern, string, flags=0):
+        return self._wrapped(pattern, flags).fullmatch(string)
+
+    def findall(self, pattern, string, flags=0):
+        return self._wrapped(pattern, flags).findall(string)
+
+    def finditer(self, pattern, string, flags=0):
+        return self._wrapped(pattern, flags).finditer(string)
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        return self._wrapped(pattern, flags).sub(repl, string, count)
+
+    def subn(self, pattern, repl, string, count=0, flags=0):
+        return self._wrapped(pattern, flags).subn(repl, string, count)
+
+    def split(self, pattern, string, maxsplit=0, flags=0):
+        return self._wrapped(pattern, flags).split(string, maxsplit)
+
+
+def _install() -> List[tuple]:
+    """Swap in wrappers; returns (module, name, original) triples for restoring."""
+    originals = []
+    for module in profiled_modules():
+        short = module.__name__.rsplit(".", 1)[-1]
+        for name, value in list(vars(module).items()):
+            if isinstance(value, re.Pattern):
+                replacement = ProfiledPattern(value, f"{short}.{name}")
+            elif value is re:
+                replacement = _ProfiledRe(short)
+            else:
+                continue
+            originals.append((module, name, value))
+            setattr(module, name, replacement)
+    return originals
+
+
+@contextmanager
+def recording() -> Iterator[PatternStats]:
+    """Record regex calls made by the check modules inside the block."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("regex profiling is already recording")
+    stats: PatternStats = {}
+    originals = _install()
+    _active = stats
+    try:
+        yield stats
+    finally:
+        _active = None
+        for module, name, value in originals:
+            setattr(module, name, value)
+
+
+def merge_stats(total: PatternStats, stats: PatternStats) -> None:
+    """Add one recording's stats into a running total."""
+    for key, (calls, matches, elapsed, worst) in stats.items():
+        entry = total.setdefault(key, [0, 0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += matches
+        entry[2] += elapsed
+        entry[3] = max(entry[3], worst)
+
+
+def pattern_report(total: PatternStats) -> List[Dict]:
+    """Per-pattern rows, most expensive first."""
+    rows = [
+        {
+            "pattern": key,
+            "calls": int(calls),
+            "matches": int(matches),
+            "total_s": round(elapsed, 6),
+            "worst_call_s": round(worst, 6),
+        }
+        for key, (calls, matches, elapsed, worst) in total.items()
+    ]
+    rows.sort(key=lambda row: (-row["total_s"], row["pattern"]))
+    return rows
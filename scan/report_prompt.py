@@ -10,7 +10,7 @@ If you change one, change both.
 """
 
 import json
-from typing import Dict
+from typing import Dict, Optional
 
 REASONING_PROMPT_TEMPLATE = """You are the reasoning layer of Hermes Clew, an agent-readiness scanner.
 
@@ -42,6 +42,9 @@ They may not know what ARIA means or what Schema.org does. But they DO understan
 {raw_findings_json}
 ```
 
+## Resolved Components
+{component_summary}
+
 ## Category Breakdown
 {category_breakdown}
 
@@ -51,7 +54,9 @@ They may not know what ARIA means or what Schema.org does. But they DO understan
 
 2. REVIEW each category's findings for false positives. Common false positives:
    - React component libraries using custom components (e.g., <Button>) that
-     render to semantic HTML at build time — don't flag as div-soup
+     render to semantic HTML at build time — don't flag as div-soup. Check
+     Resolved Components first: it lists what each custom component used in
+     the scan actually renders, read from its source file.
    - CSS-in-JS frameworks producing div wrappers for styling, not interactivity
    - Data visualization libraries (D3, Recharts) using many divs for chart
      containers — these aren't interactive elements
@@ -200,6 +205,27 @@ You MUST include ALL of the following in EVERY report. These are not optional:
 """
 
 
+def _component_summary(components: Optional[Dict]) -> str:
+    """One line per resolved custom component: what it renders and how often it is used."""
+    if not components or not components.get("resolved"):
+        return "No custom components were resolved from the scanned files."
+    lines = []
+    for c in components["resolved"]:
+        notes = [f"used {c['usages']}x"]
+        if c["role"]:
+            notes.append(f"role=\"{c['role']}\"")
+        if c["aria_label"]:
+            notes.append("has aria-label")
+        if c["forwards_props"]:
+            notes.append("forwards props")
+        via = "".join(f" via <{name}>" for name in c["via"])
+        lines.append(f"- <{c['component']}> ({c['file']}) renders <{c['renders']}>{via} — {', '.join(notes)}")
+    unresolved = components.get("unresolved") or {}
+    if unresolved:
+        lines.append("- Not resolved (package imports or aliases): " + ", ".join(f"<{name}>" for name in unresolved))
+    return "\n".join(lines)
+
+
 def build_reasoning_prompt(
     scan_result: Dict,
     project_name: str = "Unknown Project",
@@ -238,12 +264,14 @@ def build_reasoning_prompt(
         findings_for_prompt[cat_name] = cat_data.get("findings", [])
 
     raw_findings_json = json.dumps(findings_for_prompt, indent=2)
+    component_summary = _component_summary(scan_result.get("components"))
 
     prompt = REASONING_PROMPT_TEMPLATE.format(
         project_name=project_name,
         file_count=file_count,
         raw_score=raw_score,
         raw_findings_json=raw_findings_json,
+        component_summary=component_summary,
         category_breakdown=category_breakdown_text,
         scan_date=scan_date or "N/A",
     )
@@ -5,88 +5,507 @@ This file calls the check modules. It does NOT contain check logic.
 One file, one job: orchestration.
 """
 
+import argparse
 import json
 import logging
+import multiprocessing
+import os
 import sys
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
+from typing import Callable, Optional
 
-from scan.file_finder import find_source_files, MAX_FILES
-from scan.check_semantic_html import check_semantic_html
-from scan.check_form_accessibility import check_form_accessibility
-from scan.check_aria import check_aria
-from scan.check_structured_data import check_structured_data
-from scan.check_content_in_html import check_content_in_html
-from scan.check_link_navigation import check_link_navigation
+from scan import incremental
+from scan.file_finder import iter_source_files, find_tracked_source_files, file_limit_entry, MAX_FILES
+from scan.cache import DEFAULT_MAX_BYTES, ResultCache, content_key
+from scan.checks import FilePartials, map_document, map_path, merge_partials
+from scan.components import ComponentGraph
+from scan.document import load_document
+from scan.memory import MemoryBudget, MemoryBudgetExceeded, PartialsSpill, SpillRef
+from scan.ndjson import NdjsonWriter
+from scan.pipeline import sort_key, stream_scan
+from scan.profiling import ScanProfile, profiled_map_path
+from scan.watchdog import TIMEOUT_REASON, WatchdogPool
 from scan.scoring import calculate_total_score, get_score_rating, get_category_breakdown
 
 logger = logging.getLogger(__name__)
 
 
-def run_scan(repo_path: str) -> dict:
+def _worker_count(jobs: int) -> int:
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def _make_executor(jobs: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool for the per-file map step, or None to run serially."""
+    workers = _worker_count(jobs)
+    if workers <= 1:
+        return None
+    # spawn: workers never inherit the discovery thread's state.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def run_scan(
+    repo_path: str,
+    use_git_index: bool = False,
+    jobs: int = 1,
+    file_timeout: Optional[float] = None,
+    scan_timeout: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    since: Optional[str] = None,
+    baseline_path: Optional[str] = None,
+    write_baseline_path: Optional[str] = None,
+    profile: bool = False,
+    profile_regex: bool = False,
+    trace_path: Optional[str] = None,
+    max_memory_bytes: Optional[int] = None,
+    on_file: Optional[Callable[[Path, FilePartials], None]] = None,
+) -> dict:
     """Run the full Hermes Clew scan on a repository.
 
     Args:
         repo_path: Path to the repository root to scan.
+        use_git_index: Discover tracked files from .git/index instead of
+            walking the tree. Falls back to the walker outside a git checkout.
+        jobs: Worker processes for the per-file check step. 1 runs serially
+            in-process; 0 uses every CPU. Results are identical either way.
+        file_timeout: Wall-clock seconds allowed per file in the checks.
+        scan_timeout: Wall-clock seconds allowed for the whole scan.
+            With either budget set, checks run in killable worker processes
+            (at least one, even with jobs=1). Files that run out of time are
+            reported in skipped_files with reason "timeout" and not scored.
+        cache_dir: Directory for the persistent per-file result cache. Files
+            whose content was checked before (same engine) are not re-checked.
+            Hit/miss counters are added to the output under "cache".
+        cache_max_bytes: Size cap for the cache; least recently used entries
+            are evicted beyond it.
+        since: Git ref the baseline was scanned at. Only files changed since
+            then are re-checked; the rest come from the baseline. Requires
+            baseline_path. Adds an "incremental" block with the score delta.
+        baseline_path: Baseline file written by an earlier write_baseline_path scan.
+        write_baseline_path: Write this scan's per-file results here, for
+            later incremental scans.
+        profile: Record wall/CPU time for discovery, each check and each
+            checked file, plus bytes read, under "timings".
+        profile_regex: Count calls, matches and time for every regex the
+            check modules use, reported under "regex_profile".
+        trace_path: Write a Chrome trace_event file with spans for discovery,
+            each file, and each read / tokenize / check on it.
+        max_memory_bytes: Memory budget for the scanning process, traced with
+            tracemalloc. Per-file results are spilled to a temporary file as
+            files finish, and MemoryBudgetExceeded is raised if usage still
+            goes over. Adds "memory" with the peak.
+        on_file: Called with (path, partials) for each scanned file, in file
+            order (used for streaming output). With a file list known up
+            front (git index, incremental) that is as soon as the file and
+            all before it are settled; after a directory walk, once the walk ends.
 
     Returns:
         Dict with total_score, rating, file_count, categories, breakdown,
-        skipped_files, and files_capped.
+        skipped_files, files_capped, cache (only when cache_dir is set),
+        incremental (only with since), timings (only with profile),
+        regex_profile (only with profile_regex) and memory (only with
+        max_memory_bytes).
     """
-    files, skipped = find_source_files(repo_path)
-
-    logger.info("Files found: %d", len(files))
-    if skipped:
-        logger.info("Files skipped: %d", len(skipped))
-        for entry in skipped:
-            logger.debug("Skipped: %s — %s", entry["path"], entry["reason"])
-
-    categories = {
-        "semantic_html": check_semantic_html(files),
-        "form_accessibility": check_form_accessibility(files),
-        "aria": check_aria(files),
-        "structured_data": check_structured_data(files),
-        "content_in_html": check_content_in_html(files),
-        "link_navigation": check_link_navigation(files),
-    }
-
-    total_score = calculate_total_score(categories)
-    rating = get_score_rating(total_score)
-    breakdown = get_category_breakdown(categories)
-
-    for cat_name, info in breakdown.items():
-        logger.info("Category %s: %d/%d", cat_name, info["earned"], info["max"])
-    logger.info("Total score: %d — %s", total_score, rating)
-
-    return {
-        "project_path": str(repo_path),
-        "scan_date": datetime.now(timezone.utc).isoformat(),
-        "file_count": len(files),
-        "files_scanned": [str(f.name) for f in files],
-        "skipped_files": skipped,
-        "files_capped": len(files) >= MAX_FILES and len(skipped) > 0,
-        "total_score": total_score,
-        "rating": rating,
-        "breakdown": breakdown,
-        "categories": categories,
-    }
+    if profile or profile_regex or trace_path is not None:
+        profiler = ScanProfile(trace=trace_path is not None)
+        map_target = partial(profiled_map_path, regex=profile_regex, trace=trace_path is not None)
+    else:
+        profiler = None
+        map_target = map_path
+    root = Path(repo_path).resolve()
+    baseline = None
+    if since is not None:
+        if baseline_path is None:
+            raise ValueError("--since requires --baseline")
+        baseline = incremental.load_baseline(baseline_path)
+    cache = ResultCache(cache_dir, cache_max_bytes) if cache_dir else None
+    if file_timeout is not None or scan_timeout is not None:
+        watchdog = WatchdogPool(map_target, _worker_count(jobs), file_timeout, scan_timeout)
+        executor = None
+    else:
+        watchdog = None
+        executor = _make_executor(jobs)
+    if max_memory_bytes is not None:
+        budget = MemoryBudget(max_memory_bytes)
+        spill = PartialsSpill()
+    else:
+        budget = spill = None
+
+    try:
+        def settle(value, key: Optional[str], path: Path):
+            """Finish one file's map result: record timings, fill the cache, spill.
+
+            Returns the partials, or a SpillRef in memory-bounded mode.
+            """
+            if isinstance(value, tuple):  # fresh map step under profiling
+                value, timing = value
+                profiler.add_file(timing)
+            if key is not None:
+                cache.put(key, path.name, value)
+            if spill is not None:
+                value = spill.store(value)
+                budget.check()
+            return value
+
+        def process(path: Path, blob_sha: Optional[str] = None):
+            """Start the map step for one file.
+
+            Returns (handle, cache_key): handle is the settled result (see
+            settle), a Future, or a watchdog task id; cache_key is set when a
+            Future's or task's partials still need to be stored in the cache.
+            """
+            raw = None
+            key = None
+            if cache is not None:
+                if not blob_sha:
+                    raw = path.read_bytes()
+                key = content_key(raw, blob_sha)
+                cached = cache.get(key, path.name)
+                if cached is not None:
+                    return settle(cached, None, path), None
+            # Each file is read once and every check's map step runs on it:
+            # bytes already read for the cache key go to the map step (in a
+            # worker too), so they are what gets checked and cached.
+            args = (str(path), str(root), blob_sha, raw)
+            if watchdog is not None:
+                return watchdog.submit(*args), key
+            if executor is None:
+                if profiler is not None:
+                    return settle(map_target(*args), key, path), None
+                return settle(map_document(load_document(path, root, blob_sha, raw)), key, path), None
+            return executor.submit(map_target, *args), key
+
+        inc_plan = None
+        if baseline is not None:
+            with profiler.discovery() if profiler is not None else nullcontext():
+                inc_plan, fallback_reason = incremental.plan(root, since, baseline)
+            if inc_plan is None:
+                logger.warning("Incremental scan not possible (%s); running a full scan", fallback_reason)
+
+        tracked = None
+        if inc_plan is None and use_git_index:
+            with profiler.discovery() if profiler is not None else nullcontext():
+                tracked = find_tracked_source_files(repo_path)
+
+        per_file = []
+        completed = []
+
+        def finish(path: Path, partials) -> None:
+            if on_file is not None:
+                on_file(path, spill.load(partials) if isinstance(partials, SpillRef) else partials)
+            completed.append(path)
+            per_file.append(partials)
+
+        def skip_abandoned(path: Path, reason: str) -> None:
+            if reason == TIMEOUT_REASON:
+                logger.warning("Check time budget exceeded: %s", path)
+            else:
+                logger.warning("Check worker died on %s (%s)", path, reason)
+            skipped.append({"path": str(path), "reason": reason})
+
+        def drain(entries, start: int) -> int:
+            """Finish the settled entries from start on, in file order.
+
+            Stops at the first Future or watchdog task still running (those
+            are collected below). Returns the index of the first unfinished
+            entry.
+            """
+            while start < len(entries):
+                path, (handle, key) = entries[start]
+                if isinstance(handle, int):
+                    if not watchdog.finished(handle):
+                        break
+                    value, reason = watchdog.take(handle)
+                    start += 1
+                    if reason is not None:
+                        skip_abandoned(path, reason)
+                    else:
+                        finish(path, settle(value, key, path))
+                    continue
+                if isinstance(handle, Future):
+                    if not handle.done():
+                        break
+                    handle = settle(handle.result(), key, path)
+                finish(path, handle)
+                start += 1
+            return start
+
+        entries = []
+        done = 0
+        if inc_plan is not None:
+            # Baseline partials for unchanged files, fresh checks for changed ones,
+            # in the same order and under the same cap as a full scan.
+            items = [(item, partials) for item, partials in inc_plan.reused]
+            items += [(item, None) for item in inc_plan.rescan]
+            items.sort(key=lambda entry: sort_key(entry[0]))
+            skipped = list(inc_plan.skipped)
+            if len(items) > MAX_FILES:
+                skipped.append(file_limit_entry(len(items)))
+                items = items[:MAX_FILES]
+            # The file list is final, so results stream out as files settle.
+            for item, partials in items:
+                entries.append((item.path, (partials, None) if partials is not None else process(item.path)))
+                done = drain(entries, done)
+        elif tracked is not None:
+            files, skipped, blob_shas = tracked
+            for path in files:
+                entries.append((path, process(path, blob_shas.get(str(path)))))
+                done = drain(entries, done)
+        else:
+            if use_git_index:
+                logger.info("No git index found; walking the directory tree")
+            # Stream: files are checked while the walk is still running. The
+            # file order (and cap) is only known once the walk ends.
+            discovered = iter_source_files(repo_path)
+            if profiler is not None:
+                discovered = profiler.timed_discovery(discovered)
+            entries, skipped = stream_scan(
+                discovered,
+                lambda path: (path, process(path)),
+            )
+
+        remaining = entries[done:]
+        task_results, abandoned = {}, {}
+        if watchdog is not None:
+            task_results, abandoned = watchdog.collect(
+                handle for _, (handle, _) in remaining if isinstance(handle, int)
+            )
+
+        for path, (handle, key) in remaining:
+            if isinstance(handle, int):
+                if handle in abandoned:
+                    skip_abandoned(path, abandoned[handle])
+                    continue
+                partials = settle(task_results.pop(handle), key, path)
+            elif isinstance(handle, Future):
+                partials = settle(handle.result(), key, path)
+            else:
+                partials = handle
+            finish(path, partials)
+        files = completed
+        if spill is not None:
+            per_file = spill.sequence(per_file)
+
+        logger.info("Files found: %d", len(files))
+        if skipped:
+            logger.info("Files skipped: %d", len(skipped))
+            for entry in skipped:
+                logger.debug("Skipped: %s — %s", entry["path"], entry["reason"])
+
+        # Reduce in file order so results match the serial path byte for byte.
+        categories = merge_partials(per_file)
+        if budget is not None:
+            budget.check()
+
+        components = ComponentGraph(
+            [path.relative_to(root).as_posix() for path in files],
+            [partials.get("components") for partials in per_file],
+        ).report()
+
+        total_score = calculate_total_score(categories)
+        rating = get_score_rating(total_score)
+        breakdown = get_category_breakdown(categories)
+
+        for cat_name, info in breakdown.items():
+            logger.info("Category %s: %d/%d", cat_name, info["earned"], info["max"])
+        logger.info("Total score: %d — %s", total_score, rating)
+
+        result = {
+            "project_path": str(repo_path),
+            "scan_date": datetime.now(timezone.utc).isoformat(),
+            "file_count": len(files),
+            "files_scanned": [str(f.name) for f in files],
+            "skipped_files": skipped,
+            "files_capped": len(files) >= MAX_FILES and len(skipped) > 0,
+            "total_score": total_score,
+            "rating": rating,
+            "breakdown": breakdown,
+            "categories": categories,
+        }
+        if components["resolved"]:
+            result["components"] = components
+        if cache is not None:
+            cache.close()  # evictions happen on close
+            result["cache"] = cache.stats()
+        if baseline is not None:
+            result["incremental"] = {
+                "since": since,
+                "mode": "incremental" if inc_plan is not None else "full",
+                "changed_files": inc_plan.changed if inc_plan is not None else None,
+                "rescanned": len(inc_plan.rescan) if inc_plan is not None else len(files),
+                "reused": len(inc_plan.reused) if inc_plan is not None else 0,
+                **incremental.score_delta(result, baseline),
+            }
+        if profile:
+            result["timings"] = profiler.to_dict()
+        if profile_regex:
+            result["regex_profile"] = profiler.regex_report()
+        if trace_path is not None:
+            profiler.write_trace(trace_path)
+        if budget is not None:
+            result["memory"] = budget.report(spill.count)
+        if write_baseline_path is not None:
+            incremental.write_baseline(
+                write_baseline_path,
+                incremental.build_baseline(root, files, per_file, skipped, result),
+            )
+        return result
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if watchdog is not None:
+            watchdog.close()
+        if cache is not None:
+            cache.close()
+        if spill is not None:
+            spill.close()
+        if budget is not None:
+            budget.close()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m scan.scanner",
+        description="Hermes Clew deterministic agent-readiness scan.",
+    )
+    parser.add_argument("repo_path", help="Path to the repository root to scan.")
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        help="List tracked files from .git/index instead of walking the tree "
+             "(falls back to the walker outside a git checkout).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run per-file checks in N worker processes (0 = all CPUs, default 1).",
+    )
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Abandon any file whose checks run longer than this (reported as skipped: timeout).",
+    )
+    parser.add_argument(
+        "--scan-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Abandon all unfinished files once the scan has run this long.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        metavar="DIR",
+        help="Persist per-file results here and only re-check new or modified files.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        metavar="MB",
+        help="Size cap for --cache-dir; least recently used entries are evicted (default 64).",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        metavar="REF",
+        help="Re-check only files changed since REF (needs git) and reuse --baseline for the rest.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        metavar="FILE",
+        help="Baseline from a --write-baseline scan of REF (used with --since).",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        default=None,
+        metavar="FILE",
+        help="Write per-file results to FILE for later --since scans.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Add a \"timings\" block: wall/CPU time per stage, per check and for the slowest files.",
+    )
+    parser.add_argument(
+        "--profile-regex",
+        action="store_true",
+        help="Add a \"regex_profile\" block: calls, matches and time for every check pattern.",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="FILE",
+        help="Write a Chrome trace_event file (chrome://tracing, Perfetto) of the scan.",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Spill per-file results to disk and fail if traced memory exceeds MB.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson"),
+        default="json",
+        help="json: one indented document at the end (default). ndjson: one finding "
+             "per line as files finish, then a summary line.",
+    )
+    return parser
 
 
 def main():
-    """CLI entry point: python -m scan.scanner <repo_path>"""
-    if len(sys.argv) != 2:
-        print("Usage: python -m scan.scanner <repo_path>", file=sys.stderr)
+    """CLI entry point: python -m scan.scanner <repo_path> [options]"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m scan.scanner <repo_path> [--git-index] [--jobs N] "
+              "[--file-timeout SECONDS] [--scan-timeout SECONDS] [--cache-dir DIR] "
+              "[--since REF --baseline FILE] [--write-baseline FILE] [--profile] "
+              "[--profile-regex] [--trace FILE] [--max-memory MB] [--format json|ndjson]", file=sys.stderr)
         print("Example: python -m scan.scanner ./my-web-app", file=sys.stderr)
         sys.exit(1)
 
-    repo_path = sys.argv[1]
+    args = _build_parser().parse_args(sys.argv[1:])
+    writer = NdjsonWriter(sys.stdout) if args.format == "ndjson" else None
 
     try:
-        result = run_scan(repo_path)
-    except ValueError as e:
+        result = run_scan(
+            args.repo_path,
+            use_git_index=args.git_index,
+            jobs=args.jobs,
+            file_timeout=args.file_timeout,
+            scan_timeout=args.scan_timeout,
+            cache_dir=args.cache_dir,
+            cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            since=args.since,
+            baseline_path=args.baseline,
+            write_baseline_path=args.write_baseline,
+            profile=args.profile,
+            profile_regex=args.profile_regex,
+            trace_path=args.trace,
+            max_memory_bytes=int(args.max_memory * 1024 * 1024) if args.max_memory is not None else None,
+            on_file=writer.file_done if writer is not None else None,
+        )
+    except (ValueError, MemoryBudgetExceeded) as e:
         print(json.dumps({"error": str(e)}), file=sys.stderr)
         sys.exit(1)
 
+    if writer is not None:
+        writer.finish(result)
+        return
+
     # Output machine-readable JSON
     print(json.dumps(result, indent=2))
 
@@ -0,0 +1,282 @@
+"""
+tokenizer.py — One-pass tag tokenizer shared by all 6 category checks.
+
+Each document is tokenized once (cached on SourceDocument.tokens). Checks then
+"subscribe" to the tag names they care about via TokenStream.start_tags(...)
+instead of running their own battery of regexes over the full file text.
+
+This is deliberately as forgiving as the regexes it replaces:
+- A tag runs from "<name" to the next ">" (same as the old [^>]* patterns),
+  or to the start of the next tag if one opens first, so nested JSX such as
+  icon={<img />} is still seen and tags never overlap (linear time).
+- Tag names are matched case-insensitively (tag.name is lower-cased;
+  tag.raw_name keeps the source spelling, e.g. JSX <Button>).
+- Text is never parsed into a tree; text spans are the gaps between tags.
+
+Detection: still heuristics. NO AST parsing, NO DOM.
+"""
+
+import re
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Union
+
+TAG_OPEN_PATTERN = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9:._-]*)")
+
+# Attribute grammar: name="value" | name='value' | name={expr} | name=value | bare name
+ATTRIBUTE_NAME_PATTERN = re.compile(r"""([^\s=/>"'{}]+)(\s*=\s*)?""")
+ATTRIBUTE_VALUE_PATTERN = re.compile(r""""([^"]*)"|'([^']*)'|([^\s>"'{}]+)""")
+# Both in one pattern, for attribute text without JSX expressions
+ATTRIBUTE_PATTERN = re.compile(r"""([^\s=/>"'{}]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"'{}]+)))?""")
+# Characters that matter inside a JSX {expression}
+EXPRESSION_TOKEN_PATTERN = re.compile(r"[{}\"'`]")
+
+
+def _expression_end(text: str, start: int) -> int:
+    """Offset just past the "}" closing the "{" at start, or len(text) if unclosed.
+
+    Nested braces are balanced and string literals ("...", '...', `...`)
+    are skipped, so onClick={() => { go("}") }} is one value. Every
+    character is passed at most once.
+    """
+    depth = 0
+    pos = start
+    while True:
+        m = EXPRESSION_TOKEN_PATTERN.search(text, pos)
+        if m is None:
+            return len(text)
+        ch = m.group()
+        pos = m.end()
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return pos
+        else:
+            # Skip to the closing quote, past backslash escapes.
+            while True:
+                close = text.find(ch, pos)
+                if close == -1:
+                    return len(text)
+                pos = close + 1
+                backslashes = 0
+                while text[close - 1 - backslashes] == "\\":
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    break
+
+
+def parse_attributes(attrs: str) -> Dict[str, str]:
+    """Parse a tag's raw attribute text into a dict, in one left-to-right pass.
+
+    Names are lower-cased and the first occurrence wins. Bare (boolean)
+    attributes map to "". HTML values are unquoted; JSX {expr} values are
+    the expression text without the outer braces (balanced, so nested
+    objects and arrow functions stay whole). JSX spreads ({...props}) are
+    skipped.
+    """
+    parsed: Dict[str, str] = {}
+    if "{" not in attrs:
+        for m in ATTRIBUTE_PATTERN.finditer(attrs):
+            parsed.setdefault(m.group(1).lower(), m.group(m.lastindex) if m.lastindex > 1 else "")
+        return parsed
+    pos, end = 0, len(attrs)
+    while pos < end:
+        if attrs[pos] == "{":
+            pos = _expression_end(attrs, pos)
+            continue
+        m = ATTRIBUTE_NAME_PATTERN.match(attrs, pos)
+        if m is None:
+            pos += 1
+            continue
+        pos = m.end()
+        value = ""
+        if m.group(2) is not None:
+            if pos < end and attrs[pos] == "{":
+                close = _expression_end(attrs, pos)
+                value = attrs[pos + 1:close - 1 if attrs[close - 1] == "}" else close]
+                pos = close
+            else:
+                v = ATTRIBUTE_VALUE_PATTERN.match(attrs, pos)
+                if v is not None:
+                    value = next(g for g in v.groups() if g is not None)
+                    pos = v.end()
+        parsed.setdefault(m.group(1).lower(), value)
+    return parsed
+
+
+class Tag:
+    """A start tag (<name ...>) or end tag (</name>) in a document."""
+
+    __slots__ = ("name", "raw_name", "attrs", "start", "end", "is_end", "index", "_attributes")
+
+    def __init__(self, raw_name: str, attrs: str, start: int, end: int, is_end: bool, index: int):
+        self.raw_name = raw_name
+        self.name = raw_name.lower()
+        self.attrs = attrs          # raw attribute text between the name and ">"
+        self.start = start          # offset of "<"
+        self.end = end              # offset just past ">"
+        self.is_end = is_end
+        self.index = index          # position in TokenStream.tags
+        self._attributes = None
+
+    @property
+    def self_closing(self) -> bool:
+        return self.attrs.rstrip().endswith("/")
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """Attribute dict, parsed on first access. Names are lower-cased.
+
+        Bare (boolean) attributes map to "". JSX {expr} values are kept as
+        the expression text without braces. See parse_attributes().
+        """
+        if self._attributes is None:
+            self._attributes = parse_attributes(self.attrs)
+        return self._attributes
+
+    def get(self, name: str) -> Optional[str]:
+        return self.attributes.get(name)
+
+    def __repr__(self) -> str:
+        slash = "/" if self.is_end else ""
+        return f"<{slash}{self.raw_name}@{self.start}>"
+
+
+class TextSpan:
+    """Text between two tags (or before the first / after the last)."""
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+
+Token = Union[Tag, TextSpan]
+
+
+class TokenStream:
+    """All tags of one document, in order, indexed by name.
+
+    markup, when given, is a same-length copy of text with non-markup
+    blanked out (see preprocess.preprocess); tags are located in markup, while
+    tag attributes and text spans are still read from text.
+    """
+
+    __slots__ = ("text", "tags", "_start_index", "_end_index")
+
+    def __init__(self, text: str, markup: Optional[str] = None):
+        self.text = text
+        self.tags: List[Tag] = []
+        self._start_index: Dict[str, List[Tag]] = {}
+        self._end_index: Dict[str, List[Tag]] = {}
+        self._tokenize(text if markup is None else markup)
+
+    def _tokenize(self, markup: str) -> None:
+        text = self.text
+        search = TAG_OPEN_PATTERN.search
+        find = markup.find
+        tags = self.tags
+        gt = -1
+        m = search(markup)
+        while m is not None:
+            name_end = m.end()
+            if gt < name_end:
+                gt = find(">", name_end)
+                if gt == -1:
+                    gt = len(text)
+            following = search(markup, name_end)
+            # A tag ends at its ">" or, when another tag opens first (JSX like
+            # icon={<img />}, or a stray "<x" with no ">"), where that tag begins.
+            if following is not None and following.start() < gt:
+                end = attrs_end = following.start()
+            else:
+                attrs_end = gt
+                end = min(gt + 1, len(text))
+            is_end = m.group(1) == "/"
+            tag = Tag(m.group(2), text[name_end:attrs_end], m.start(), end, is_end, len(tags))
+            tags.append(tag)
+            index = self._end_index if is_end else self._start_index
+            index.setdefault(tag.name, []).append(tag)
+            m = following
+
+    def start_tags(self, *names: str) -> List[Tag]:
+        """Start tags with any of the given (lower-case) names, in document order."""
+        if len(names) == 1:
+            return self._start_index.get(names[0], [])
+        found = [self._start_index.get(n, []) for n in names]
+        return sorted(chain.from_iterable(found), key=lambda t: t.start)
+
+    def end_tags(self, name: str) -> List[Tag]:
+        """End tags </name>, in document order."""
+        return self._end_index.get(name, [])
+
+    def tags_named(self, *names: str) -> List[Tag]:
+        """Start and end tags with any of the given names, in document order."""
+        found = [self._start_index.get(n, []) for n in names] + [self._end_index.get(n, []) for n in names]
+        return sorted(chain.from_iterable(found), key=lambda t: t.index)
+
+    def first_end_tag(self, name: str, offset: int) -> Optional[Tag]:
+        """First </name> starting at or after offset (binary search, no rescans)."""
+        ends = self._end_index.get(name)
+        if not ends:
+            return None
+        i = bisect_left(ends, offset, key=lambda t: t.start)
+        return ends[i] if i < len(ends) else None
+
+    def count(self, *names: str) -> int:
+        return sum(len(self._start_index.get(n, ())) for n in names)
+
+    def has(self, name: str) -> bool:
+        return name in self._start_index
+
+    def next_tag(self, tag: Tag) -> Optional[Tag]:
+        i = tag.index + 1
+        return self.tags[i] if i < len(self.tags) else None
+
+    def text_after(self, tag: Tag) -> str:
+        """Raw text between this tag and the next tag."""
+        following = self.next_tag(tag)
+        return self.text[tag.end:following.start if following else len(self.text)]
+
+    def tokens(self) -> Iterator[Token]:
+        """Full stream: tags interleaved with the text spans between them."""
+        pos = 0
+        for tag in self.tags:
+            if tag.start > pos:
+                yield TextSpan(pos, tag.start)
+            yield tag
+            pos = tag.end
+        if pos < len(self.text):
+            yield TextSpan(pos, len(self.text))
+
+
+def strip_tags(fragment: str) -> str:
+    """Remove <...> tags from a fragment, keeping the text between them.
+
+    Same result as re.sub(r"<[^>]+>", "", fragment), but one forward pass:
+    that regex rescans to the end of the input for every "<" that has no
+    closing ">", which is quadratic on inputs like "<<<<...".
+    """
+    out = []
+    pos = 0
+    find = fragment.find
+    while True:
+        lt = find("<", pos)
+        if lt == -1:
+            break
+        gt = find(">", lt + 1)
+        if gt == -1:
+            # No ">" anywhere after this point, so nothing else is a tag.
+            break
+        if gt == lt + 1:
+            # "<>" is not a tag; keep the "<" and continue after it.
+            out.append(fragment[pos:lt + 1])
+            pos = lt + 1
+            continue
+        out.append(fragment[pos:lt])
+        pos = gt + 1
+    out.append(fragment[pos:])
+    return "".join(out)
@@ -0,0 +1,227 @@
+"""
+watchdog.py — Time budgets for the per-file check step.
+
+Checks run in worker processes that the scan can abandon. Each worker gets
+its own pipe and handles one file at a time, so when a file overruns its
+budget the parent terminates just that worker (and starts a fresh one on
+demand) without touching any other in-flight work.
+
+Two budgets:
+- file_timeout: wall-clock seconds one file may spend in the checks.
+- scan_timeout: wall-clock seconds for the whole scan, counted from pool
+  creation. When it runs out, every unfinished file is abandoned.
+
+Abandoned files are reported by the caller as skipped with reason "timeout",
+or "worker_crashed" when their worker died mid-task (killed by the OS,
+out of memory, a crash in native code), and never reach scoring.
+"""
+
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+TIMEOUT_REASON = "timeout"
+CRASH_REASON = "worker_crashed"
+# Skip reasons for files whose checks never finished
+UNFINISHED_REASONS = (TIMEOUT_REASON, CRASH_REASON)
+
+# Upper bound on one wait() so budgets are re-checked promptly.
+_POLL_INTERVAL = 0.05
+
+
+def _serve(conn: Connection, target: Callable) -> None:
+    """Worker loop: run target(*args) for each task until told to stop."""
+    # Ready signal: start-up time (interpreter spawn, imports) is not
+    # charged to the first file's budget.
+    conn.send(None)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        task_id, args = task
+        try:
+            conn.send((task_id, True, target(*args)))
+        except Exception as e:  # re-raised in the parent
+            conn.send((task_id, False, e))
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "ready", "task_id", "started")
+
+    def __init__(self, process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task_id: Optional[int] = None
+        self.started = 0.0
+
+    def stop(self, kill: bool) -> None:
+        if kill:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class WatchdogPool:
+    """Runs target(*args) per task in killable worker processes, within budgets."""
+
+    def __init__(
+        self,
+        target: Callable,
+        workers: int = 1,
+        file_timeout: Optional[float] = None,
+        scan_timeout: Optional[float] = None,
+    ):
+        self._target = target
+        self._max_workers = max(1, workers)
+        self._file_timeout = file_timeout
+        self._deadline = time.monotonic() + scan_timeout if scan_timeout is not None else None
+        # spawn: workers never inherit the discovery thread's state.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._pending: Deque[Tuple[int, tuple]] = deque()
+        self._results: Dict[int, object] = {}
+        self._abandoned: Dict[int, str] = {}  # task id -> skip reason
+        self._next_id = 0
+
+    # --- public API ---
+
+    def submit(self, *args) -> int:
+        """Queue one task; returns its id. Starts it right away if a worker is free."""
+        task_id = self._next_id
+        self._next_id += 1
+        if self._out_of_time():
+            self._abandoned[task_id] = TIMEOUT_REASON
+            return task_id
+        self._pending.append((task_id, args))
+        self._poll(0)
+        return task_id
+
+    def finished(self, task_id: int) -> bool:
+        """Whether a task has a result or was abandoned. Never waits.
+
+        Raises the exception of any task whose check failed with an error.
+        """
+        if task_id not in self._results and task_id not in self._abandoned:
+            self._poll(0)
+        return task_id in self._results or task_id in self._abandoned
+
+    def take(self, task_id: int) -> Tuple[object, Optional[str]]:
+        """A finished task's (result, None), or (None, skip reason) if it was abandoned.
+
+        The result is handed over, not kept by the pool.
+        """
+        if task_id in self._abandoned:
+            return None, self._abandoned[task_id]
+        return self._results.pop(task_id), None
+
+    def collect(self, task_ids: Iterable[int]) -> Tuple[Dict[int, object], Dict[int, str]]:
+        """Wait for the given tasks and return (results by id, skip reason by abandoned id).
+
+        Queued tasks that are not requested are dropped without running.
+        Raises the task's exception if a check failed with an error.
+        """
+        wanted = set(task_ids)
+        self._pending = deque(task for task in self._pending if task[0] in wanted)
+        while not wanted <= (self._results.keys() | self._abandoned.keys()):
+            self._poll(_POLL_INTERVAL)
+        return (
+            {task_id: self._results[task_id] for task_id in wanted if task_id in self._results},
+            {task_id: self._abandoned[task_id] for task_id in wanted if task_id in self._abandoned},
+        )
+
+    def close(self) -> None:
+        """Stop all workers (idle ones politely, busy or starting ones by force)."""
+        for worker in self._workers:
+            worker.stop(kill=worker.task_id is not None or not worker.ready)
+        self._workers.clear()
+
+    def __enter__(self) -> "WatchdogPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- internals ---
+
+    def _out_of_time(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_serve, args=(child_conn, self._target), name="hermes-check", daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, reason: str = TIMEOUT_REASON) -> None:
+        """Abandon a worker: kill it and record reason for its task (if any)."""
+        if worker.task_id is not None:
+            self._abandoned[worker.task_id] = reason
+        worker.stop(kill=True)
+        self._workers.remove(worker)
+
+    def _dispatch(self) -> None:
+        idle = [w for w in self._workers if w.ready and w.task_id is None]
+        starting = sum(1 for w in self._workers if not w.ready)
+        # Start enough workers for the queue; tasks go out once they report ready.
+        while len(self._workers) < self._max_workers and starting < len(self._pending) - len(idle):
+            self._spawn()
+            starting += 1
+        while self._pending and idle:
+            worker = idle.pop()
+            task_id, args = self._pending.popleft()
+            worker.task_id = task_id
+            worker.started = time.monotonic()
+            worker.conn.send((task_id, args))
+
+    def _poll(self, timeout: float) -> None:
+        """Start queued work, take finished results, and enforce both budgets."""
+        self._dispatch()
+        active = {w.conn: w for w in self._workers if w.task_id is not None or not w.ready}
+        if active:
+            for conn in wait(list(active), timeout):
+                worker = active[conn]
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    if not worker.ready:
+                        raise RuntimeError("check worker process exited during start-up")
+                    # Worker died mid-task (e.g. killed by the OS): abandon its task.
+                    self._retire(worker, CRASH_REASON)
+                    continue
+                if message is None:
+                    worker.ready = True
+                    continue
+                task_id, ok, value = message
+                worker.task_id = None
+                if not ok:
+                    raise value
+                self._results[task_id] = value
+
+        now = time.monotonic()
+        if self._out_of_time():
+            for worker in list(self._workers):
+                self._retire(worker)
+            self._abandoned.update((task_id, TIMEOUT_REASON) for task_id, _ in self._pending)
+            self._pending.clear()
+            return
+        if self._file_timeout is not None:
+            for worker in [w for w in self._workers if w.task_id is not None]:
+                if now - worker.started >= self._file_timeout:
+                    self._retire(worker)
+        self._dispatch()
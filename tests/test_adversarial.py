@@ -0,0 +1,32 @@
+"""Linear-growth regression tests on the adversarial corpus (benchmarks.adversarial_corpus)"""
+
+import pytest
+
+from benchmarks.adversarial_corpus import CASES, MAX_GROWTH_RATIO, build, growth, write_corpus
+from scan.checks import map_document
+from scan.document import load_document
+
+# Smaller than the CLI default to keep the suite fast; quadratic code still
+# shows up as ~64x between the two sizes.
+BASE_BYTES = 25_000
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_every_stage_grows_at_most_linearly(case):
+    rows = growth(case, base_bytes=BASE_BYTES, repeats=2)
+    slow = [r for r in rows if r["ratio"] is not None and r["ratio"] > MAX_GROWTH_RATIO]
+    assert not slow, f"super-linear growth: {slow}"
+
+
+def test_corpus_files_scan_cleanly(tmp_path):
+    paths = write_corpus(tmp_path, target_bytes=2_000)
+
+    assert len(paths) == len(CASES)
+    for path in paths:
+        partials = map_document(load_document(path))
+        assert set(partials) >= {"semantic_html", "aria"}
+
+
+def test_build_scales_to_target_size():
+    for case in CASES:
+        assert 5_000 <= len(build(case, 10_000)) <= 12_000
@@ -0,0 +1,74 @@
+"""Tests for benchmarks.gate"""
+
+import json
+
+from benchmarks.gate import BASELINE_VERSION, best_of, compare, format_report, main, METRICS
+from benchmarks.run_benchmarks import p95
+
+TOLERANCES = {metric: default for metric, (_, default) in METRICS.items()}
+
+
+def _row(benchmark="run_scan", size=100, fps=1000.0, p95_ms=1.0, rss=30.0):
+    return {"size": size, "benchmark": benchmark, "files_per_sec": fps, "p95_file_ms": p95_ms, "peak_rss_mb": rss}
+
+
+def test_p95_nearest_rank():
+    assert p95([]) is None
+    assert p95([3.0]) == 3.0
+    assert p95([float(i) for i in range(1, 101)]) == 95.0
+
+
+def test_best_of_keeps_best_value_per_metric():
+    best = best_of([[_row(fps=900, p95_ms=1.2, rss=31)], [_row(fps=1000, p95_ms=1.5, rss=30)]])
+    assert best["100:run_scan"]["files_per_sec"] == 1000
+    assert best["100:run_scan"]["p95_file_ms"] == 1.2
+    assert best["100:run_scan"]["peak_rss_mb"] == 30
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = best_of([[_row(), _row("checks:aria")]])
+    current = best_of([[_row(fps=650), _row("checks:aria", fps=1500, p95_ms=1.4, rss=37)]])
+    entries = {(e["scenario"], e["metric"]): e for e in compare(baseline, current, TOLERANCES)}
+
+    assert entries[("100:run_scan", "files_per_sec")]["regressed"]  # -35% vs 30% allowed
+    assert not entries[("100:checks:aria", "files_per_sec")]["regressed"]  # faster is fine
+    assert not entries[("100:checks:aria", "p95_file_ms")]["regressed"]  # +40% vs 50% allowed
+    assert entries[("100:checks:aria", "peak_rss_mb")]["regressed"]  # +23% vs 20% allowed
+
+    report = format_report(list(entries.values()), ["1000:run_scan"], TOLERANCES)
+    assert "REGRESSED" in report and "2 regression(s)" in report
+    assert "1000:run_scan" in report
+
+
+def test_tiny_p95_values_are_not_gated():
+    baseline = best_of([[_row(p95_ms=0.01)]])
+    current = best_of([[_row(p95_ms=0.03)]])
+    (entry,) = [e for e in compare(baseline, current, TOLERANCES) if e["metric"] == "p95_file_ms"]
+    assert not entry["regressed"]
+
+
+def test_main_stores_then_compares(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--baseline", str(baseline), "--sizes", "20", "--benchmarks", "checks",
+            "--repeat", "1", "--workdir", str(tmp_path / "repos")]
+
+    assert main(args) == 0
+    stored = json.loads(baseline.read_text())
+    assert stored["baseline_version"] == BASELINE_VERSION
+    assert "20:checks:aria" in stored["scenarios"]
+
+    # Generous tolerances: this only checks the comparison path runs end to end.
+    loose = ["--tolerance", "files_per_sec=0.99", "--tolerance", "p95_file_ms=100", "--tolerance", "peak_rss_mb=1"]
+    assert main(args + loose) == 0
+    assert "No regressions" in capsys.readouterr().out
+
+
+def test_main_rejects_unknown_metric(tmp_path):
+    assert main(["--baseline", str(tmp_path / "b.json"), "--tolerance", "speed=0.1"]) == 2
+
+
+def test_main_require_baseline_does_not_record_one(tmp_path, capsys):
+    baseline = tmp_path / "b.json"
+    assert main(["--baseline", str(baseline), "--require-baseline"]) == 2
+    assert not baseline.exists()
+    assert "--update" in capsys.readouterr().err
@@ -0,0 +1,62 @@
+"""Tests for benchmarks.synthetic_repo and benchmarks.run_benchmarks"""
+
+import pytest
+
+from benchmarks.run_benchmarks import run_benchmark
+from benchmarks.synthetic_repo import MARKER_FILE, generate
+from scan.checks import CHECKS
+from scan.file_finder import iter_source_files
+
+
+def _tree(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_generate_is_deterministic(tmp_path):
+    first = generate(tmp_path / "a", 60, seed=3)
+    second = generate(tmp_path / "b", 60, seed=3)
+
+    assert first == second
+    assert _tree(tmp_path / "a") == _tree(tmp_path / "b")
+
+    generate(tmp_path / "c", 60, seed=4)
+    assert _tree(tmp_path / "a") != _tree(tmp_path / "c")
+
+
+def test_generated_noise_is_not_scanned(tmp_path):
+    repo = generate(tmp_path / "repo", 200)
+    found = list(iter_source_files(str(tmp_path / "repo")))
+
+    assert repo["pages"] == 200 and repo["noise"] > 0 and repo["ignored"] > 0
+    assert len(found) == repo["pages"]
+    assert sum(1 for item in found if item.skip_reason is not None) == repo["oversized"]
+    assert {p.suffix for p in (tmp_path / "repo").rglob("page_*")} == {".html", ".jsx", ".tsx"}
+
+
+def test_generate_refuses_foreign_directory(tmp_path):
+    (tmp_path / "keep.txt").write_text("mine")
+    with pytest.raises(ValueError):
+        generate(tmp_path, 10)
+
+
+def test_regenerates_when_size_changes(tmp_path):
+    generate(tmp_path / "repo", 20)
+    repo = generate(tmp_path / "repo", 30)
+    assert repo["size"] == 30
+    assert (tmp_path / "repo" / MARKER_FILE).is_file()
+    assert len(list(iter_source_files(str(tmp_path / "repo")))) == 30
+
+
+def test_run_benchmark_rows(tmp_path):
+    generate(tmp_path / "repo", 30)
+    rows = run_benchmark("checks", str(tmp_path / "repo"))
+
+    assert [r["benchmark"] for r in rows] == [
+        "checks:read", "checks:tokenize", *(f"checks:{name}" for name in CHECKS), "checks:all",
+    ]
+    assert all(r["files"] == rows[0]["files"] > 0 for r in rows)
+    assert rows[-1]["files_per_sec"] > 0
+
+    (scan_row,) = run_benchmark("run_scan", str(tmp_path / "repo"))
+    assert scan_row["files"] == rows[0]["files"]
+    assert scan_row["bytes"] == rows[0]["bytes"]
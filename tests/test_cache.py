@@ -0,0 +1,141 @@
+"""Tests for scan.cache"""
+
+import shutil
+from pathlib import Path
+
+from scan import cache as cache_module, watchdog
+from scan.cache import ResultCache, content_key, engine_fingerprint
+from scan.checks import map_path
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+PARTIALS = {"aria": {"findings": [], "images": 2}, "structured_data": None}
+
+
+def test_put_then_get_across_instances(tmp_path):
+    key = content_key(b"<main></main>")
+    with ResultCache(str(tmp_path)) as cache:
+        assert cache.get(key, "page.html") is None
+        cache.put(key, "page.html", PARTIALS)
+
+    with ResultCache(str(tmp_path)) as cache:
+        assert cache.get(key, "page.html") == PARTIALS
+        assert cache.get(key, "other.html") is None  # findings embed the file name
+        assert cache.stats() == {"hits": 1, "misses": 1, "evicted": 0}
+
+
+def test_content_key_prefers_blob_sha():
+    assert content_key(blob_sha="abc123") == "git:abc123"
+    assert content_key(b"x").startswith("sha256:")
+    assert content_key(b"x") != content_key(b"y")
+
+
+def test_engine_change_misses_but_keeps_other_entries(tmp_path):
+    key = content_key(b"x")
+    with ResultCache(str(tmp_path), engine="old") as cache:
+        cache.put(key, "a.html", PARTIALS)
+
+    with ResultCache(str(tmp_path), engine="new") as cache:
+        assert cache.get(key, "a.html") is None
+        assert cache.evicted == 0
+    # e.g. two branches with different check code sharing one CI cache
+    with ResultCache(str(tmp_path), engine="old") as cache:
+        assert cache.get(key, "a.html") == PARTIALS
+
+    assert len(engine_fingerprint()) == 16
+
+
+def test_entries_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "WRITE_BATCH", 2)
+    keys = [content_key(bytes([i])) for i in range(3)]
+    with ResultCache(str(tmp_path)) as cache:
+        for key in keys:
+            cache.put(key, "a.html", PARTIALS)
+        # The first batch is on disk before close(); the rest is still queued.
+        with ResultCache(str(tmp_path)) as reader:
+            assert [reader.get(key, "a.html") is not None for key in keys] == [True, True, False]
+        assert len(cache._new) == 1
+
+    with ResultCache(str(tmp_path)) as cache:
+        assert all(cache.get(key, "a.html") == PARTIALS for key in keys)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    keys = [content_key(bytes([i])) for i in range(3)]
+    entry_size = len('{"aria":{"findings":[],"images":2},"structured_data":null}')
+
+    with ResultCache(str(tmp_path), max_bytes=10 * entry_size) as cache:
+        for key in keys:
+            cache.put(key, "a.html", PARTIALS)
+    # Touch the oldest entry so it becomes most recently used.
+    with ResultCache(str(tmp_path), max_bytes=10 * entry_size) as cache:
+        assert cache.get(keys[0], "a.html") is not None
+
+    # Shrink the cap to two entries: the least recently used one goes.
+    with ResultCache(str(tmp_path), max_bytes=2 * entry_size) as cache:
+        cache.put(content_key(b"new"), "a.html", PARTIALS)
+    with ResultCache(str(tmp_path), max_bytes=2 * entry_size) as cache:
+        assert cache.get(keys[0], "a.html") is not None
+        assert cache.get(content_key(b"new"), "a.html") is not None
+        assert cache.get(keys[1], "a.html") is None
+        assert cache.get(keys[2], "a.html") is None
+
+
+def test_run_scan_with_cache_matches_uncached(tmp_path):
+    repo = tmp_path / "repo"
+    shutil.copytree(FIXTURES, repo)
+    cache_dir = str(tmp_path / "cache")
+    file_count = len(list(repo.iterdir()))
+
+    plain = run_scan(str(repo))
+    first = run_scan(str(repo), cache_dir=cache_dir)
+    second = run_scan(str(repo), cache_dir=cache_dir)
+
+    assert first["cache"] == {"hits": 0, "misses": file_count, "evicted": 0}
+    assert second["cache"] == {"hits": file_count, "misses": 0, "evicted": 0}
+    assert "cache" not in plain
+    for key in ("total_score", "categories", "files_scanned", "breakdown"):
+        assert first[key] == plain[key]
+        assert second[key] == plain[key]
+
+
+def test_run_scan_rechecks_modified_file(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    page = repo / "index.html"
+    page.write_text("<html><body><main><h1>Hi</h1></main></body></html>")
+    cache_dir = str(tmp_path / "cache")
+    run_scan(str(repo), cache_dir=cache_dir)
+
+    page.write_text("<html><body><div onClick='x'>Hi</div></body></html>")
+    result = run_scan(str(repo), cache_dir=cache_dir)
+
+    assert result["cache"]["misses"] == 1
+    assert result["categories"] == run_scan(str(repo))["categories"]
+
+
+def test_cache_miss_sends_read_bytes_to_worker(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    shutil.copytree(FIXTURES, repo)
+    submitted = []
+    original_submit = watchdog.WatchdogPool.submit
+
+    def recording_submit(self, *args):
+        submitted.append(args)
+        return original_submit(self, *args)
+
+    monkeypatch.setattr(watchdog.WatchdogPool, "submit", recording_submit)
+    result = run_scan(str(repo), cache_dir=str(tmp_path / "cache"), file_timeout=30)
+
+    assert len(submitted) == result["file_count"]
+    for path, _, _, raw in submitted:
+        # The worker maps the bytes the cache key was computed from, not a second read.
+        assert raw == Path(path).read_bytes()
+
+
+def test_map_path_uses_given_bytes(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<main></main>")
+    partials = map_path(str(page), str(tmp_path), None, b"<nav><a href='/'>Home</a></nav>")
+    assert partials["semantic_html"]["has_nav"]
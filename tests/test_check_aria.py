@@ -1,5 +1,6 @@
 """Tests for scan.check_aria"""
 
+import time
 from pathlib import Path
 import pytest
 from scan.check_aria import check_aria
@@ -49,3 +50,45 @@ def test_findings_have_required_keys():
         assert "check" in finding
         assert "passed" in finding
         assert "detail" in finding
+
+
+def test_unclosed_icon_buttons_stay_linear(tmp_path):
+    """Unclosed icon buttons/div handlers must not trigger rescans to end of file."""
+    f = tmp_path / "icons.html"
+    f.write_text(
+        '<button aria-label="Close"><svg></svg></button>'
+        + "<button><svg>" * 10000
+        + "<div onClick={go}><img alt=''>" * 10000
+    )
+    start = time.perf_counter()
+    result = check_aria([f])
+    assert time.perf_counter() - start < 5
+
+    # Only the first (closed, labeled) button counts as an icon button.
+    assert not [x for x in result["findings"] if x["check"] == "icon_button_label" and not x["passed"]]
+
+
+def test_jsx_expression_attributes_count(tmp_path):
+    """alt={...}, role={...} and aria-label={...} are present attributes."""
+    f = tmp_path / "widget.jsx"
+    f.write_text(
+        '<img src={src} alt={photo.caption} />\n'
+        '<div onClick={toggle} role={role}>x</div>\n'
+        "<button aria-label={t('close')}><svg /></button>\n"
+    )
+    result = check_aria([f])
+    assert not [x for x in result["findings"] if not x["passed"]
+                and x["check"] in ("image_alt_text", "custom_widget_role", "icon_button_label")]
+
+
+def test_commented_out_and_scripted_images_ignored(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text(
+        '<!-- <img src="old.png"> -->\n'
+        '<script>el.innerHTML = "<img src=x>";</script>\n'
+        '<img src="logo.png" alt="Logo">\n'
+    )
+    result = check_aria([page])
+
+    alt = next(f for f in result["findings"] if f["check"] == "image_alt_text")
+    assert alt["passed"]
@@ -1,5 +1,6 @@
 """Tests for scan.check_content_in_html"""
 
+import time
 from pathlib import Path
 import pytest
 from scan.check_content_in_html import check_content_in_html
@@ -49,3 +50,20 @@ def test_advisory_findings_are_labeled():
 
     advisory = [f for f in result["findings"] if "ADVISORY" in f.get("detail", "")]
     assert len(advisory) > 0  # Should have at least one advisory finding
+
+
+def test_unclosed_body_and_scripts_stay_linear(tmp_path):
+    """Repeated <body>/<script> without closing tags must not make shell detection quadratic."""
+    f = tmp_path / "index.html"
+    f.write_text(
+        '<html><body><div id="root"></div>'
+        + "<script>" * 10000
+        + "<body>" * 10000
+        + "<" * 20000
+        + "</body></html>"
+    )
+    start = time.perf_counter()
+    result = check_content_in_html([f])
+    assert time.perf_counter() - start < 5
+
+    assert result["category"] == "content_in_html"
@@ -1,8 +1,10 @@
 """Tests for scan.check_form_accessibility"""
 
+import time
 from pathlib import Path
 import pytest
-from scan.check_form_accessibility import check_form_accessibility
+from scan.check_form_accessibility import check_form_accessibility, scan_file
+from scan.document import load_document
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -87,3 +89,71 @@ def test_no_cross_file_wrapped_label(tmp_path):
     label_finding = [f for f in result["findings"] if f["check"] == "input_labels"]
     # The input in file B has no label — should NOT be counted as labeled
     assert any(not f["passed"] for f in label_finding), "Cross-file label match should not happen"
+
+
+def test_unclosed_labels_stay_linear(tmp_path):
+    """Thousands of unclosed <label> tags must not make wrap detection quadratic."""
+    f = tmp_path / "labels.html"
+    f.write_text(
+        '<form><label>Email <input type="email" name="email"></label></form>'
+        + "<label>" * 20000
+        + '<input type="text" name="x">'
+    )
+    start = time.perf_counter()
+    result = check_form_accessibility([f])
+    assert time.perf_counter() - start < 5
+
+    # Only the first label is closed: 1 of the 2 inputs is wrapped.
+    label_findings = [x for x in result["findings"] if x["check"] == "input_labels"]
+    assert any(x["detail"].startswith("1 of 2 inputs") for x in label_findings)
+
+
+def test_attribute_names_not_matched_inside_values(tmp_path):
+    """placeholder="Enter name" is not a name attribute."""
+    f = tmp_path / "form.html"
+    f.write_text('<form><input type="text" id="q" placeholder="Enter name"><button>Go</button></form>')
+    result = check_form_accessibility([f])
+    names = [x for x in result["findings"] if x["check"] == "input_names"]
+    assert names and not names[0]["passed"]
+
+
+def test_labels_resolved_per_input(tmp_path):
+    """Wrapping and for/id labels credit only the inputs they belong to."""
+    f = tmp_path / "form.html"
+    f.write_text(
+        '<form>\n'
+        '  <label>Email <input type="email" id="email" name="email"></label>\n'
+        '  <label for="email">Email again</label>\n'  # already wrapped: no extra credit
+        '  <input type="text" id="city" name="city">\n'
+        '  <input type="text" id="zip" name="zip">\n'
+        '  <label for="zip">Zip</label>\n'  # label after its input
+        '  <button type="submit">Go</button>\n'
+        '</form>\n'
+    )
+    partial = scan_file(load_document(f))
+    assert (partial["inputs"], partial["labeled"]) == (3, 2)
+
+
+def test_submit_checked_per_form(tmp_path):
+    f = tmp_path / "forms.html"
+    f.write_text(
+        '<form><input type="search" name="q" aria-label="Search"><button>Go</button></form>\n'
+        '<form><input type="email" name="email" aria-label="Email" required>'
+        '<button type="button">Subscribe</button></form>\n'
+    )
+    result = check_form_accessibility([f])
+    submit = [x for x in result["findings"] if x["check"] == "submit_button"]
+    assert len(submit) == 1 and not submit[0]["passed"]
+    assert submit[0]["detail"].startswith("1 of 2 forms")
+
+
+def test_required_checked_per_form(tmp_path):
+    f = tmp_path / "forms.html"
+    f.write_text(
+        '<form><input type="email" name="email" aria-label="Email" required><button>Go</button></form>\n'
+        '<form><input type="text" name="q" aria-label="Search"><button>Search</button></form>\n'
+    )
+    result = check_form_accessibility([f])
+    required = [x for x in result["findings"] if x["check"] == "required_fields"]
+    assert len(required) == 1 and not required[0]["passed"]
+    assert required[0]["detail"].startswith("1 of 2 forms")
@@ -1,5 +1,6 @@
 """Tests for scan.check_link_navigation"""
 
+import time
 from pathlib import Path
 import pytest
 from scan.check_link_navigation import check_link_navigation
@@ -91,3 +92,20 @@ def test_substring_generic_link_text(tmp_path):
         if f["check"] == "descriptive_link_text" and not f["passed"] and "file" in f
     ]
     assert len(generic_per_file) == 2, "Should catch 'Click Here for...' and 'Learn More About...'"
+
+
+def test_unclosed_anchors_and_navs_stay_linear(tmp_path):
+    """Unclosed <a>/<nav> tags and stray "<" must not make matching quadratic."""
+    f = tmp_path / "links.html"
+    f.write_text(
+        '<a href="/docs">Read the documentation</a>'
+        + "<nav><a>" * 10000
+        + "<" * 20000
+    )
+    start = time.perf_counter()
+    result = check_link_navigation([f])
+    assert time.perf_counter() - start < 5
+
+    # The unclosed anchors never form <a>...</a> pairs, so only one link counts.
+    assert result["total"] > 0
+    assert not [x for x in result["findings"] if x["check"] == "link_has_href" and not x["passed"]]
@@ -50,3 +50,12 @@ def test_findings_have_required_keys():
         assert "check" in finding
         assert "passed" in finding
         assert "detail" in finding
+
+
+def test_jsonld_inside_comment_not_counted(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text('<!-- <script type="application/ld+json">{"@type": "Product"}</script> -->')
+    result = check_structured_data([page])
+
+    jsonld = next(f for f in result["findings"] if f["check"] == "schema_jsonld")
+    assert not jsonld["passed"]
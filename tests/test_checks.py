@@ -0,0 +1,52 @@
+"""Tests for scan.checks (per-file map + merge registry)"""
+
+import json
+from pathlib import Path
+
+import pytest
+from scan.checks import CHECKS, map_document, map_path
+from scan.document import load_document
+from scan.findings import to_json
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FIXTURE_FILES = sorted(FIXTURES.iterdir())
+
+
+def test_registry_covers_all_six_categories():
+    assert list(CHECKS) == [
+        "semantic_html",
+        "form_accessibility",
+        "aria",
+        "structured_data",
+        "content_in_html",
+        "link_navigation",
+    ]
+
+
+@pytest.mark.parametrize("name", list(CHECKS))
+def test_map_merge_matches_check_function(name):
+    module = CHECKS[name]
+    check = getattr(module, f"check_{name}")
+    docs = [load_document(f) for f in FIXTURE_FILES]
+    assert module.merge_results(module.scan_file(d) for d in docs) == check(FIXTURE_FILES)
+
+
+def test_partials_are_json_serializable():
+    for f in FIXTURE_FILES:
+        partials = map_document(load_document(f))
+        assert json.loads(json.dumps(partials, default=to_json)) == partials
+
+
+def test_html_only_categories_skip_jsx():
+    partials = map_path(str(FIXTURES / "good_react_component.jsx"))
+    assert partials["structured_data"] is None
+    assert partials["content_in_html"] is None
+
+
+def test_parallel_scan_is_identical_to_serial():
+    serial = run_scan(str(FIXTURES), jobs=1)
+    parallel = run_scan(str(FIXTURES), jobs=2)
+    serial.pop("scan_date")
+    parallel.pop("scan_date")
+    assert json.dumps(parallel, indent=2, default=to_json) == json.dumps(serial, indent=2, default=to_json)
@@ -0,0 +1,107 @@
+"""Tests for scan.components"""
+
+from pathlib import Path
+
+from scan.components import ComponentGraph, scan_file
+from scan.document import load_document
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _write(root: Path, files: dict) -> None:
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def _graph(root: Path, names) -> ComponentGraph:
+    return ComponentGraph(list(names), [scan_file(load_document(root / n, root)) for n in names])
+
+
+LIBRARY = {
+    "ui/Button.jsx": (
+        "export default function Button({ children, ...props }) {\n"
+        "  return (\n    <button type=\"button\" {...props}>{children}</button>\n  );\n}\n"
+    ),
+    "ui/index.tsx": (
+        "import Button from './Button';\n"
+        "export const IconButton = ({ label, ...rest }: Props) => <Button aria-label={label} {...rest} />;\n"
+        "export function NavLink({ to, children }) {\n"
+        "  const [open] = useState<boolean>(false);\n"
+        "  return <a href={to}>{children}</a>;\n}\n"
+    ),
+}
+
+
+def test_scan_file_extracts_imports_definitions_and_uses(tmp_path):
+    _write(tmp_path, LIBRARY)
+    partial = scan_file(load_document(tmp_path / "ui/index.tsx", tmp_path))
+
+    assert partial["imports"] == {"Button": ["./Button", "default"]}
+    assert partial["defines"]["NavLink"]["renders"] == "a"
+    assert partial["defines"]["IconButton"]["renders"] == "Button"
+    assert partial["uses"] == {"Button": 1}
+    assert scan_file(load_document(FIXTURES / "good_semantic.html")) is None
+
+
+def test_root_is_the_components_own_return_not_a_callback(tmp_path):
+    _write(tmp_path, {"Menu.jsx": (
+        "export function Menu({ items }) {\n"
+        "  const rows = items.map(item => <li key={item.id}>{item.label}</li>);\n"
+        "  function Empty() { return <p>None</p>; }\n"
+        "  if (!items.length) return <Spinner />;\n"
+        "  return (\n    <nav aria-label=\"Main\"><ul>{rows}</ul></nav>\n  );\n}\n"
+    )})
+    menu = scan_file(load_document(tmp_path / "Menu.jsx", tmp_path))["defines"]["Menu"]
+
+    assert (menu["renders"], menu["aria_label"]) == ("nav", True)
+
+
+def test_resolves_through_imports_and_nested_components(tmp_path):
+    _write(tmp_path, {**LIBRARY, "pages/Home.jsx": (
+        "import { IconButton, NavLink as Link } from '../ui';\n"
+        "import { Dialog } from '@headlessui/react';\n"
+        "export default function Home() {\n"
+        "  return <main><Link to='/'>Home</Link><IconButton label='Close' /><Dialog /></main>;\n}\n"
+    )})
+    report = _graph(tmp_path, ["pages/Home.jsx", "ui/Button.jsx", "ui/index.tsx"]).report()
+    by_name = {c["component"]: c for c in report["resolved"]}
+
+    assert by_name["NavLink"]["renders"] == "a" and by_name["NavLink"]["file"] == "ui/index.tsx"
+    icon = by_name["IconButton"]
+    assert (icon["renders"], icon["via"], icon["aria_label"], icon["interactive"]) == ("button", ["Button"], True, True)
+    assert report["unresolved"] == {"Dialog": 1}
+
+
+def test_summary_computed_once_per_component(tmp_path):
+    pages = {
+        f"pages/P{i}.jsx": "import Button from '../ui/Button';\n"
+        + "export default function P() { return <div>" + "<Button>x</Button>" * 50 + "</div>; }\n"
+        for i in range(20)
+    }
+    _write(tmp_path, {**LIBRARY, **pages})
+    graph = _graph(tmp_path, ["ui/Button.jsx", *pages])
+    report = graph.report()
+
+    assert graph.computed == 1  # Button only; the pages themselves are never used
+    assert [c["usages"] for c in report["resolved"] if c["component"] == "Button"] == [1000]
+
+
+def test_import_cycles_terminate(tmp_path):
+    _write(tmp_path, {
+        "A.jsx": "import B from './B';\nexport default function A() { return <B />; }\n",
+        "B.jsx": "import A from './A';\nexport default function B() { return <A />; }\n",
+    })
+    report = _graph(tmp_path, ["A.jsx", "B.jsx"]).report()
+    assert {c["component"] for c in report["resolved"]} == {"A", "B"}
+
+
+def test_run_scan_components_block(tmp_path):
+    _write(tmp_path, {**LIBRARY, "src/App.jsx": (
+        "import Button from '../ui/Button';\nexport default function App() { return <Button>Go</Button>; }\n"
+    )})
+    result = run_scan(str(tmp_path))
+    assert [c["component"] for c in result["components"]["resolved"]] == ["Button"]
+    assert "components" not in run_scan(str(FIXTURES))
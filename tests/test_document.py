@@ -0,0 +1,68 @@
+"""Tests for scan.document"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+from scan.document import SourceDocument, as_documents, load_document, load_documents
+from scan.check_aria import check_aria
+from scan.check_semantic_html import check_semantic_html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_load_document_fields(tmp_path):
+    (tmp_path / "src").mkdir()
+    f = tmp_path / "src" / "page.html"
+    f.write_bytes(b"<main>hi</main>")
+    doc = load_document(f, tmp_path)
+
+    assert doc.path == f
+    assert doc.relative_path == "src/page.html"
+    assert doc.text == "<main>hi</main>"
+    assert doc.size == 15
+    assert doc.sha256 == hashlib.sha256(b"<main>hi</main>").hexdigest()
+    assert doc.name == "page.html"
+    assert doc.suffix == ".html"
+
+
+def test_load_document_matches_read_text(tmp_path):
+    """Decoding must match Path.read_text() so check results don't change."""
+    f = tmp_path / "page.html"
+    f.write_bytes(b"<p>one\r\ntwo\rthree \xff</p>")
+    doc = load_document(f)
+
+    assert doc.text == f.read_text(encoding="utf-8", errors="ignore")
+    assert doc.relative_path == "page.html"
+
+
+def test_load_documents_preserves_order():
+    files = [FIXTURES / "good_aria.html", FIXTURES / "bad_aria.html"]
+    docs = load_documents(files, FIXTURES)
+    assert [d.name for d in docs] == ["good_aria.html", "bad_aria.html"]
+
+
+def test_as_documents_passes_documents_through():
+    doc = load_document(FIXTURES / "good_aria.html")
+    result = as_documents([doc, FIXTURES / "bad_aria.html"])
+    assert result[0] is doc
+    assert isinstance(result[1], SourceDocument)
+
+
+def test_checks_use_document_text_without_rereading(tmp_path):
+    """Checks must consume the shared text, not read the path again."""
+    doc = SourceDocument(
+        path=tmp_path / "missing.html",  # never created on disk
+        relative_path="missing.html",
+        text='<img src="a.png">',
+        size=17,
+        sha256="",
+    )
+    result = check_aria([doc])
+    alt_findings = [f for f in result["findings"] if f["check"] == "image_alt_text" and not f["passed"]]
+    assert len(alt_findings) == 1
+
+
+def test_checks_accept_paths_and_documents_equally():
+    path = FIXTURES / "bad_div_soup.html"
+    assert check_semantic_html([path]) == check_semantic_html([load_document(path)])
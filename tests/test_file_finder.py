@@ -6,7 +6,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
-from scan.file_finder import find_source_files, ALLOWED_EXTENSIONS, EXCLUDED_DIRS, MAX_FILES, MAX_FILE_SIZE_BYTES
+from scan.file_finder import discover_paths, find_source_files, ALLOWED_EXTENSIONS, EXCLUDED_DIRS, MAX_FILES, MAX_FILE_SIZE_BYTES
 
 
 @pytest.fixture
@@ -165,3 +165,134 @@ def test_path_traversal_rejection(tmp_path):
     root = Path(tmp_path).resolve()
     for f in files:
         assert f.resolve().is_relative_to(root)
+
+
+# --- Pruning walker ---
+
+def test_excluded_dirs_are_never_entered(temp_repo, monkeypatch):
+    """Excluded directories are pruned before the walker descends into them."""
+    import scan.file_finder as file_finder
+
+    visited = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        visited.append(Path(path).name)
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_finder.os, "scandir", recording_scandir)
+    find_source_files(str(temp_repo))
+
+    assert "src" in visited
+    for excluded in ("node_modules", "dist", ".git"):
+        assert excluded not in visited
+
+
+def test_nested_excluded_dir_pruned(tmp_path):
+    (tmp_path / "packages" / "ui" / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "packages" / "ui" / "node_modules" / "lib" / "x.html").write_text("<html></html>")
+    (tmp_path / "packages" / "ui" / "Card.jsx").write_text("<div />")
+
+    files, _ = find_source_files(str(tmp_path))
+    assert [f.name for f in files] == ["Card.jsx"]
+
+
+def test_excluded_name_above_root_is_ignored(tmp_path):
+    """Only directories inside the repo are excluded, not the repo's own parents."""
+    repo = tmp_path / "build" / "repo"
+    repo.mkdir(parents=True)
+    (repo / "index.html").write_text("<html></html>")
+
+    files, _ = find_source_files(str(repo))
+    assert [f.name for f in files] == ["index.html"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require admin on Windows")
+def test_symlinked_directory_not_followed(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.html").write_text("<html>secret</html>")
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    os.symlink(str(outside), str(repo / "linked"))
+
+    files, _ = find_source_files(str(repo))
+    assert files == []
+
+
+# --- .gitignore / .hermesignore ---
+
+def test_gitignored_directory_is_pruned(tmp_path, monkeypatch):
+    import scan.file_finder as file_finder
+
+    (tmp_path / ".gitignore").write_text("storybook-static/\n/out\n")
+    (tmp_path / "storybook-static").mkdir()
+    (tmp_path / "storybook-static" / "iframe.html").write_text("<html></html>")
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "index.html").write_text("<html></html>")
+    (tmp_path / "index.html").write_text("<html></html>")
+
+    visited = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        visited.append(Path(path).name)
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_finder.os, "scandir", recording_scandir)
+    files, _ = find_source_files(str(tmp_path))
+
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == ["index.html"]
+    assert "storybook-static" not in visited
+    assert "out" not in visited
+
+
+def test_nested_gitignore_and_negation(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.gen.jsx\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / ".gitignore").write_text("!Keep.gen.jsx\nscratch.html\n")
+    (tmp_path / "src" / "Drop.gen.jsx").write_text("<div />")
+    (tmp_path / "src" / "Keep.gen.jsx").write_text("<div />")
+    (tmp_path / "src" / "scratch.html").write_text("<html></html>")
+    (tmp_path / "scratch.html").write_text("<html></html>")
+
+    files, _ = find_source_files(str(tmp_path))
+    names = sorted(f.relative_to(tmp_path).as_posix() for f in files)
+    assert names == ["scratch.html", "src/Keep.gen.jsx"]
+
+
+def test_hermesignore_overrides_gitignore(tmp_path):
+    (tmp_path / ".gitignore").write_text("vendor/\n")
+    (tmp_path / ".hermesignore").write_text("!vendor/\nlegacy.html\n")
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "widget.html").write_text("<html></html>")
+    (tmp_path / "legacy.html").write_text("<html></html>")
+
+    files, _ = find_source_files(str(tmp_path))
+    assert [f.name for f in files] == ["widget.html"]
+
+
+def test_ignore_files_can_be_disabled(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.html\n")
+    (tmp_path / "index.html").write_text("<html></html>")
+
+    files, _ = find_source_files(str(tmp_path), respect_ignore_files=False)
+    assert [f.name for f in files] == ["index.html"]
+
+
+def test_discover_paths_applies_walker_rules(tmp_path):
+    (tmp_path / ".gitignore").write_text("generated/\n")
+    for rel in ["src/App.jsx", "generated/out.html", "node_modules/x/y.html", "notes.txt", "big.html"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("<html></html>")
+    (tmp_path / "big.html").write_text("x" * (MAX_FILE_SIZE_BYTES + 1))
+
+    rels = ["src/App.jsx", "generated/out.html", "node_modules/x/y.html", "notes.txt", "big.html", "deleted.html"]
+    found = {d.path.relative_to(tmp_path).as_posix(): d for d in discover_paths(str(tmp_path), rels)}
+
+    walked, skipped = find_source_files(str(tmp_path))
+    assert [p.relative_to(tmp_path).as_posix() for p in walked] == ["src/App.jsx"]
+    assert set(found) == {"src/App.jsx", "big.html"}
+    assert found["src/App.jsx"].priority and found["src/App.jsx"].skip_reason is None
+    assert found["big.html"].skip_reason == "exceeds_50kb"
@@ -0,0 +1,61 @@
+"""Tests for scan.findings"""
+
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from scan.findings import Finding, as_dict, to_json
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _finding():
+    return Finding("heading_hierarchy", False, "page.html", "{file}: Heading level skips from h{} to h{}.", 1, 3)
+
+
+def test_reads_like_the_dict_it_replaces():
+    finding = _finding()
+    expected = {
+        "check": "heading_hierarchy",
+        "passed": False,
+        "detail": "page.html: Heading level skips from h1 to h3.",
+        "file": "page.html",
+    }
+    assert finding == expected
+    assert list(finding) == list(expected)
+    assert finding["detail"] == expected["detail"]
+    assert finding.get("missing") is None
+    with pytest.raises(KeyError):
+        finding["missing"]
+
+
+def test_json_via_default_hook_keeps_key_order():
+    finding = _finding()
+    assert json.dumps([finding], default=to_json) == json.dumps([dict(finding)])
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=to_json)
+
+
+def test_pickle_carries_the_file_name():
+    restored = pickle.loads(pickle.dumps(_finding()))
+    assert restored == _finding()
+    assert restored.file == "page.html"
+
+
+def test_compact_record():
+    finding = _finding()
+    assert not hasattr(finding, "__dict__")
+    assert finding.file is Finding("x", True, "".join(["page", ".html"]), "").file
+    assert finding.check is Finding("heading_hierarchy", False, "other.html", "").check
+
+
+def test_scan_results_hold_plain_dicts():
+    result = run_scan(str(FIXTURES))
+    findings = [f for category in result["categories"].values() for f in category["findings"]]
+
+    assert findings and all(type(f) is dict for f in findings)
+    json.dumps(result)
+    assert as_dict(_finding()) == dict(_finding())
@@ -0,0 +1,119 @@
+"""Tests for scan.git_index and git-index discovery"""
+
+import hashlib
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+
+import pytest
+from scan.git_index import GitIndexError, find_git_dir, read_index
+from scan.file_finder import find_source_files, find_tracked_source_files
+
+
+def _write_index(git_dir: Path, paths, version=2, mode=0o100644):
+    """Write a minimal, valid .git/index listing the given paths."""
+    body = b""
+    previous = b""
+    for i, path in enumerate(paths):
+        name = path.encode()
+        sha = hashlib.sha1(name).digest()
+        entry = struct.pack(">10I", 0, 0, 0, 0, 0, 0, mode, 0, 0, i + 1) + sha
+        entry += struct.pack(">H", min(len(name), 0xFFF))
+        if version == 4:
+            common = 0
+            while common < min(len(previous), len(name)) and previous[common] == name[common]:
+                common += 1
+            strip = len(previous) - common
+            assert strip < 0x80  # single-byte varint is enough for tests
+            entry += bytes([strip]) + name[common:] + b"\x00"
+        else:
+            entry += name
+            entry += b"\x00" * (8 - (len(entry) % 8))
+        body += entry
+        previous = name
+    data = b"DIRC" + struct.pack(">II", version, len(paths)) + body
+    git_dir.mkdir(parents=True, exist_ok=True)
+    (git_dir / "index").write_bytes(data + hashlib.sha1(data).digest())
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_read_index_versions(tmp_path, version):
+    paths = ["index.html", "src/App.jsx", "src/components/Button.jsx", "src/components/Card.tsx"]
+    _write_index(tmp_path / ".git", paths, version=version)
+
+    entries = read_index(tmp_path / ".git")
+    assert [e.path for e in entries] == paths
+    assert [e.size for e in entries] == [1, 2, 3, 4]
+    assert entries[0].sha == hashlib.sha1(b"index.html").hexdigest()
+
+
+def test_corrupt_index_raises(tmp_path):
+    _write_index(tmp_path / ".git", ["a.html"])
+    index = tmp_path / ".git" / "index"
+    data = bytearray(index.read_bytes())
+    data[20] ^= 0xFF
+    index.write_bytes(bytes(data))
+
+    with pytest.raises(GitIndexError):
+        read_index(tmp_path / ".git")
+
+
+def test_find_git_dir_walks_up(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "site" / "pages").mkdir(parents=True)
+    assert find_git_dir(tmp_path / "site" / "pages") == tmp_path / ".git"
+
+
+def test_tracked_discovery_lists_only_tracked_files(tmp_path):
+    for rel in ["index.html", "src/App.jsx", "node_modules/x/y.html", "untracked.html"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("<html></html>")
+    _write_index(tmp_path / ".git", ["index.html", "node_modules/x/y.html", "src/App.jsx", "style.css"])
+
+    files, skipped, blob_shas = find_tracked_source_files(str(tmp_path))
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == ["src/App.jsx", "index.html"]
+    assert skipped == []
+    # Sizes/mtimes in the synthetic index don't match disk, so no SHAs are trusted.
+    assert blob_shas == {}
+
+
+def test_tracked_discovery_scoped_to_subdirectory(tmp_path):
+    for rel in ["demo/index.html", "other/page.html"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("<html></html>")
+    _write_index(tmp_path / ".git", ["demo/index.html", "other/page.html"])
+
+    files, _, _ = find_tracked_source_files(str(tmp_path / "demo"))
+    assert [f.name for f in files] == ["index.html"]
+
+
+def test_tracked_symlink_is_skipped(tmp_path):
+    _write_index(tmp_path / ".git", ["link.html"], mode=0o120000)
+    files, skipped, _ = find_tracked_source_files(str(tmp_path))
+    assert files == []
+    assert skipped[0]["reason"] == "symlink"
+
+
+def test_non_git_directory_returns_none(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    assert find_tracked_source_files(str(tmp_path)) is None
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git binary not available")
+def test_matches_walker_on_real_checkout(tmp_path):
+    for rel in ["index.html", "src/App.jsx", "components/Nav.tsx", "readme.md"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("<nav><a href='/'>Home</a></nav>")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+
+    files, skipped, blob_shas = find_tracked_source_files(str(tmp_path))
+    walked, _ = find_source_files(str(tmp_path))
+    assert files == walked
+
+    expected = subprocess.run(
+        ["git", "-C", str(tmp_path), "rev-parse", ":index.html"],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert blob_shas[str(tmp_path / "index.html")] == expected
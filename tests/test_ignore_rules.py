@@ -0,0 +1,76 @@
+"""Tests for scan.ignore_rules"""
+
+import pytest
+from scan.ignore_rules import IgnoreMatcher, is_ignored, parse_rules
+
+
+def _matcher(*lines):
+    return IgnoreMatcher(parse_rules(list(lines)))
+
+
+def test_comments_and_blank_lines_ignored():
+    assert parse_rules(["# comment", "", "   "]) == []
+
+
+def test_unanchored_name_matches_any_depth():
+    m = _matcher("out")
+    assert m.match("out", is_dir=True) is True
+    assert m.match("a/b/out", is_dir=True) is True
+    assert m.match("a/output", is_dir=True) is None
+
+
+def test_anchored_pattern_only_matches_from_base():
+    m = _matcher("/vendor")
+    assert m.match("vendor", is_dir=True) is True
+    assert m.match("lib/vendor", is_dir=True) is None
+
+    m = _matcher("docs/build")
+    assert m.match("docs/build", is_dir=True) is True
+    assert m.match("x/docs/build", is_dir=True) is None
+
+
+def test_directory_only_rule_skips_files():
+    m = _matcher("storybook-static/")
+    assert m.match("storybook-static", is_dir=True) is True
+    assert m.match("storybook-static", is_dir=False) is None
+
+
+def test_wildcards():
+    m = _matcher("*.gen.tsx", "page?.html", "[ab].jsx")
+    assert m.match("src/Card.gen.tsx", is_dir=False) is True
+    assert m.match("page1.html", is_dir=False) is True
+    assert m.match("page10.html", is_dir=False) is None
+    assert m.match("a.jsx", is_dir=False) is True
+    assert m.match("c.jsx", is_dir=False) is None
+
+
+def test_double_star():
+    m = _matcher("**/fixtures", "legacy/**", "a/**/z.html")
+    assert m.match("fixtures", is_dir=True) is True
+    assert m.match("x/y/fixtures", is_dir=True) is True
+    assert m.match("legacy/old.html", is_dir=False) is True
+    assert m.match("a/z.html", is_dir=False) is True
+    assert m.match("a/b/c/z.html", is_dir=False) is True
+
+
+def test_negation_last_rule_wins():
+    m = _matcher("*.html", "!keep.html")
+    assert m.match("drop.html", is_dir=False) is True
+    assert m.match("keep.html", is_dir=False) is False
+
+    m = _matcher("!keep.html", "*.html")
+    assert m.match("keep.html", is_dir=False) is True
+
+
+def test_escaped_characters():
+    m = _matcher("\\#notes.html", "\\!important.html")
+    assert m.match("#notes.html", is_dir=False) is True
+    assert m.match("!important.html", is_dir=False) is True
+
+
+def test_deeper_matcher_takes_precedence():
+    root = ("", _matcher("*.html"))
+    nested = ("site", _matcher("!index.html"))
+    assert is_ignored([root, nested], "site/index.html", is_dir=False) is False
+    assert is_ignored([root, nested], "site/other.html", is_dir=False) is True
+    assert is_ignored([root], "index.jsx", is_dir=False) is False
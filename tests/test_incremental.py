@@ -0,0 +1,149 @@
+"""Tests for scan.incremental"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from scan.incremental import load_baseline, plan
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git binary not available")
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git checkout of the fixtures with one commit, tagged 'base'."""
+    root = tmp_path / "repo"
+    shutil.copytree(FIXTURES, root / "src")
+    (root / "index.html").write_text("<html><body><main><h1>Home</h1></main></body></html>")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "base")
+    _git(root, "tag", "base")
+    return root
+
+
+def _comparable(result):
+    return {k: result[k] for k in ("total_score", "breakdown", "categories", "files_scanned", "file_count")}
+
+
+@needs_git
+def test_incremental_matches_full_scan(repo, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    base = run_scan(str(repo), write_baseline_path=str(baseline))
+
+    (repo / "src" / "good_aria.html").write_text("<div onClick='x'><img src='a.png'></div>")
+    (repo / "src" / "bad_form.html").unlink()
+    (repo / "src" / "new_page.jsx").write_text("<nav><a href='/x'>Pricing details</a></nav>")
+    (repo / "notes.txt").write_text("not scanned")
+
+    result = run_scan(str(repo), since="base", baseline_path=str(baseline))
+    full = run_scan(str(repo))
+
+    assert _comparable(result) == _comparable(full)
+    inc = result["incremental"]
+    assert inc["mode"] == "incremental"
+    assert inc["rescanned"] == 2  # modified + new; the deletion and .txt need no checks
+    assert inc["reused"] == base["file_count"] - 2
+    assert sorted(inc["changed_files"]) == [
+        "notes.txt", "src/bad_form.html", "src/good_aria.html", "src/new_page.jsx",
+    ]
+    assert inc["baseline_score"] == base["total_score"]
+    assert inc["score_delta"] == full["total_score"] - base["total_score"]
+    assert set(inc["category_deltas"]) == set(full["breakdown"])
+
+
+@needs_git
+def test_unchanged_tree_reuses_everything(repo, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    base = run_scan(str(repo), write_baseline_path=str(baseline))
+
+    result = run_scan(str(repo), since="base", baseline_path=str(baseline))
+
+    assert result["incremental"]["rescanned"] == 0
+    assert result["incremental"]["score_delta"] == 0
+    assert _comparable(result) == _comparable(base)
+
+
+@needs_git
+def test_ref_other_than_baseline_commit_falls_back_to_full_scan(repo, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    run_scan(str(repo), write_baseline_path=str(baseline))
+    # Committed after the baseline: diffing HEAD against the tree misses it.
+    (repo / "src" / "good_aria.html").write_text("<div onClick='x'><img src='a.png'></div>")
+    _git(repo, "commit", "-q", "-am", "change")
+
+    result = run_scan(str(repo), since="HEAD", baseline_path=str(baseline))
+
+    assert result["incremental"]["mode"] == "full"
+    assert _comparable(result) == _comparable(run_scan(str(repo)))
+    assert plan(repo, "base", load_baseline(str(baseline)))[0] is not None
+
+
+@needs_git
+def test_changed_ignore_file_falls_back_to_full_scan(repo, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    base = run_scan(str(repo), write_baseline_path=str(baseline))
+    (repo / "src" / ".hermesignore").write_text("good_aria.html\n")
+
+    result = run_scan(str(repo), since="base", baseline_path=str(baseline))
+
+    assert result["incremental"]["mode"] == "full"
+    assert result["file_count"] == base["file_count"] - 1
+    assert _comparable(result) == _comparable(run_scan(str(repo)))
+    reason = plan(repo, "base", load_baseline(str(baseline)))[1]
+    assert "src/.hermesignore" in reason
+
+
+def test_unknown_ref_falls_back_to_full_scan(tmp_path):
+    root = tmp_path / "plain"
+    shutil.copytree(FIXTURES, root)
+    baseline = tmp_path / "baseline.json"
+    base = run_scan(str(root), write_baseline_path=str(baseline))
+
+    result = run_scan(str(root), since="does-not-exist", baseline_path=str(baseline))
+
+    assert result["incremental"]["mode"] == "full"
+    assert result["incremental"]["score_delta"] == 0
+    assert _comparable(result) == _comparable(base)
+
+
+def test_engine_mismatch_is_not_planned(tmp_path):
+    baseline_file = tmp_path / "baseline.json"
+    run_scan(str(FIXTURES), write_baseline_path=str(baseline_file))
+    baseline = load_baseline(str(baseline_file))
+    baseline["engine"] = "something-else"
+
+    assert plan(FIXTURES, "HEAD", baseline)[0] is None
+
+
+def test_baseline_paths_are_relative(tmp_path):
+    baseline_file = tmp_path / "baseline.json"
+    run_scan(str(FIXTURES), write_baseline_path=str(baseline_file))
+    data = json.loads(baseline_file.read_text())
+
+    assert all(not Path(entry["path"]).is_absolute() for entry in data["files"])
+    assert data["capped"] is False
+
+
+def test_since_requires_baseline():
+    with pytest.raises(ValueError, match="--baseline"):
+        run_scan(str(FIXTURES), since="HEAD")
+
+
+def test_invalid_baseline_raises(tmp_path):
+    bad = tmp_path / "baseline.json"
+    bad.write_text("{}")
+    with pytest.raises(ValueError, match="Unsupported baseline"):
+        run_scan(str(FIXTURES), since="HEAD", baseline_path=str(bad))
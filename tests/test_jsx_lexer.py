@@ -0,0 +1,77 @@
+"""Tests for scan.jsx_lexer"""
+
+import re
+from pathlib import Path
+
+from scan import jsx_lexer
+from scan.document import SourceDocument
+from scan.jsx_lexer import mask_jsx
+
+
+def _document(text: str, name: str = "App.jsx") -> SourceDocument:
+    return SourceDocument(path=Path(name), relative_path=name, text=text, size=len(text), sha256="")
+
+
+def _tag_names(text: str, name: str = "App.jsx"):
+    return [tag.raw_name for tag in _document(text, name).tokens.tags if not tag.is_end]
+
+
+def test_mask_keeps_offsets_and_lines():
+    text = 'const s = "<a href=x>";\n// <button>\nreturn <div>{`<b>`}</div>;\n'
+    masked = mask_jsx(text)
+
+    assert len(masked) == len(text)
+    assert masked.count("\n") == text.count("\n")
+    assert masked.index("<div>") == text.index("<div>")
+
+
+def test_strings_comments_and_templates_are_not_tags():
+    text = """
+const html = '<a href="#">x</a>';
+const tpl = `<img src=${src}>`;
+// <button onClick={go}>
+/* <input> */
+export default function App() {
+  return <main><h1>Hi</h1></main>;
+}
+"""
+    assert _tag_names(text) == ["main", "h1"]
+
+
+def test_generics_and_comparisons_are_not_tags():
+    text = """
+const items: Array<div> = [];
+const [n, setN] = useState<number>(0);
+const pick = <T,>(x: T) => x;
+function id<T extends object>(x: T) { return x; }
+if (a < b && c > d) go();
+const el = n > 1 ? <span>many</span> : <em>one</em>;
+"""
+    assert _tag_names(text, "App.tsx") == ["span", "em"]
+
+
+def test_arrow_in_attribute_does_not_end_tag():
+    text = '<button onClick={() => setOpen(!open)} aria-label="Menu"><Icon /></button>'
+    button = _document(text).tokens.start_tags("button")[0]
+
+    assert button.get("aria-label") == "Menu"
+    assert button.get("onclick") == "() => setOpen(!open)"
+    assert _tag_names(text) == ["button", "Icon"]
+
+
+def test_nested_jsx_in_expressions_is_kept():
+    text = "<List render={(x) => <Item key={x} />}>{items.map(i => <li>{i}</li>)}</List>"
+    assert _tag_names(text) == ["List", "Item", "li"]
+
+
+def test_html_files_are_not_lexed_as_jsx():
+    text = "<p>1 < 2, 'quoted <b>'</p>"
+    assert _document(text, "index.html").markup == text
+
+
+def test_patterns_avoid_python_311_only_syntax():
+    # Possessive quantifiers and atomic groups fail to compile before 3.11.
+    for name in dir(jsx_lexer):
+        value = getattr(jsx_lexer, name)
+        if isinstance(value, re.Pattern):
+            assert not re.search(r"[*+?}]\+|\(\?>", value.pattern), name
@@ -0,0 +1,93 @@
+"""Tests for scan.memory"""
+
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from scan.findings import Finding
+from scan.memory import MemoryBudget, MemoryBudgetExceeded, PartialsSpill, SpillRef
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_spill_round_trip_in_file_order():
+    spill = PartialsSpill()
+    try:
+        first = spill.store({"aria": {"findings": [{"file": "a.html"}]}, "structured_data": None})
+        second = spill.store({"aria": None})
+        inline = {"aria": {"findings": []}}
+        assert isinstance(first, SpillRef)
+
+        items = spill.sequence([second, inline, first])
+        assert len(items) == 3
+        assert list(items) == [{"aria": None}, inline, {"aria": {"findings": [{"file": "a.html"}]}, "structured_data": None}]
+        assert list(items) == list(items)  # re-iterable
+        assert spill.count == 2
+    finally:
+        spill.close()
+
+
+def test_spilled_findings_come_back_as_findings():
+    spill = PartialsSpill()
+    try:
+        finding = Finding("custom_widget_role", False, "a.html", "{file}: <{}> lacks role.", "div")
+        ref = spill.store({"aria": {"findings": [finding], "total": 1}, "components": None})
+
+        loaded = spill.load(ref)
+        assert loaded == {"aria": {"findings": [finding], "total": 1}, "components": None}
+        assert isinstance(loaded["aria"]["findings"][0], Finding)
+        assert loaded["aria"]["findings"][0].detail == "a.html: <div> lacks role."
+        assert list(spill.sequence([ref]))[0]["aria"]["total"] == 1
+    finally:
+        spill.close()
+
+
+def _scan_peak(repo, **kwargs) -> int:
+    tracemalloc.start()
+    try:
+        run_scan(str(repo), **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_spill_peak_not_above_unspilled_peak(tmp_path):
+    unit = '<img src="a.png"><a href="#">click here</a><div onclick="go()"><svg></svg></div>\n'
+    for i in range(30):
+        (tmp_path / f"page{i}.html").write_text(f"<html><body>{unit * 100}</body></html>")
+
+    plain = _scan_peak(tmp_path)
+    spilled = _scan_peak(tmp_path, max_memory_bytes=1024 * 1024 * 1024)
+    assert spilled <= plain
+
+
+def test_budget_raises_with_top_allocations():
+    budget = MemoryBudget(64 * 1024)
+    try:
+        budget.check()
+        hog = [bytearray(1024) for _ in range(200)]
+        with pytest.raises(MemoryBudgetExceeded, match="top allocations"):
+            budget.check()
+        assert budget.peak() >= 200 * 1024
+        del hog
+    finally:
+        budget.close()
+
+
+def test_run_scan_bounded_matches_unbounded():
+    bounded = run_scan(str(FIXTURES), max_memory_bytes=256 * 1024 * 1024)
+    plain = run_scan(str(FIXTURES))
+
+    memory = bounded.pop("memory")
+    assert bounded["categories"] == plain["categories"]
+    assert bounded["total_score"] == plain["total_score"]
+    assert memory["spilled_files"] == bounded["file_count"]
+    assert 0 < memory["peak_mb"] <= memory["budget_mb"]
+    assert "memory" not in plain
+
+
+def test_run_scan_over_budget_fails():
+    with pytest.raises(MemoryBudgetExceeded):
+        run_scan(str(FIXTURES), max_memory_bytes=1024)
@@ -0,0 +1,127 @@
+"""Tests for scan.ndjson"""
+
+import io
+import json
+import shutil
+import subprocess
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from scan import scanner
+from scan.watchdog import WatchdogPool
+from scan.ndjson import NdjsonWriter
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git binary not available")
+
+
+def _stream(**kwargs):
+    out = io.StringIO()
+    writer = NdjsonWriter(out)
+    result = run_scan(str(FIXTURES), on_file=writer.file_done, **kwargs)
+    writer.finish(result)
+    return result, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def _findings_of(result):
+    return [
+        (name, f["check"], f.get("file"), f["passed"], f["detail"])
+        for name, category in result["categories"].items()
+        for f in category["findings"]
+    ]
+
+
+def test_records_add_up_to_the_json_findings():
+    result, records = _stream()
+    findings = [r for r in records if r["type"] == "finding"]
+    assert Counter(
+        (r["category"], r["check"], r["file"], r["passed"], r["detail"]) for r in findings
+    ) == Counter(_findings_of(result))
+    assert all(line["type"] == "finding" for line in records[:-1])
+
+
+def test_file_findings_stream_in_file_order_before_aggregates():
+    result, records = _stream()
+    files = [r["file"] for r in records if r["type"] == "finding" and r["file"] is not None]
+    order = {name: i for i, name in enumerate(result["files_scanned"])}
+    assert files == sorted(files, key=order.__getitem__)
+    first_aggregate = next(i for i, r in enumerate(records) if r["type"] == "finding" and r["file"] is None)
+    assert all(r["file"] is None for r in records[first_aggregate:-1])
+
+
+def test_summary_record_last():
+    result, records = _stream()
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert summary["total_score"] == result["total_score"]
+    assert summary["rating"] == result["rating"]
+    assert summary["breakdown"] == result["breakdown"]
+    assert "categories" not in summary
+
+
+def test_same_records_with_workers_and_spill():
+    _, serial = _stream()
+    _, parallel = _stream(jobs=2, max_memory_bytes=256 * 1024 * 1024)
+    strip = lambda records: [r for r in records if r["type"] == "finding"]
+    assert strip(parallel) == strip(serial)
+
+
+def _tracked_fixtures(tmp_path):
+    root = tmp_path / "repo"
+    shutil.copytree(FIXTURES, root)
+    subprocess.run(["git", "-C", str(root), "init", "-q"], check=True)
+    subprocess.run(["git", "-C", str(root), "add", "."], check=True)
+    return root
+
+
+@needs_git
+def test_tracked_files_stream_before_the_scan_ends(tmp_path, monkeypatch):
+    root = _tracked_fixtures(tmp_path)
+
+    mapped = []
+    map_document = scanner.map_document
+    monkeypatch.setattr(scanner, "map_document", lambda doc: mapped.append(doc.path) or map_document(doc))
+    seen_at = []
+    out = io.StringIO()
+    writer = NdjsonWriter(out)
+
+    def file_done(path, partials):
+        seen_at.append(len(mapped))
+        writer.file_done(path, partials)
+
+    result = run_scan(str(root), use_git_index=True, on_file=file_done)
+    assert result["file_count"] > 1
+    # Each file's records are written right after it is checked, not at the end.
+    assert seen_at == list(range(1, result["file_count"] + 1))
+
+
+@needs_git
+def test_file_timeout_results_stream_before_the_scan_ends(tmp_path, monkeypatch):
+    root = _tracked_fixtures(tmp_path)
+    submit = WatchdogPool.submit
+    submitted = []
+
+    def slow_submit(pool, *args):
+        # Each file is handed over only once the previous one is done, as
+        # with slow reads, so finished files can be written out in between.
+        if submitted:
+            while not pool.finished(submitted[-1]):
+                time.sleep(0.01)
+        submitted.append(submit(pool, *args))
+        return submitted[-1]
+
+    monkeypatch.setattr(WatchdogPool, "submit", slow_submit)
+    seen_at = []
+    result = run_scan(
+        str(root), use_git_index=True, file_timeout=60,
+        on_file=lambda path, partials: seen_at.append(len(submitted)),
+    )
+
+    count = result["file_count"]
+    assert count > 1
+    # File k is written right after file k + 1 is submitted, the last one at the end.
+    assert seen_at == list(range(2, count + 1)) + [count]
@@ -0,0 +1,115 @@
+"""Tests for scan.pipeline"""
+
+import threading
+from pathlib import Path
+
+import pytest
+from scan.file_finder import Discovered, find_source_files, iter_source_files
+from scan.pipeline import stream_scan
+
+
+def _make_repo(root: Path, count: int):
+    (root / "src").mkdir()
+    for i in range(count):
+        target = root / "src" if i % 3 == 0 else root
+        (target / f"page_{i:04d}.html").write_text(f"<html>{i}</html>")
+    (root / "huge.html").write_text("x" * (60 * 1024))
+
+
+def test_matches_find_source_files_order_and_cap(tmp_path):
+    _make_repo(tmp_path, 150)
+    expected_files, expected_skipped = find_source_files(str(tmp_path))
+
+    files, skipped = stream_scan(iter_source_files(str(tmp_path)), lambda path: path)
+
+    assert files == expected_files
+    assert sorted(s["reason"] for s in skipped) == sorted(s["reason"] for s in expected_skipped)
+    assert skipped[-1]["reason"] == "file_limit_exceeded: 150 found, capped at 100"
+
+
+def test_files_outside_the_cap_are_not_processed():
+    discovered = [Discovered(Path(f"/r/src/{i:03d}.html"), True) for i in range(5)]
+    discovered += [Discovered(Path(f"/r/{i:03d}.html"), False) for i in range(5)]
+    processed = []
+
+    def process(path):
+        processed.append(path)
+        return path.name
+
+    results, skipped = stream_scan(iter(discovered), process, max_files=5)
+
+    assert results == [f"{i:03d}.html" for i in range(5)]
+    assert len(processed) == 5  # non-priority files arrived too late to make the cut
+    assert skipped == [{"path": "multiple", "reason": "file_limit_exceeded: 10 found, capped at 5"}]
+
+
+def test_late_better_file_evicts_earlier_one():
+    discovered = [
+        Discovered(Path("/r/b.html"), False),
+        Discovered(Path("/r/c.html"), False),
+        Discovered(Path("/r/src/a.html"), True),
+    ]
+    results, _ = stream_scan(iter(discovered), lambda path: path.name, max_files=2)
+    assert results == ["a.html", "b.html"]
+
+
+def test_skip_records_pass_through():
+    discovered = [
+        Discovered(Path("/r/link.html"), False, "symlink"),
+        Discovered(Path("/r/a.html"), False),
+    ]
+    results, skipped = stream_scan(iter(discovered), lambda path: path.name)
+    assert results == ["a.html"]
+    assert skipped == [{"path": "/r/link.html", "reason": "symlink"}]
+
+
+def test_discovery_errors_propagate():
+    def broken():
+        yield Discovered(Path("/r/a.html"), False)
+        raise OSError("disk went away")
+
+    with pytest.raises(OSError, match="disk went away"):
+        stream_scan(broken(), lambda path: path)
+
+
+def test_processing_errors_stop_discovery(tmp_path):
+    _make_repo(tmp_path, 20)
+
+    def process(path):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        stream_scan(iter_source_files(str(tmp_path)), process, queue_size=1)
+
+
+def test_processing_error_with_full_queue_returns():
+    exhausted = threading.Event()
+
+    def discovered():
+        for i in range(19):
+            yield Discovered(Path(f"/r/{i:02d}.html"), False)
+        exhausted.set()
+
+    calls = []
+    outcome = []
+
+    def process(path):
+        calls.append(path)
+        if len(calls) == 3:
+            # Fail once discovery has ended and the queue is full, so the
+            # end marker is still waiting for a free slot.
+            exhausted.wait(timeout=5)
+            raise RuntimeError("boom")
+        return path
+
+    def run():
+        try:
+            stream_scan(discovered(), process, queue_size=16)
+        except RuntimeError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert [str(e) for e in outcome] == ["boom"]
@@ -0,0 +1,65 @@
+"""Tests for scan.preprocess"""
+
+from pathlib import Path
+
+from scan.document import SourceDocument
+from scan.preprocess import mask_html, preprocess
+
+
+def test_comments_scripts_and_styles_blanked_with_offsets_kept():
+    text = (
+        "<!-- <img src=a.png> -->\n"
+        "<style>\n  a > b { color: red }\n</style>\n"
+        '<script src="app.js"></script><script>if (a<b) el.innerHTML = "<a href=#>";</script>\n'
+        "<p>Hello</p>\n"
+    )
+    markup = mask_html(text).markup
+
+    assert len(markup) == len(text)
+    assert markup.count("\n") == text.count("\n")
+    assert "<img" not in markup and "<a " not in markup and "color" not in markup
+    # Tags around the blanked bodies and the markup after them are kept
+    assert markup.count("<script") == 2 and markup.count("</script>") == 2
+    assert "</style>" in markup
+    assert markup.index("<p>Hello</p>") == text.index("<p>Hello</p>")
+
+
+def test_json_ld_extracted_and_blanked():
+    text = '<head><script type="application/ld+json">\n{"@type": "Product", "name": "<b>x</b>"}\n</script></head>'
+    result = mask_html(text)
+
+    assert result.json_ld == ['{"@type": "Product", "name": "<b>x</b>"}']
+    assert "<b>" not in result.markup
+
+
+def test_template_scripts_kept_as_markup():
+    text = '<script type="text/x-template" id="row"><li><a href="/x">Row</a></li></script>'
+    assert mask_html(text).markup == text
+
+
+def test_only_the_type_attribute_marks_templates_and_json_ld():
+    body = '{"a": "<img src=x>"}'
+    for attrs in ('data-type="html"', "x-type=template", 'data-type="application/ld+json"'):
+        result = mask_html(f"<script {attrs}>{body}</script>")
+        assert "<img" not in result.markup, attrs
+        assert result.json_ld == [], attrs
+    assert mask_html(f'<script data-x="1" TYPE="text/html">{body}</script>').markup.count("<img") == 1
+
+
+def test_unterminated_comment_and_script_run_to_end():
+    assert mask_html("<p>a</p><!-- <img>").markup == "<p>a</p>" + " " * 10
+    assert mask_html("<script>x = '<img>'").markup == "<script>" + " " * 11
+
+
+def test_jsx_files_use_jsx_lexer():
+    assert preprocess("// <img>\n<p/>", ".jsx").markup == "        \n<p/>"
+    assert preprocess("// <img>\n<p/>", ".html").markup == "// <img>\n<p/>"
+
+
+def test_document_preprocesses_once():
+    text = '<!-- <nav> --><script type="application/ld+json">{}</script><nav></nav>'
+    doc = SourceDocument(path=Path("index.html"), relative_path="index.html", text=text, size=len(text), sha256="")
+
+    assert doc.preprocessed is doc.preprocessed
+    assert doc.json_ld == ["{}"]
+    assert [tag.name for tag in doc.tokens.tags] == ["script", "script", "nav", "nav"]
@@ -0,0 +1,86 @@
+"""Tests for scan.profiling"""
+
+import json
+from pathlib import Path
+
+from scan.checks import ANALYSES, CHECKS, map_path
+from scan.profiling import ScanProfile, profiled_map_path
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_profiled_map_path_matches_map_path():
+    path = FIXTURES / "good_semantic.html"
+    partials, timing = profiled_map_path(str(path), str(FIXTURES))
+
+    assert partials == map_path(str(path), str(FIXTURES))
+    assert timing["path"] == "good_semantic.html"
+    assert timing["bytes"] == path.stat().st_size
+    assert set(timing["stages"]) == {"read", "tokenize", *CHECKS, *ANALYSES}
+    assert timing["wall_s"] >= sum(wall for wall, _ in timing["stages"].values()) * 0.5
+
+
+def test_slowest_files_ordered_and_capped():
+    profile = ScanProfile(top_n=2)
+    for name, wall in [("a.html", 0.1), ("b.html", 0.3), ("c.html", 0.2)]:
+        profile.add_file({"path": name, "bytes": 10, "wall_s": wall, "cpu_s": wall, "stages": {"aria": (wall, wall)}})
+
+    timings = profile.to_dict()
+    assert [f["path"] for f in timings["slowest_files"]] == ["b.html", "c.html"]
+    assert timings["files_profiled"] == 3
+    assert timings["bytes_read"] == 30
+    assert abs(timings["checks"]["aria"]["wall_s"] - 0.6) < 1e-9
+    assert timings["checks"]["semantic_html"] == {"wall_s": 0.0, "cpu_s": 0.0}
+
+
+def test_discovery_stream_is_timed():
+    profile = ScanProfile()
+    assert list(profile.timed_discovery(iter([1, 2]))) == [1, 2]
+    assert profile.discovery_wall > 0
+
+
+def test_run_scan_profile_block():
+    result = run_scan(str(FIXTURES), profile=True)
+    plain = run_scan(str(FIXTURES))
+
+    timings = result.pop("timings")
+    assert "timings" not in plain
+    assert result["categories"] == plain["categories"]
+    assert timings["files_profiled"] == result["file_count"]
+    assert timings["bytes_read"] > 0
+    assert set(timings["checks"]) == set(CHECKS)
+    assert set(timings["analyses"]) == set(ANALYSES)
+    assert len(timings["slowest_files"]) == min(10, result["file_count"])
+
+
+def test_run_scan_profile_with_workers():
+    timings = run_scan(str(FIXTURES), jobs=2, profile=True)["timings"]
+    assert timings["files_profiled"] > 0
+    assert timings["checks"]["aria"]["wall_s"] > 0
+
+
+def test_trace_events_only_when_requested():
+    path = str(FIXTURES / "good_semantic.html")
+    assert "trace" not in profiled_map_path(path)[1]
+
+    events = profiled_map_path(path, trace=True)[1]["trace"]
+    assert [e["name"] for e in events] == ["good_semantic.html", "read", "tokenize", *CHECKS, *ANALYSES]
+    file_span = events[0]
+    for event in events[1:]:
+        assert event["ph"] == "X"
+        assert event["pid"] == file_span["pid"] and event["tid"] == file_span["tid"]
+        assert file_span["ts"] <= event["ts"] <= file_span["ts"] + file_span["dur"]
+
+
+def test_run_scan_writes_chrome_trace(tmp_path):
+    trace_file = tmp_path / "trace.json"
+    result = run_scan(str(FIXTURES), trace_path=str(trace_file))
+
+    assert "timings" not in result
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert sum(1 for e in spans if e["cat"] == "discovery") == 1
+    assert sum(1 for e in spans if e["cat"] == "file") == result["file_count"]
+    assert sum(1 for e in spans if e["cat"] == "check") == result["file_count"] * len(CHECKS)
+    assert any(e["ph"] == "M" and e["args"]["name"] == "scanner" for e in events)
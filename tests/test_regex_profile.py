@@ -0,0 +1,59 @@
+"""Tests for scan.regex_profile"""
+
+import re
+from pathlib import Path
+
+from scan import check_aria, check_semantic_html
+from scan.regex_profile import ProfiledPattern, merge_stats, pattern_report, recording
+from scan.scanner import run_scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_recording_wraps_and_restores_module_patterns():
+    original = check_aria.ARIA_LIVE_HINT
+    with recording() as stats:
+        assert isinstance(check_aria.ARIA_LIVE_HINT, ProfiledPattern)
+        assert check_aria.ARIA_LIVE_HINT.search(' aria-live="polite"')
+        assert check_aria.ARIA_LIVE_HINT.search(" src=x") is None
+
+    assert check_aria.ARIA_LIVE_HINT is original
+    assert check_semantic_html.re is re
+    calls, matches, total, worst = stats["check_aria.ARIA_LIVE_HINT"]
+    assert (calls, matches) == (2, 1)
+    assert 0 <= worst <= total
+
+
+def test_ad_hoc_re_calls_keyed_by_pattern():
+    with recording() as stats:
+        assert check_semantic_html.re.search(r"\bid\b", ' id="email"')
+    keys = [k for k in stats if k.startswith("check_semantic_html.re:")]
+    assert len(keys) == 1 and "id" in keys[0]
+
+
+def test_finditer_counts_one_call_with_all_matches():
+    with recording() as stats:
+        wrapped = ProfiledPattern(re.compile(r"\d"), "digits")
+        assert [m.group() for m in wrapped.finditer("a1b2c3")] == ["1", "2", "3"]
+    assert stats["digits"][:2] == [1, 3]
+
+
+def test_merge_and_report_sorted_by_total_time():
+    total = {}
+    merge_stats(total, {"a": [1, 1, 0.5, 0.5], "b": [2, 0, 0.1, 0.07]})
+    merge_stats(total, {"b": [1, 1, 0.6, 0.6]})
+    rows = pattern_report(total)
+
+    assert [r["pattern"] for r in rows] == ["b", "a"]
+    assert rows[0] == {"pattern": "b", "calls": 3, "matches": 1, "total_s": 0.7, "worst_call_s": 0.6}
+
+
+def test_run_scan_regex_profile_block():
+    result = run_scan(str(FIXTURES), profile_regex=True)
+    plain = run_scan(str(FIXTURES))
+
+    rows = result.pop("regex_profile")
+    assert "timings" not in result
+    assert result["categories"] == plain["categories"]
+    assert "tokenizer.TAG_OPEN_PATTERN" in {r["pattern"] for r in rows}
+    assert all(r["calls"] >= 1 for r in rows)
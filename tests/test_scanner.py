@@ -44,3 +44,19 @@ def test_main_valid_path_produces_json():
     assert "total_score" in data
     assert "categories" in data
     assert "skipped_files" in data
+
+
+def test_main_git_index_matches_walker():
+    """--git-index should find the same fixtures as the directory walk."""
+    walked = subprocess.run(
+        [sys.executable, "-m", "scan.scanner", FIXTURES_DIR],
+        capture_output=True,
+        text=True,
+    )
+    indexed = subprocess.run(
+        [sys.executable, "-m", "scan.scanner", FIXTURES_DIR, "--git-index"],
+        capture_output=True,
+        text=True,
+    )
+    assert indexed.returncode == 0
+    assert json.loads(indexed.stdout)["total_score"] == json.loads(walked.stdout)["total_score"]
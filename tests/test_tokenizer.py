@@ -0,0 +1,135 @@
+"""Tests for scan.tokenizer"""
+
+import re
+from pathlib import Path
+
+from scan.document import load_document
+from scan.tokenizer import Tag, TextSpan, TokenStream, parse_attributes, strip_tags
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_start_and_end_tags_indexed_by_lowercase_name():
+    stream = TokenStream('<NAV><A href="/">Home</A></NAV>')
+
+    assert [t.raw_name for t in stream.start_tags("a")] == ["A"]
+    assert stream.has("nav")
+    assert len(stream.end_tags("nav")) == 1
+    assert not stream.has("main")
+
+
+def test_start_tags_multiple_names_in_document_order():
+    stream = TokenStream("<h2>b</h2><h1>a</h1><h3>c</h3>")
+    names = [t.name for t in stream.start_tags("h1", "h2", "h3")]
+    assert names == ["h2", "h1", "h3"]
+    assert stream.count("h1", "h2", "h3") == 3
+
+
+def test_attributes_parsed_lazily():
+    stream = TokenStream("<input type=\"email\" Name='user' disabled value={state.x} size=3 />")
+    tag = stream.start_tags("input")[0]
+
+    assert tag.attributes == {
+        "type": "email",
+        "name": "user",
+        "disabled": "",
+        "value": "state.x",
+        "size": "3",
+    }
+    assert tag.get("type") == "email"
+    assert tag.get("missing") is None
+    assert tag.self_closing
+
+
+def test_tag_runs_to_next_gt():
+    stream = TokenStream('<div onClick={() => go()}>x</div>')
+    div = stream.start_tags("div")[0]
+    # Same boundary the old [^>]* regexes used: stops at the "=>" arrow.
+    assert div.attrs == " onClick={() ="
+
+
+def test_unterminated_last_tag_runs_to_eof():
+    stream = TokenStream("<p>ok</p><img src='x'")
+    img = stream.start_tags("img")[0]
+    assert img.end == len(stream.text)
+    assert img.attrs == " src='x'"
+
+
+def test_nested_tag_ends_outer_tag():
+    """JSX element props like icon={<img />} are tokenized as their own tags."""
+    stream = TokenStream('<Button icon={<img src="x" />}>Go</Button>')
+    button, img = stream.start_tags("button")[0], stream.start_tags("img")[0]
+
+    assert button.attrs == " icon={"
+    assert button.end == img.start
+    assert img.get("src") == "x"
+
+
+def test_first_end_tag():
+    stream = TokenStream("<a>1</a><a>2</a>")
+    first, second = stream.end_tags("a")
+
+    assert stream.first_end_tag("a", 0) is first
+    assert stream.first_end_tag("a", first.start + 1) is second
+    assert stream.first_end_tag("a", second.end) is None
+    assert stream.first_end_tag("nav", 0) is None
+
+
+def test_strip_tags_matches_regex():
+    for fragment in ["<b>bold</b> text", "a <> b", "<<x>y", "no close <tag", "<a<b>c>"]:
+        assert strip_tags(fragment) == re.sub(r"<[^>]+>", "", fragment)
+
+
+def test_text_after_and_next_tag():
+    stream = TokenStream('<div id="root">  </div><p>Hello there</p>')
+    div = stream.start_tags("div")[0]
+
+    assert stream.text_after(div) == "  "
+    following = stream.next_tag(div)
+    assert following.is_end and following.name == "div"
+    assert stream.next_tag(stream.tags[-1]) is None
+
+
+def test_tokens_interleave_text_spans():
+    stream = TokenStream("a<b>c</b>d")
+    kinds = [
+        ("tag", t.raw_name) if isinstance(t, Tag) else ("text", stream.text[t.start:t.end])
+        for t in stream.tokens()
+    ]
+    assert kinds == [("text", "a"), ("tag", "b"), ("text", "c"), ("tag", "b"), ("text", "d")]
+    assert all(isinstance(t, (Tag, TextSpan)) for t in stream.tokens())
+
+
+def test_non_tag_lt_is_text():
+    stream = TokenStream("if (a < b && c <= d) { return <span>x</span> }")
+    assert [t.name for t in stream.tags] == ["span", "span"]
+
+
+def test_document_tokens_cached():
+    doc = load_document(FIXTURES / "good_semantic.html")
+    assert doc.tokens is doc.tokens
+    assert doc.tokens.has("nav")
+
+
+def test_parse_attributes_balances_jsx_expressions():
+    attrs = parse_attributes(
+        ' onClick={() => { go("}") }} {...props} style={{ color: "red" }}'
+        " aria-label={t('close}')} ROLE=button"
+    )
+    assert attrs == {
+        "onclick": '() => { go("}") }',
+        "style": '{ color: "red" }',
+        "aria-label": "t('close}')",
+        "role": "button",
+    }
+
+
+def test_parse_attributes_unclosed_expression_runs_to_end():
+    assert parse_attributes(" alt={label disabled") == {"alt": "label disabled"}
+
+
+def test_tags_named_merges_start_and_end_tags_in_order():
+    stream = TokenStream("<form><label>a<input></label><p>x</p></form>")
+    assert [repr(t) for t in stream.tags_named("form", "label", "input")] == [
+        "<form@0>", "<label@6>", "<input@14>", "</label@21>", "</form@37>",
+    ]
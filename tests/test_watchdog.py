@@ -0,0 +1,102 @@
+"""Tests for scan.watchdog"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from scan.scanner import run_scan
+from scan.watchdog import CRASH_REASON, TIMEOUT_REASON, WatchdogPool
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+# Worker targets must be importable top-level functions (spawned processes).
+def _echo(value, delay=0.0):
+    time.sleep(delay)
+    return value
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+def _crash(value):
+    if value == "crash":
+        os._exit(1)  # like a worker killed by the OS mid-task
+    return value
+
+
+def test_results_returned_by_task_id():
+    with WatchdogPool(_echo, workers=2) as pool:
+        ids = [pool.submit(n) for n in range(5)]
+        results, abandoned = pool.collect(ids)
+
+    assert abandoned == {}
+    assert [results[i] for i in ids] == [0, 1, 2, 3, 4]
+
+
+def test_file_timeout_abandons_only_slow_task():
+    with WatchdogPool(_echo, workers=1, file_timeout=0.5) as pool:
+        slow = pool.submit("slow", 30)
+        fast = pool.submit("fast")
+        start = time.monotonic()
+        results, abandoned = pool.collect([slow, fast])
+
+    assert time.monotonic() - start < 15
+    assert abandoned == {slow: TIMEOUT_REASON}
+    # A fresh worker replaced the killed one and finished the rest.
+    assert results == {fast: "fast"}
+
+
+def test_scan_timeout_abandons_everything_unfinished():
+    with WatchdogPool(_echo, workers=2, scan_timeout=1.0) as pool:
+        ids = [pool.submit(n, 30) for n in range(4)]
+        results, abandoned = pool.collect(ids)
+
+    assert results == {}
+    assert abandoned == dict.fromkeys(ids, TIMEOUT_REASON)
+
+
+def test_crashed_worker_is_not_reported_as_timeout():
+    with WatchdogPool(_crash, workers=1, file_timeout=60) as pool:
+        crash = pool.submit("crash")
+        after = pool.submit("after")
+        results, abandoned = pool.collect([crash, after])
+
+    assert abandoned == {crash: CRASH_REASON}
+    assert results == {after: "after"}
+
+
+def test_task_errors_propagate():
+    with WatchdogPool(_fail) as pool:
+        task = pool.submit("boom")
+        with pytest.raises(ValueError, match="boom"):
+            pool.collect([task])
+
+
+def test_uncollected_queued_tasks_are_dropped():
+    with WatchdogPool(_echo, workers=1) as pool:
+        keep = pool.submit("keep")
+        pool.submit("drop", 30)
+        results, _ = pool.collect([keep])
+
+    assert results == {keep: "keep"}
+
+
+def test_run_scan_reports_timeouts_as_skipped():
+    """Exhausted scan budget: every file is skipped as timeout and nothing is scored."""
+    result = run_scan(str(FIXTURES), scan_timeout=0)
+
+    assert result["file_count"] == 0
+    assert result["files_scanned"] == []
+    timeouts = [s for s in result["skipped_files"] if s["reason"] == TIMEOUT_REASON]
+    assert len(timeouts) == len(list(FIXTURES.glob("*.*")))
+
+
+def test_run_scan_with_budget_matches_unbudgeted():
+    budgeted = run_scan(str(FIXTURES), file_timeout=60, scan_timeout=600)
+    plain = run_scan(str(FIXTURES))
+
+    for key in ("file_count", "total_score", "categories", "skipped_files"):
+        assert budgeted[key] == plain[key]